@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+name: profile_sql
+version_added: 1.5.0
+author:
+  - Jim Tarpley (@trippsc2)
+type: aggregate
+short_description: Aggregates the SQL Server timings returned by the modules of this collection.
+description:
+  - Aggregates the C(_perf) data returned by the modules of this collection per task, per host, and per module.
+  - For each, the number of connections opened, the number of statements, the time spent waiting for SQL Server,
+    the time spent connecting, and the number of changed and failed results are counted.
+  - At the end of the playbook, the slowest tasks are displayed and a JSON report can be written.
+  - Modules only return C(_perf) when the O(trippsc2.mssql.mssql_login#module:perf_stats) option is enabled,
+    for example by setting the E(TRIPPSC2_MSSQL_PERF) environment variable to V(true).
+  - Results without C(_perf) are ignored.
+requirements:
+  - Enable this callback with the C(callbacks_enabled) setting in C(ansible.cfg) or the E(ANSIBLE_CALLBACKS_ENABLED) environment variable.
+options:
+  top:
+    type: int
+    default: 10
+    description:
+      - The number of slowest tasks to display.
+    ini:
+      - section: callback_profile_sql
+        key: top
+    env:
+      - name: TRIPPSC2_MSSQL_PROFILE_SQL_TOP
+  report_path:
+    type: path
+    description:
+      - The path of a file to which to write the aggregated timings as JSON.
+      - If not specified, no report is written.
+    ini:
+      - section: callback_profile_sql
+        key: report_path
+    env:
+      - name: TRIPPSC2_MSSQL_PROFILE_SQL_REPORT
+"""
+
+import json
+import time
+
+from typing import List, Optional
+
+from ansible.module_utils.common.text.converters import to_native
+from ansible.plugins.callback import CallbackBase
+
+
+def new_totals() -> dict:
+    """
+    Creates an empty set of totals.
+
+    Returns:
+        dict: The totals.
+    """
+
+    return dict(
+        results=0,
+        changed=0,
+        failed=0,
+        connections=0,
+        statements=0,
+        commits=0,
+        sql_seconds=0.0,
+        connect_seconds=0.0,
+        elapsed_seconds=0.0
+    )
+
+
+def add_totals(totals: dict, other: dict) -> None:
+    """
+    Adds a set of totals to another.
+
+    Args:
+        totals (dict): The totals to which to add.
+        other (dict): The totals to add.
+    """
+
+    for key, value in other.items():
+        totals[key] += value
+
+
+def round_totals(totals: dict) -> dict:
+    """
+    Rounds the times of a set of totals for display and the report.
+
+    Args:
+        totals (dict): The totals.
+
+    Returns:
+        dict: A copy of the totals with the times rounded to microseconds.
+    """
+
+    return dict((key, round(value, 6) if isinstance(value, float) else value) for key, value in totals.items())
+
+
+def get_perf_items(result: dict) -> List[dict]:
+    """
+    Gets the _perf data of a module result, or of each item of a loop result.
+
+    Args:
+        result (dict): The module result.
+
+    Returns:
+        List[dict]: The _perf data found in the result.
+    """
+
+    if isinstance(result.get('_perf'), dict):
+        return [result['_perf']]
+
+    items: List[dict] = []
+
+    for item in result.get('results', []) if isinstance(result.get('results'), list) else []:
+        if isinstance(item, dict) and isinstance(item.get('_perf'), dict):
+            items.append(item['_perf'])
+
+    return items
+
+
+class CallbackModule(CallbackBase):
+    """
+    Aggregates the SQL Server timings returned by the modules of this collection.
+    """
+
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = 'aggregate'
+    CALLBACK_NAME = 'trippsc2.mssql.profile_sql'
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self, *args, **kwargs) -> None:
+        super(CallbackModule, self).__init__(*args, **kwargs)
+
+        self._task_starts = {}
+        self._tasks = {}
+
+    def v2_playbook_on_task_start(self, task, is_conditional) -> None:
+        self._task_starts[task._uuid] = time.perf_counter()
+
+    def v2_playbook_on_handler_task_start(self, task) -> None:
+        self._task_starts[task._uuid] = time.perf_counter()
+
+    def v2_runner_on_ok(self, result) -> None:
+        self._record(result, failed=False)
+
+    def v2_runner_on_failed(self, result, ignore_errors: bool = False) -> None:
+        self._record(result, failed=True)
+
+    def _record(self, result, failed: bool) -> None:
+        """
+        Adds the _perf data of a task result to the totals of its task and host.
+
+        Args:
+            result (TaskResult): The task result.
+            failed (bool): Whether the task failed on the host.
+        """
+
+        perf_items: List[dict] = get_perf_items(result._result)
+
+        if len(perf_items) < 1:
+            return
+
+        task = result._task
+        start: Optional[float] = self._task_starts.get(task._uuid)
+
+        totals: dict = new_totals()
+        totals['results'] = 1
+        totals['changed'] = 1 if result._result.get('changed', False) else 0
+        totals['failed'] = 1 if failed else 0
+        totals['elapsed_seconds'] = time.perf_counter() - start if start is not None else 0.0
+
+        for perf in perf_items:
+            totals['connections'] += perf.get('connection_count', 0)
+            totals['statements'] += perf.get('statement_count', 0)
+            totals['commits'] += perf.get('commits', 0)
+            totals['sql_seconds'] += perf.get('total_seconds', 0.0)
+            totals['connect_seconds'] += perf.get('connect_seconds', 0.0)
+
+        task_entry: dict = self._tasks.setdefault(
+            task._uuid,
+            dict(
+                task=task.get_name(),
+                module=getattr(task, 'resolved_action', None) or task.action,
+                path=task.get_path(),
+                hosts={}
+            )
+        )
+
+        task_entry['hosts'][result._host.get_name()] = totals
+
+    def get_report(self) -> dict:
+        """
+        Gets the aggregated timings of every task, host, and module.
+        The elapsed time of a task is the longest time any host took to complete it.
+
+        Returns:
+            dict: The report.
+        """
+
+        tasks: List[dict] = []
+        hosts: dict = {}
+        modules: dict = {}
+        overall: dict = new_totals()
+
+        for task_entry in self._tasks.values():
+            task_totals: dict = new_totals()
+
+            for host, totals in task_entry['hosts'].items():
+                add_totals(task_totals, totals)
+                add_totals(hosts.setdefault(host, new_totals()), totals)
+                add_totals(modules.setdefault(task_entry['module'], new_totals()), totals)
+
+            task_totals['elapsed_seconds'] = max(totals['elapsed_seconds'] for totals in task_entry['hosts'].values())
+            add_totals(overall, task_totals)
+
+            tasks.append(
+                dict(
+                    task=task_entry['task'],
+                    module=task_entry['module'],
+                    path=task_entry['path'],
+                    totals=round_totals(task_totals),
+                    hosts=dict((host, round_totals(totals)) for host, totals in task_entry['hosts'].items())
+                )
+            )
+
+        tasks.sort(key=lambda task: task['totals']['elapsed_seconds'], reverse=True)
+
+        return dict(
+            totals=round_totals(overall),
+            tasks=tasks,
+            hosts=dict((host, round_totals(totals)) for host, totals in sorted(hosts.items())),
+            modules=dict((module, round_totals(totals)) for module, totals in sorted(modules.items()))
+        )
+
+    def v2_playbook_on_stats(self, stats) -> None:
+        report: dict = self.get_report()
+
+        self._display.banner('SQL SERVER PROFILE')
+
+        if len(report['tasks']) < 1:
+            self._display.display('No task returned _perf data. Enable the perf_stats option or set TRIPPSC2_MSSQL_PERF=true.')
+        else:
+            for task in report['tasks'][:self.get_option('top')]:
+                self._display.display(f"{task['task']} ({task['module']}): {self._format(task['totals'])}")
+
+            self._display.display('')
+
+            for module, totals in report['modules'].items():
+                self._display.display(f"{module}: {self._format(totals)}")
+
+            self._display.display(f"Total: {self._format(report['totals'])}")
+
+        report_path: Optional[str] = self.get_option('report_path')
+
+        if report_path is None:
+            return
+
+        try:
+            with open(report_path, 'w') as report_file:
+                json.dump(report, report_file, indent=2)
+        except (IOError, OSError) as e:
+            self._display.warning(f"Failed to write the SQL Server profile report to '{report_path}': {to_native(e)}")
+        else:
+            self._display.display(f"SQL Server profile report written to {report_path}")
+
+    def _format(self, totals: dict) -> str:
+        """
+        Formats a set of totals for display.
+
+        Args:
+            totals (dict): The totals.
+
+        Returns:
+            str: The formatted totals.
+        """
+
+        return (
+            f"{totals['elapsed_seconds']:.2f}s elapsed, {totals['sql_seconds']:.2f}s SQL, {totals['connect_seconds']:.2f}s connecting, "
+            f"{totals['statements']} statements, {totals['connections']} connections, "
+            f"{totals['changed']} of {totals['results']} changed, {totals['failed']} failed"
+        )
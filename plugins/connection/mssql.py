@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+name: mssql
+version_added: 1.5.0
+author:
+  - Jim Tarpley (@trippsc2)
+short_description: Keeps a single Microsoft SQL Server session open across tasks.
+description:
+  - Opens one authenticated C(pymssql) session per host, port, and user and keeps it open for the rest of the play.
+  - Modules in this collection send their queries through this session instead of opening a new connection for every task.
+  - Modules are executed on the Ansible controller, so tasks do not need O(delegate_to=localhost).
+requirements:
+  - pymssql
+options:
+  host:
+    type: str
+    default: inventory_hostname
+    description:
+      - The hostname of the SQL Server instance to connect to.
+    vars:
+      - name: inventory_hostname
+      - name: ansible_host
+  port:
+    type: int
+    default: 1433
+    description:
+      - The port on which the SQL Server instance is listening.
+    vars:
+      - name: ansible_port
+      - name: ansible_mssql_port
+  remote_user:
+    type: str
+    description:
+      - The username with which to authenticate to the SQL Server instance.
+    vars:
+      - name: ansible_user
+      - name: ansible_mssql_user
+  password:
+    type: str
+    description:
+      - The password with which to authenticate to the SQL Server instance.
+    vars:
+      - name: ansible_password
+      - name: ansible_mssql_password
+  persistent_connect_timeout:
+    type: int
+    default: 30
+    description:
+      - The number of seconds the session may stay idle before it is closed.
+    ini:
+      - section: persistent_connection
+        key: connect_timeout
+    env:
+      - name: ANSIBLE_PERSISTENT_CONNECT_TIMEOUT
+    vars:
+      - name: ansible_connect_timeout
+  persistent_command_timeout:
+    type: int
+    default: 30
+    description:
+      - The number of seconds to wait for a query to complete before the session is closed.
+    ini:
+      - section: persistent_connection
+        key: command_timeout
+    env:
+      - name: ANSIBLE_PERSISTENT_COMMAND_TIMEOUT
+    vars:
+      - name: ansible_command_timeout
+  persistent_log_messages:
+    type: bool
+    default: false
+    description:
+      - Whether to log every query sent through the session to the Ansible log file.
+      - Queries may contain passwords, so only enable this while debugging.
+    ini:
+      - section: persistent_connection
+        key: log_messages
+    env:
+      - name: ANSIBLE_PERSISTENT_LOG_MESSAGES
+    vars:
+      - name: ansible_persistent_log_messages
+"""
+
+import traceback
+
+from typing import List, Optional
+
+from ansible.errors import AnsibleConnectionFailure
+from ansible.module_utils.common.text.converters import to_native
+from ansible.plugins.connection import ensure_connect
+
+from ansible_collections.ansible.utils.plugins.plugin_utils.connection_base import PersistentConnectionBase
+from ansible_collections.trippsc2.mssql.plugins.module_utils._mssql_module import quote_name
+
+try:
+    import pymssql
+except ImportError:
+    HAS_PYMSSQL: bool = False
+    PYMSSQL_IMPORT_ERROR: Optional[str] = traceback.format_exc()
+else:
+    HAS_PYMSSQL: bool = True
+    PYMSSQL_IMPORT_ERROR: Optional[str] = None
+
+
+class Connection(PersistentConnectionBase):
+    """
+    Persistent connection to a Microsoft SQL Server instance.
+    """
+
+    transport = 'trippsc2.mssql.mssql'
+    has_pipelining = True
+
+    def __init__(self, play_context, new_stdin, *args, **kwargs) -> None:
+        super(Connection, self).__init__(play_context, new_stdin, *args, **kwargs)
+
+        self._conn = None
+        self._cursor = None
+        self._database = None
+
+    def _connect(self) -> None:
+        """
+        Opens the Microsoft SQL Server session, if it is not already open.
+        """
+
+        if self._connected:
+            return
+
+        if not HAS_PYMSSQL:
+            raise AnsibleConnectionFailure(f"The pymssql Python library is required to use this connection plugin.\n{PYMSSQL_IMPORT_ERROR}")
+
+        host: str = self.get_option('host')
+        port: int = self.get_option('port')
+
+        self.queue_message('vvv', f"opening Microsoft SQL Server session to {host}:{port}")
+
+        try:
+            self._conn = pymssql.connect(
+                server=host,
+                port=port,
+                user=self.get_option('remote_user'),
+                password=self.get_option('password'),
+                as_dict=True
+            )
+        except pymssql.Error as e:
+            raise AnsibleConnectionFailure(to_native(e))
+
+        self._cursor = self._conn.cursor()
+
+        try:
+            self._cursor.execute('SELECT DB_NAME() AS database_name;')
+            self._database = self._cursor.fetchone()['database_name']
+            self._conn.commit()
+        except pymssql.Error as e:
+            raise AnsibleConnectionFailure(to_native(e))
+
+        self._connected = True
+
+    def close(self) -> None:
+        """
+        Closes the Microsoft SQL Server session.
+        """
+
+        if self._cursor is not None:
+            self._cursor.close()
+            self._cursor = None
+
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+        self._database = None
+
+        super(Connection, self).close()
+
+    @ensure_connect
+    def execute_query(self, query: str, params=None, as_dict: bool = True) -> Optional[List[List]]:
+        """
+        Executes a query in the session.
+
+        Args:
+            query (str): The query to execute.
+            params (Any): The parameters to substitute into the query.
+            as_dict (bool): Whether to return the rows as dictionaries instead of tuples.
+
+        Returns:
+            Optional[List[List]]: The rows of each result set returned by the query, or None if the query returned no result set.
+        """
+
+        self._log_messages(f"query: {query}")
+
+        cursor = self._cursor if as_dict else self._conn.cursor(as_dict=False)
+
+        try:
+            if params is None:
+                cursor.execute(query)
+            else:
+                cursor.execute(query, params)
+
+            if cursor.description is None:
+                return None
+
+            result_sets: List[List] = [cursor.fetchall()]
+
+            while cursor.nextset():
+                result_sets.append(cursor.fetchall())
+
+            return result_sets
+        finally:
+            if cursor is not self._cursor:
+                cursor.close()
+
+    @ensure_connect
+    def commit(self) -> None:
+        """
+        Commits the current transaction in the session.
+        """
+
+        self._conn.commit()
+
+    @ensure_connect
+    def rollback(self) -> None:
+        """
+        Rolls back the current transaction in the session.
+        """
+
+        self._conn.rollback()
+
+    @ensure_connect
+    def reset(self) -> None:
+        """
+        Rolls back the current transaction in the session and restores the session state that a task may have changed,
+        so the next task starts in the database selected when the session was opened, with XACT_ABORT turned off.
+        """
+
+        self._conn.rollback()
+        self._cursor.execute(f"USE {quote_name(self._database)};\nSET XACT_ABORT OFF;")
+        self._conn.commit()
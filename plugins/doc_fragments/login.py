@@ -6,26 +6,87 @@ from __future__ import (absolute_import, division, print_function)
 class ModuleDocFragment(object):
 
     DOCUMENTATION = r"""
+    notes:
+      - If the E(TRIPPSC2_MSSQL_PROFILE) environment variable is set in the environment of the module to the path of a directory,
+        each run of the module is profiled with C(cProfile) and C(tracemalloc), and three files are written to the directory.
+        A C(.prof) file contains the C(cProfile) statistics of the main thread.
+        A C(.alloc.txt) file contains the peak traced memory and the lines that allocated the most memory.
+        A C(.json) file contains the time spent importing the module, validating its arguments, connecting,
+        waiting for SQL statements, and in C(exit_json), and the time spent in the rest of the module.
     options:
       login_user:
         type: str
-        required: true
+        required: false
         description:
           - The username with which to authenticate to the SQL Server instance.
+          - Required unless the task uses the P(trippsc2.mssql.mssql#connection) connection plugin.
       login_password:
         type: str
-        required: true
+        required: false
         description:
           - The password with which to authenticate to the SQL Server instance.
+          - Required unless the task uses the P(trippsc2.mssql.mssql#connection) connection plugin.
       login_host:
         type: str
-        required: true
+        required: false
         description:
           - The hostname of the SQL Server instance to configure.
+          - Required unless the task uses the P(trippsc2.mssql.mssql#connection) connection plugin.
       login_port:
         type: int
         required: false
         default: 1433
         description:
           - The port on which the SQL Server instance is listening.
+          - Ignored when the task uses the P(trippsc2.mssql.mssql#connection) connection plugin.
+      perf_stats:
+        type: bool
+        required: false
+        default: false
+        version_added: 1.5.0
+        description:
+          - Whether to return performance data about the task as C(_perf) in the module result.
+          - C(_perf) contains the number of statements sent to SQL Server, the round-trip time of each statement and their total,
+            the number of connections opened and the time taken to open them, and the number of commits.
+          - Only the start of each statement is returned. Parameter values, such as passwords, are never returned.
+          - If not specified, the value of the E(TRIPPSC2_MSSQL_PERF) environment variable is used.
+      catalog_cache_path:
+        type: path
+        required: false
+        version_added: 1.5.0
+        description:
+          - The directory on the Ansible controller in which to cache snapshots of catalog views, such as C(sys.server_principals).
+          - Before a cached snapshot is used, the row count and latest C(modify_date) of the catalog view are read to check that it is still current.
+          - The cache of an instance is removed whenever a module makes a change to it.
+          - Login lookups that compare the password of an existing SQL login do not use the cache.
+          - If not specified, the value of the E(TRIPPSC2_MSSQL_CATALOG_CACHE) environment variable is used.
+            If neither is specified, no cache is used.
+      cassette_path:
+        type: path
+        required: false
+        version_added: 1.5.0
+        description:
+          - The path of a JSON Lines file to which the statements sent to SQL Server by the task are recorded,
+            or from which they are replayed, depending on O(cassette_mode).
+          - Each line contains the text and parameters of a statement, the rows of each of its result sets, the error it raised, if any,
+            and its round-trip time.
+          - Values of options that are not logged, such as passwords, are masked in the recorded statements and parameters.
+          - The catalog cache configured with O(catalog_cache_path) is not used when a cassette is used.
+          - If not specified, the value of the E(TRIPPSC2_MSSQL_CASSETTE) environment variable is used.
+            If neither is specified, statements are sent to SQL Server and not recorded.
+      cassette_mode:
+        type: str
+        required: false
+        default: replay
+        choices:
+          - record
+          - replay
+        version_added: 1.5.0
+        description:
+          - Whether to record statements to O(cassette_path) or replay them from it.
+          - When V(record), the file is overwritten and every statement sent to SQL Server is recorded.
+          - When V(replay), no connection is made to SQL Server. Each statement is answered by the first unused statement recorded
+            with the same text and parameters, and the task fails if there is none.
+          - Ignored if O(cassette_path) is not specified.
+          - If not specified, the value of the E(TRIPPSC2_MSSQL_CASSETTE_MODE) environment variable is used.
     """
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function)
+
+
+class ModuleDocFragment(object):
+
+    DOCUMENTATION = r"""
+    options:
+      login_hosts:
+        type: list
+        required: false
+        elements: str
+        version_added: 1.5.0
+        description:
+          - The hostnames of multiple SQL Server instances to configure in the same way.
+          - The module connects to each instance with O(login_user), O(login_password), and O(login_port),
+            and configures up to O(login_hosts_max_workers) instances at the same time from a single module process.
+          - This is intended for tasks delegated to C(localhost), so a large fleet can be configured without a fork per instance.
+          - The result of each instance is returned in RV(hosts). The task fails if any instance fails, after every instance has been configured.
+          - Mutually exclusive with O(login_host).
+          - Cannot be used when the task uses the P(trippsc2.mssql.mssql#connection) connection plugin.
+      login_hosts_max_workers:
+        type: int
+        required: false
+        default: 10
+        version_added: 1.5.0
+        description:
+          - The maximum number of instances in O(login_hosts) to configure at the same time.
+          - Each worker opens its own connection.
+    """
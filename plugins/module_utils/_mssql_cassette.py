@@ -0,0 +1,381 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function)
+
+import base64
+import datetime
+import decimal
+import json
+import os
+import threading
+import time
+import uuid
+
+from typing import Any, List, Optional
+
+from ansible.module_utils.common.parameters import remove_values
+
+from ._mssql_persistent_connection import MssqlPersistentCursor
+
+CASSETTE_MODES: List[str] = ['record', 'replay']
+
+DATETIME_FORMAT: str = '%Y-%m-%dT%H:%M:%S.%f'
+DATE_FORMAT: str = '%Y-%m-%d'
+
+
+class MssqlCassetteError(Exception):
+    """
+    Raised when a statement cannot be replayed from a cassette, or when a recorded statement failed.
+    """
+
+    message: str
+
+    def __init__(self, message: str) -> None:
+        super(MssqlCassetteError, self).__init__(message)
+        self.message = message
+
+
+def encode_value(value: Any) -> Any:
+    """
+    Converts a value returned by pymssql to a value that can be written to JSON and restored by decode_value.
+
+    Args:
+        value (Any): The value.
+
+    Returns:
+        Any: The value that can be written to JSON.
+    """
+
+    if isinstance(value, dict):
+        return dict((key, encode_value(item)) for key, item in value.items())
+
+    if isinstance(value, (list, tuple)):
+        return [encode_value(item) for item in value]
+
+    if isinstance(value, datetime.datetime):
+        return {'$datetime': value.strftime(DATETIME_FORMAT + '%z')}
+
+    if isinstance(value, datetime.date):
+        return {'$date': value.strftime(DATE_FORMAT)}
+
+    if isinstance(value, decimal.Decimal):
+        return {'$decimal': str(value)}
+
+    if isinstance(value, uuid.UUID):
+        return {'$uuid': str(value)}
+
+    if isinstance(value, (bytes, bytearray)):
+        return {'$bytes': base64.b64encode(value).decode('ascii')}
+
+    return value
+
+
+def decode_value(value: Any) -> Any:
+    """
+    Restores a value written to JSON by encode_value.
+
+    Args:
+        value (Any): The value read from JSON.
+
+    Returns:
+        Any: The restored value.
+    """
+
+    if isinstance(value, list):
+        return [decode_value(item) for item in value]
+
+    if not isinstance(value, dict):
+        return value
+
+    if len(value) == 1:
+        key, item = next(iter(value.items()))
+
+        if key == '$datetime':
+            return datetime.datetime.strptime(item, DATETIME_FORMAT + '%z' if len(item) > 26 else DATETIME_FORMAT)
+
+        if key == '$date':
+            return datetime.datetime.strptime(item, DATE_FORMAT).date()
+
+        if key == '$decimal':
+            return decimal.Decimal(item)
+
+        if key == '$uuid':
+            return uuid.UUID(item)
+
+        if key == '$bytes':
+            return base64.b64decode(item)
+
+    return dict((key, decode_value(item)) for key, item in value.items())
+
+
+def get_mask_values(no_log_values: set) -> set:
+    """
+    Gets every form in which the values of options marked no_log can appear in a statement or its parameters.
+    Besides the values themselves, this includes their JSON-escaped forms, as sent in JSON parameters such as the passwords compared by PWDCOMPARE,
+    and their T-SQL-quoted forms.
+
+    Args:
+        no_log_values (set): The values of options marked no_log.
+
+    Returns:
+        set: The values to mask.
+    """
+
+    mask_values: set = set()
+
+    for value in no_log_values:
+        mask_values.add(value)
+
+        if not isinstance(value, str):
+            continue
+
+        mask_values.add(json.dumps(value)[1:-1])
+        mask_values.add(json.dumps(value, ensure_ascii=False)[1:-1])
+        mask_values.add(value.replace("'", "''"))
+
+    return mask_values
+
+
+class MssqlCassette():
+    """
+    Records the statements sent by a module, with their parameters and result sets, to a JSON Lines file,
+    or replays the result sets recorded in such a file without connecting to SQL Server.
+
+    Each line of the file is one statement. Values of options marked no_log, such as passwords,
+    are masked in the statement text and parameters before they are recorded or matched, including where they are JSON-escaped or T-SQL-quoted.
+    In replay mode, each statement is answered by the first unused entry recorded for the same host with the same text and parameters,
+    so statements sent by concurrent worker connections can be replayed in any order.
+    """
+
+    path: str
+    mode: str
+    entries: List[dict]
+
+    def __init__(self, path: str, mode: str, no_log_values: set) -> None:
+        self.path = os.path.expanduser(path)
+        self.mode = mode
+        self.entries = []
+        self._no_log_values = get_mask_values(no_log_values)
+        self._lock = threading.Lock()
+
+        if mode == 'record':
+            with open(self.path, 'w'):
+                pass
+        else:
+            with open(self.path, 'r') as cassette_file:
+                self.entries = [json.loads(line) for line in cassette_file if line.strip() != '']
+
+    def mask(self, value: Any) -> Any:
+        """
+        Masks the values of options marked no_log in a statement or its parameters.
+
+        Args:
+            value (Any): The statement or parameters.
+
+        Returns:
+            Any: The masked statement or parameters.
+        """
+
+        if value is None or len(self._no_log_values) < 1:
+            return value
+
+        return remove_values(value, self._no_log_values)
+
+    def record(self, host: Optional[str], query: str, params: Any, result_sets: Optional[List[List[Any]]], error: Optional[str], seconds: float) -> None:
+        """
+        Appends a statement to the cassette.
+
+        Args:
+            host (Optional[str]): The hostname of the SQL Server instance.
+            query (str): The statement text.
+            params (Any): The parameters of the statement.
+            result_sets (Optional[List[List[Any]]]): The rows of each result set, or None if the statement returned no result set.
+            error (Optional[str]): The error raised by the statement, if any.
+            seconds (float): The round-trip time of the statement, in seconds.
+        """
+
+        entry: dict = dict(
+            host=host,
+            query=self.mask(query),
+            params=encode_value(self.mask(params)),
+            result_sets=encode_value(result_sets),
+            error=error,
+            seconds=round(seconds, 6)
+        )
+
+        line: str = json.dumps(entry)
+
+        with self._lock:
+            with open(self.path, 'a') as cassette_file:
+                cassette_file.write(line + '\n')
+
+    def replay(self, host: Optional[str], query: str, params: Any) -> Optional[List[List[Any]]]:
+        """
+        Finds the first unused entry recorded for the statement and marks it as used.
+
+        Args:
+            host (Optional[str]): The hostname of the SQL Server instance.
+            query (str): The statement text.
+            params (Any): The parameters of the statement.
+
+        Returns:
+            Optional[List[List[Any]]]: The rows of each recorded result set, or None if the statement returned no result set.
+        """
+
+        masked_query: str = self.mask(query)
+        masked_params: Any = encode_value(self.mask(params))
+
+        with self._lock:
+            for entry in self.entries:
+                if entry.get('used', False):
+                    continue
+
+                if entry['host'] == host and entry['query'] == masked_query and entry['params'] == masked_params:
+                    entry['used'] = True
+                    break
+            else:
+                preview: str = ' '.join(masked_query.split())[:200]
+                raise MssqlCassetteError(f"No unused entry in the cassette '{self.path}' matches the statement: {preview}")
+
+        if entry['error'] is not None:
+            raise MssqlCassetteError(entry['error'])
+
+        return decode_value(entry['result_sets'])
+
+
+class MssqlRecordingConnection():
+    """
+    Wraps a pymssql.Connection, or a connection with the same interface, to record the statements of its cursors to a cassette.
+    """
+
+    def __init__(self, conn: Any, cassette: MssqlCassette, host: Optional[str]) -> None:
+        self._conn = conn
+        self._cassette = cassette
+        self._host = host
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+    def cursor(self, as_dict: bool = True) -> 'MssqlRecordingCursor':
+        """
+        Creates a cursor that records each statement and its result sets.
+
+        Args:
+            as_dict (bool): Whether rows are returned as dictionaries instead of tuples.
+
+        Returns:
+            MssqlRecordingCursor: The cursor.
+        """
+
+        return MssqlRecordingCursor(self._conn.cursor(as_dict=as_dict), self._cassette, self._host, as_dict)
+
+
+class MssqlRecordingCursor(MssqlPersistentCursor):
+    """
+    Executes statements on a cursor and records them with all of their result sets, which are then fetched from memory.
+    """
+
+    def __init__(self, cursor: Any, cassette: MssqlCassette, host: Optional[str], as_dict: bool = True) -> None:
+        super(MssqlRecordingCursor, self).__init__(None, as_dict=as_dict)
+        self._cursor = cursor
+        self._cassette = cassette
+        self._host = host
+
+    def execute(self, query: str, params: Any = None) -> None:
+        """
+        Executes a statement, reads all of its result sets, and records them, whether or not the statement succeeds.
+
+        Args:
+            query (str): The statement to execute.
+            params (Any): The parameters to substitute into the statement.
+        """
+
+        start: float = time.perf_counter()
+        result_sets: Optional[List[List[Any]]] = None
+
+        try:
+            if params is None:
+                self._cursor.execute(query)
+            else:
+                self._cursor.execute(query, params)
+
+            if self._cursor.description is not None:
+                result_sets: List[List[Any]] = [self._cursor.fetchall()]
+
+                while self._cursor.nextset():
+                    result_sets.append(self._cursor.fetchall())
+        except Exception as e:
+            self._cassette.record(self._host, query, params, None, str(e), time.perf_counter() - start)
+            raise
+
+        self._cassette.record(self._host, query, params, result_sets, None, time.perf_counter() - start)
+        self.set_result_sets(result_sets)
+
+    def close(self) -> None:
+        """
+        Closes the cursor.
+        """
+
+        super(MssqlRecordingCursor, self).close()
+        self._cursor.close()
+
+
+class MssqlReplayConnection():
+    """
+    Answers statements from a cassette instead of a SQL Server instance.
+    Mimics the parts of pymssql.Connection used by the modules in this collection.
+    """
+
+    def __init__(self, cassette: MssqlCassette, host: Optional[str]) -> None:
+        self._cassette = cassette
+        self._host = host
+
+    def cursor(self, as_dict: bool = True) -> 'MssqlReplayCursor':
+        """
+        Creates a cursor that answers statements from the cassette.
+
+        Args:
+            as_dict (bool): Whether rows are returned as dictionaries instead of tuples.
+
+        Returns:
+            MssqlReplayCursor: The cursor.
+        """
+
+        return MssqlReplayCursor(self._cassette, self._host, as_dict)
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class MssqlReplayCursor(MssqlPersistentCursor):
+    """
+    Answers statements with the result sets recorded in a cassette.
+    """
+
+    def __init__(self, cassette: MssqlCassette, host: Optional[str], as_dict: bool = True) -> None:
+        super(MssqlReplayCursor, self).__init__(None, as_dict=as_dict)
+        self._cassette = cassette
+        self._host = host
+
+    def execute(self, query: str, params: Any = None) -> None:
+        """
+        Answers a statement with its recorded result sets.
+        If the statement failed when it was recorded, MssqlCassetteError is raised with the recorded error.
+
+        Args:
+            query (str): The statement to execute.
+            params (Any): The parameters to substitute into the statement.
+        """
+
+        result_sets: Optional[List[List[Any]]] = self._cassette.replay(self._host, query, params)
+
+        if result_sets is not None and not self.as_dict:
+            result_sets: List[List[Any]] = [[tuple(row) for row in rows] for rows in result_sets]
+
+        self.set_result_sets(result_sets)
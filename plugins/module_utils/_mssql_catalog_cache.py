@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function)
+
+import hashlib
+import json
+import os
+import tempfile
+
+from typing import Any, Callable, List, Optional, Tuple
+
+
+def format_watermark(values: Any) -> str:
+    """
+    Formats the values of a watermark row for storage and comparison.
+
+    Args:
+        values (Any): The values of the watermark row.
+
+    Returns:
+        str: The formatted watermark.
+    """
+
+    return json.dumps([str(value) for value in values])
+
+
+class MssqlCatalogCache():
+    """
+    Caches snapshots of catalog views on the Ansible controller, in one JSON file per SQL Server instance.
+    Each snapshot is stored with a watermark of its catalog view.
+    Before a snapshot is used, the watermark is read again and the snapshot is reloaded if it has changed.
+    """
+
+    path: str
+
+    def __init__(self, directory: str, instance: str) -> None:
+        key: str = hashlib.sha256(instance.encode('utf-8')).hexdigest()
+        self.path = os.path.join(os.path.expanduser(directory), f"{key}.json")
+
+    def get_snapshot(self, module, name: str, watermark_statement: str, load: Callable[[], Tuple[dict, List[Any]]]) -> dict:
+        """
+        Gets a snapshot of a catalog view.
+        A cached snapshot costs the watermark statement, and is only loaded again if the watermark has changed.
+        A missing snapshot costs only the statement executed by load.
+        A snapshot is only written when it is loaded, with the watermark read by the same statement,
+        so a snapshot that became stale while it was loaded is detected by the next watermark check.
+
+        Args:
+            module (MssqlModule): The module instance.
+            name (str): The name of the snapshot.
+            watermark_statement (str): A statement returning a single cheap row that changes whenever the catalog view changes.
+            load (Callable[[], Tuple[dict, List[Any]]]): A function returning the snapshot, which must be serializable to JSON,
+                and the values of the row the watermark statement would return for it.
+
+        Returns:
+            dict: The snapshot.
+        """
+
+        snapshots: dict = self._read()
+        snapshot: Optional[dict] = snapshots.get(name)
+
+        if snapshot is not None:
+            rows: List[dict] = module.execute_query(watermark_statement)
+
+            if len(rows) > 0 and snapshot.get('watermark') == format_watermark(rows[0].values()):
+                return snapshot['data']
+
+        data, watermark_values = load()
+        snapshots[name] = dict(watermark=format_watermark(watermark_values), data=data)
+        self._write(snapshots)
+
+        return data
+
+    def invalidate(self) -> None:
+        """
+        Removes every snapshot of the SQL Server instance.
+        """
+
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, 'r') as cache_file:
+                snapshots = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+
+        return snapshots if isinstance(snapshots, dict) else {}
+
+    def _write(self, snapshots: dict) -> None:
+        directory: str = os.path.dirname(self.path)
+
+        try:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+
+            with os.fdopen(descriptor, 'w') as cache_file:
+                json.dump(snapshots, cache_file)
+
+            os.replace(temporary_path, self.path)
+        except OSError:
+            pass
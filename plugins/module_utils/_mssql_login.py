@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function)
+
+import json
+
+from typing import Any, List, Optional, Tuple
+
+from ._mssql_module import quote_name
+from ._mssql_module_error import MssqlModuleError
+
+SERVER_PRINCIPALS_WATERMARK_STATEMENT: str = """
+SELECT COUNT(*) AS principal_count,
+        MAX(modify_date) AS modify_date
+FROM sys.server_principals
+"""
+
+PRINCIPAL_TYPES: dict = {
+    'S': 'sql',
+    'U': 'windows',
+    'G': 'windows',
+    'C': 'certificate',
+    'E': 'azure',
+    'X': 'azure',
+    'K': 'asymmetric_key'
+}
+
+
+def validate_login(params: dict, module) -> None:
+    """
+    Validates the options of a SQL login.
+
+    Args:
+        params (dict): The options of the SQL login. Options that are not defined must be omitted.
+        module (MssqlModule): The module instance.
+    """
+
+    if params['state'] == 'present':
+        if params['type'] != 'sql':
+            if 'password' in params:
+                module.handle_error(MssqlModuleError('The password parameter is required when state is present and type is not sql.'))
+
+            if 'login_password_expiration_enabled' in params:
+                module.handle_error(MssqlModuleError('The login_password_expiration_enabled parameter is not valid for non-SQL logins.'))
+
+            if 'login_password_policy_enforced' in params:
+                module.handle_error(MssqlModuleError('The login_password_policy_enforced parameter is not valid for non-SQL logins.'))
+        else:
+            if params.get('login_password_expiration_enabled', False) and not params.get('login_password_policy_enforced', False):
+                module.handle_error(
+                    MssqlModuleError(
+                        'The login_password_expiration_enabled cannot be true if login_password_policy_enforced parameter is not set to true.'))
+    else:
+        if 'password' in params:
+            module.handle_error(MssqlModuleError('The password parameter is not valid when state is absent.'))
+
+        if 'login_password_expiration_enabled' in params:
+            module.handle_error(MssqlModuleError('The login_password_expiration_enabled parameter is not valid when state is absent.'))
+
+        if 'login_password_policy_enforced' in params:
+            module.handle_error(MssqlModuleError('The login_password_policy_enforced parameter is not valid when state is absent.'))
+
+
+def get_server_principal_rows(names: List[str], module, passwords: Optional[dict] = None) -> dict:
+    """
+    Gets the server principals and their SQL login settings with a single query.
+    If passwords are given, each is compared to the stored password hash of its SQL login with PWDCOMPARE,
+    so the password only has to be set if it does not already match.
+    If the catalog cache is enabled, the rows are read from the cached snapshot of sys.server_principals,
+    unless a password has to be compared for a server principal that exists.
+
+    Args:
+        names (List[str]): The names of the server principals.
+        module (MssqlModule): The module instance.
+        passwords (Optional[dict]): The passwords to compare, keyed by the name of the SQL login.
+
+    Returns:
+        dict: The row of each server principal that exists, keyed by the requested name.
+            password_matches is true if the password matches, false if it does not,
+            and None if no password was given or the password hash cannot be read.
+    """
+
+    if len(names) < 1:
+        return {}
+
+    if module.catalog_cache is not None:
+        snapshot: dict = module.catalog_cache.get_snapshot(
+            module,
+            'server_principals',
+            SERVER_PRINCIPALS_WATERMARK_STATEMENT,
+            lambda: get_server_principal_snapshot(module)
+        )
+
+        # A name missing from the snapshot may still match a principal under a case-insensitive collation,
+        # so the snapshot is only used if every such name is also missing when case is ignored.
+        folded_names: set = set(name.casefold() for name in snapshot)
+
+        # PWDCOMPARE needs the stored password hash, so a password to compare for an existing principal still requires the query.
+        if (all(name in snapshot or name.casefold() not in folded_names for name in names)
+                and not any(name in snapshot for name in (passwords or {}))):
+            return dict(
+                (name, dict(snapshot[name], request_index=index, password_matches=None))
+                for index, name in enumerate(names)
+                if name in snapshot
+            )
+
+    statement: str = """
+    SELECT CAST(requested.[key] AS int) AS request_index,
+            sp.principal_id as principal_id,
+            sp.name as name,
+            sp.type as type,
+            sp.is_disabled as is_disabled,
+            sl.is_policy_checked as is_policy_checked,
+            sl.is_expiration_checked as is_expiration_checked,
+            CASE
+                WHEN passwords.value IS NULL OR sl.password_hash IS NULL THEN NULL
+                ELSE PWDCOMPARE(CAST(passwords.value AS sysname), sl.password_hash)
+            END as password_matches
+    FROM OPENJSON(%(names)s) requested
+    JOIN sys.server_principals sp ON sp.name = requested.value COLLATE DATABASE_DEFAULT
+    LEFT JOIN sys.sql_logins sl ON sp.principal_id = sl.principal_id
+    LEFT JOIN OPENJSON(%(passwords)s) passwords ON passwords.[key] = requested.value COLLATE Latin1_General_BIN2
+    """
+
+    query_params: dict = dict(
+        names=json.dumps(names),
+        passwords=json.dumps(passwords if passwords is not None else {})
+    )
+
+    rows: List[dict] = module.execute_query(statement, query_params)
+
+    return dict((names[row['request_index']], row) for row in rows)
+
+
+def get_server_principal_snapshot(module) -> Tuple[dict, List[Any]]:
+    """
+    Gets every server principal and its SQL login settings, to be cached on the controller.
+    The values of the watermark are read by the same query, so loading a snapshot costs a single round trip.
+
+    Args:
+        module (MssqlModule): The module instance.
+
+    Returns:
+        Tuple[dict, List[Any]]: The row of each server principal, keyed by name,
+            and the values SERVER_PRINCIPALS_WATERMARK_STATEMENT returns for the snapshot.
+    """
+
+    statement: str = """
+    SELECT sp.principal_id as principal_id,
+            sp.name as name,
+            sp.type as type,
+            sp.is_disabled as is_disabled,
+            sl.is_policy_checked as is_policy_checked,
+            sl.is_expiration_checked as is_expiration_checked,
+            COUNT(*) OVER () as principal_count,
+            MAX(sp.modify_date) OVER () as modify_date
+    FROM sys.server_principals sp
+    LEFT JOIN sys.sql_logins sl ON sp.principal_id = sl.principal_id
+    """
+
+    rows: List[dict] = module.execute_query(statement)
+
+    if len(rows) < 1:
+        return {}, [0, None]
+
+    watermark_values: List[Any] = [rows[0]['principal_count'], rows[0]['modify_date']]
+
+    for row in rows:
+        del row['principal_count']
+        del row['modify_date']
+
+    return dict((row['name'], row) for row in rows), watermark_values
+
+
+def format_login(row: dict, module) -> dict:
+    """
+    Formats the SQL login information returned from SQL Server to match the module.
+
+    Args:
+        row (dict): The SQL login information returned from SQL Server.
+        module (MssqlModule): The module instance.
+
+    Returns:
+        dict: The formatted SQL login information.
+    """
+
+    if row['type'] not in PRINCIPAL_TYPES:
+        module.handle_error(MssqlModuleError('Existing login has unknown type: %s' % row))
+
+    return dict(
+        name=row['name'],
+        type=PRINCIPAL_TYPES[row['type']],
+        enabled=not row['is_disabled'],
+        login_password_expiration_enabled=row['is_expiration_checked'],
+        login_password_policy_enforced=row['is_policy_checked']
+    )
+
+
+def get_create_login_statements(login: dict, password_param: Optional[str] = None) -> List[str]:
+    """
+    Gets the statements to create a SQL login.
+
+    Args:
+        login (dict): The desired configuration of the SQL login, in the format returned by format_login.
+        password_param (Optional[str]): The name of the query parameter holding the password of a SQL login.
+
+    Returns:
+        List[str]: The statements.
+    """
+
+    if login['type'] == 'sql':
+        statements: List[str] = [
+            f"CREATE LOGIN {quote_name(login['name'])} "
+            f"WITH PASSWORD = %({password_param})s, "
+            f"CHECK_EXPIRATION = {'ON' if login['login_password_expiration_enabled'] else 'OFF'}, "
+            f"CHECK_POLICY = {'ON' if login['login_password_policy_enforced'] else 'OFF'};"
+        ]
+    else:
+        statements: List[str] = [f"CREATE LOGIN {quote_name(login['name'])} FROM WINDOWS;"]
+
+    if not login['enabled']:
+        statements.append(f"ALTER LOGIN {quote_name(login['name'])} DISABLE;")
+
+    return statements
+
+
+def get_alter_login_statements(login: dict, existing_login: dict, password_param: Optional[str] = None) -> List[str]:
+    """
+    Gets the statements to move a SQL login from its existing configuration to the desired configuration.
+    The password expiration policy is turned off before the password policy, and turned on after it,
+    because SQL Server rejects the expiration policy on a login without the password policy.
+
+    Args:
+        login (dict): The desired configuration of the SQL login, in the format returned by format_login.
+        existing_login (dict): The existing configuration of the SQL login, in the format returned by format_login.
+        password_param (Optional[str]): The name of the query parameter holding the new password, if the password must be set.
+
+    Returns:
+        List[str]: The statements, if any.
+    """
+
+    name: str = quote_name(login['name'])
+    statements: List[str] = []
+
+    if login['type'] == 'sql':
+        expiration_changed: bool = login['login_password_expiration_enabled'] != existing_login['login_password_expiration_enabled']
+        policy_changed: bool = login['login_password_policy_enforced'] != existing_login['login_password_policy_enforced']
+
+        if expiration_changed and not login['login_password_expiration_enabled']:
+            statements.append(f"ALTER LOGIN {name} WITH CHECK_EXPIRATION = OFF;")
+
+        if policy_changed:
+            statements.append(f"ALTER LOGIN {name} WITH CHECK_POLICY = {'ON' if login['login_password_policy_enforced'] else 'OFF'};")
+
+        if expiration_changed and login['login_password_expiration_enabled']:
+            statements.append(f"ALTER LOGIN {name} WITH CHECK_EXPIRATION = ON;")
+
+        if password_param is not None:
+            statements.append(f"ALTER LOGIN {name} WITH PASSWORD = %({password_param})s;")
+
+    if login['enabled'] != existing_login['enabled']:
+        statements.append(f"ALTER LOGIN {name} {'ENABLE' if login['enabled'] else 'DISABLE'};")
+
+    return statements
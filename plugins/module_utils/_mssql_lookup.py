@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function)
+
+import json
+import traceback
+
+from typing import List, Optional
+
+from ansible.module_utils.common.text.converters import to_native
+
+from ._mssql_module import to_executesql
+from ._mssql_module_error import MssqlModuleError
+
+
+class MssqlLookupResult():
+    """
+    Represents the existence of the securables referenced by a module, as resolved by lookup_securables.
+    """
+
+    database_exists: Optional[bool]
+    principal_id: Optional[int]
+    schema_id: Optional[int]
+    logins: dict
+    objects: dict
+
+    def __init__(self) -> None:
+        self.database_exists = None
+        self.principal_id = None
+        self.schema_id = None
+        self.logins = {}
+        self.objects = {}
+
+    @property
+    def principal_exists(self) -> bool:
+        """
+        Whether the database principal exists.
+        """
+
+        return self.principal_id is not None
+
+    @property
+    def schema_exists(self) -> bool:
+        """
+        Whether the schema exists.
+        """
+
+        return self.schema_id is not None
+
+    def login_exists(self, login: str) -> bool:
+        """
+        Whether the server principal exists.
+
+        Args:
+            login (str): The name of the server principal, as passed to lookup_securables.
+
+        Returns:
+            bool: True if the server principal exists, False otherwise.
+        """
+
+        return login in self.logins
+
+    def get_object_matches(self, index: int) -> List[dict]:
+        """
+        Gets the objects that match a requested object.
+
+        Args:
+            index (int): The index of the requested object, as passed to lookup_securables.
+
+        Returns:
+            List[dict]: The matching objects, each with a schema, name, and object ID.
+        """
+
+        return self.objects.get(index, [])
+
+
+def lookup_securables(
+        module,
+        database: Optional[str] = None,
+        principal: Optional[str] = None,
+        schema: Optional[str] = None,
+        logins: Optional[List[str]] = None,
+        objects: Optional[List[dict]] = None) -> MssqlLookupResult:
+    """
+    Resolves the existence of a database, a database principal, a schema, server principals, and database objects with a single parameterized batch.
+    The server principals and objects are passed as one JSON parameter each, so the batch text and its parameters are the same for any number of them.
+    The database principal, schema, and objects are only resolved if the database exists.
+
+    Args:
+        module (MssqlModule): The module instance.
+        database (Optional[str]): The name of the database.
+        principal (Optional[str]): The name of the database principal.
+        schema (Optional[str]): The name of the schema.
+        logins (Optional[List[str]]): The names of the server principals.
+        objects (Optional[List[dict]]): The objects, each with a name and an optional schema.
+
+    Returns:
+        MssqlLookupResult: The result of the lookup.
+    """
+
+    if logins is None:
+        logins: List[str] = []
+
+    if objects is None:
+        objects: List[dict] = []
+
+    params: dict = dict(
+        database=database,
+        principal=principal,
+        schema=schema,
+        logins=json.dumps(logins),
+        objects=json.dumps([dict(name=requested_object['name'], schema=requested_object.get('schema', None)) for requested_object in objects])
+    )
+
+    statement: str = """
+    SET NOCOUNT ON;
+
+    DECLARE @database_exists bit = NULL;
+    DECLARE @principal_id int = NULL;
+    DECLARE @schema_id int = NULL;
+    DECLARE @sql nvarchar(max);
+
+    CREATE TABLE #requested_logins (request_index int, login_name sysname);
+    CREATE TABLE #requested_objects (request_index int, object_name sysname, schema_name sysname NULL);
+    CREATE TABLE #objects (request_index int, object_id int, object_name sysname, schema_name sysname);
+
+    INSERT INTO #requested_logins
+    SELECT CAST(requested.[key] AS int), requested.value
+    FROM OPENJSON(%(logins)s) requested;
+
+    INSERT INTO #requested_objects
+    SELECT CAST(requested.[key] AS int), JSON_VALUE(requested.value, '$.name'), JSON_VALUE(requested.value, '$.schema')
+    FROM OPENJSON(%(objects)s) requested;
+
+    IF %(database)s IS NOT NULL
+    BEGIN
+        SET @database_exists = CASE WHEN DB_ID(%(database)s) IS NULL THEN 0 ELSE 1 END;
+
+        IF @database_exists = 1
+        BEGIN
+            SET @sql = N'USE ' + QUOTENAME(%(database)s) + N';
+            SELECT @principal_id = principal_id FROM sys.database_principals WHERE name = @principal;
+            SELECT @schema_id = schema_id FROM sys.schemas WHERE name = @schema;
+
+            INSERT INTO #objects
+            SELECT requested.request_index, objects.object_id, objects.name, schemas.name
+            FROM #requested_objects requested
+            JOIN sys.objects objects
+            ON objects.name = requested.object_name COLLATE DATABASE_DEFAULT
+            JOIN sys.schemas schemas
+            ON objects.schema_id = schemas.schema_id
+            WHERE requested.schema_name IS NULL
+            OR schemas.name = requested.schema_name COLLATE DATABASE_DEFAULT;';
+
+            EXEC sp_executesql
+                @sql,
+                N'@principal sysname, @schema sysname, @principal_id int OUTPUT, @schema_id int OUTPUT',
+                %(principal)s,
+                %(schema)s,
+                @principal_id OUTPUT,
+                @schema_id OUTPUT;
+        END
+    END
+
+    SELECT @database_exists AS database_exists,
+            @principal_id AS principal_id,
+            @schema_id AS schema_id;
+
+    SELECT requested.request_index AS request_index,
+            principals.principal_id AS principal_id
+    FROM #requested_logins requested
+    JOIN sys.server_principals principals
+    ON principals.name = requested.login_name COLLATE DATABASE_DEFAULT;
+
+    SELECT request_index,
+            object_id,
+            object_name AS name,
+            schema_name
+    FROM #objects;
+
+    DROP TABLE #requested_logins;
+    DROP TABLE #requested_objects;
+    DROP TABLE #objects;
+    """
+
+    result: MssqlLookupResult = MssqlLookupResult()
+    query, query_params = to_executesql(statement, params)
+
+    try:
+        module.cursor.execute(query, query_params)
+        row: Optional[dict] = module.cursor.fetchone()
+        module.cursor.nextset()
+        login_rows: List[dict] = module.cursor.fetchall()
+        module.cursor.nextset()
+        object_rows: List[dict] = module.cursor.fetchall()
+    except Exception as e:
+        module.handle_error(MssqlModuleError(message=to_native(e), exception=traceback.format_exc()))
+
+    if database is not None:
+        result.database_exists = bool(row['database_exists'])
+
+    result.principal_id = row['principal_id']
+    result.schema_id = row['schema_id']
+
+    for login_row in login_rows:
+        result.logins[logins[login_row['request_index']]] = login_row['principal_id']
+
+    for object_row in object_rows:
+        result.objects.setdefault(object_row['request_index'], []).append(
+            dict(
+                schema=object_row['schema_name'],
+                name=object_row['name'],
+                object_id=object_row['object_id']
+            )
+        )
+
+    return result
@@ -2,22 +2,190 @@
 
 from __future__ import (absolute_import, division, print_function)
 
+import copy
+import os
+import re
+import threading
+import time
 import traceback
 
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterator, List, Match, Optional, Pattern, Tuple
 
 from ansible.module_utils.common.text.converters import to_native
-from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.basic import AnsibleModule, env_fallback
 
-from ._mssql_module_error import MssqlModuleError
+from ._mssql_cassette import CASSETTE_MODES, MssqlCassette, MssqlRecordingConnection, MssqlReplayConnection
+from ._mssql_catalog_cache import MssqlCatalogCache
+from ._mssql_module_error import MssqlHostError, MssqlModuleError
+from ._mssql_perf import MssqlPerfConnection, MssqlPerfRecorder
+from ._mssql_persistent_connection import MssqlPersistentConnection
+from ._mssql_profile import PROFILE_ENVIRONMENT_VARIABLE, MssqlProfiler
 
 LOGIN_ARGSPEC: dict = dict(
-    login_user=dict(type='str', required=True),
-    login_password=dict(type='str', required=True, no_log=True),
-    login_host=dict(type='str', required=True),
-    login_port=dict(type='int', required=False, default=1433)
+    login_user=dict(type='str', required=False),
+    login_password=dict(type='str', required=False, no_log=True),
+    login_host=dict(type='str', required=False),
+    login_port=dict(type='int', required=False, default=1433),
+    perf_stats=dict(type='bool', required=False, default=False, fallback=(env_fallback, ['TRIPPSC2_MSSQL_PERF'])),
+    catalog_cache_path=dict(type='path', required=False, fallback=(env_fallback, ['TRIPPSC2_MSSQL_CATALOG_CACHE'])),
+    cassette_path=dict(type='path', required=False, fallback=(env_fallback, ['TRIPPSC2_MSSQL_CASSETTE'])),
+    cassette_mode=dict(
+        type='str',
+        required=False,
+        default='replay',
+        choices=CASSETTE_MODES,
+        fallback=(env_fallback, ['TRIPPSC2_MSSQL_CASSETTE_MODE'])
+    )
 )
 
+LOGIN_HOSTS_ARGSPEC: dict = dict(
+    login_hosts=dict(type='list', required=False, elements='str'),
+    login_hosts_max_workers=dict(type='int', required=False, default=10)
+)
+
+LIST_PARAMETER_PATTERN: Pattern = re.compile(r'(?:OPENJSON|STRING_SPLIT)\(\s*%\((\w+)\)s')
+
+# Quoted identifiers, string literals, and comments are matched whole, so a % sign inside them is never read as a parameter.
+STATEMENT_TOKEN_PATTERN: Pattern = re.compile(
+    r"\[[^\]]*(?:\]\][^\]]*)*\]|'[^']*(?:''[^']*)*'|--[^\n]*|/\*.*?\*/|%\((\w+)\)s|%",
+    re.DOTALL
+)
+
+
+def escape_percent(statement: str, params: dict) -> str:
+    """
+    Doubles every % sign in a statement that is not a reference to one of the parameters,
+    so identifiers, literals, and comments containing % survive the %-formatting pymssql applies when parameters are passed.
+    A reference inside a quoted identifier, a string literal, or a comment is part of the text and is escaped too.
+
+    Args:
+        statement (str): The statement to escape.
+        params (dict): The values of the parameters referenced in the statement as %(name)s.
+
+    Returns:
+        str: The escaped statement.
+    """
+
+    def replace_token(match: Match) -> str:
+        if match.group(1) is not None and match.group(1) in params:
+            return match.group(0)
+
+        return match.group(0).replace('%', '%%')
+
+    return STATEMENT_TOKEN_PATTERN.sub(replace_token, statement)
+
+
+def quote_name(name: str) -> str:
+    """
+    Quotes an identifier the same way as the T-SQL QUOTENAME function.
+
+    Args:
+        name (str): The identifier to quote.
+
+    Returns:
+        str: The quoted identifier.
+    """
+
+    return '[' + name.replace(']', ']]') + ']'
+
+
+def unique(values: List[str]) -> List[str]:
+    """
+    Removes duplicate values, keeping the first occurrence of each.
+
+    Args:
+        values (List[str]): The values.
+
+    Returns:
+        List[str]: The unique values in their original order.
+    """
+
+    return list(dict.fromkeys(values))
+
+
+def get_parameter_type(value: Any) -> str:
+    """
+    Gets the T-SQL data type used to declare a sp_executesql parameter for the value.
+
+    Args:
+        value (Any): The value of the parameter.
+
+    Returns:
+        str: The T-SQL data type.
+    """
+
+    if isinstance(value, bool):
+        return 'bit'
+
+    if isinstance(value, int):
+        if -2147483648 <= value <= 2147483647:
+            return 'int'
+
+        return 'bigint'
+
+    if isinstance(value, float):
+        return 'float'
+
+    if isinstance(value, (bytes, bytearray)):
+        return 'varbinary(max)'
+
+    if isinstance(value, str) and len(value) > 4000:
+        return 'nvarchar(max)'
+
+    return 'nvarchar(4000)'
+
+
+def to_executesql(statement: str, params: Optional[dict] = None) -> Tuple[str, Optional[dict]]:
+    """
+    Wraps a statement in a call to sp_executesql.
+    Parameters are referenced in the statement as %(name)s and are passed to sp_executesql as @name,
+    so the statement text stays the same for every value and its plan can be reused.
+    Parameters read with OPENJSON or STRING_SPLIT are always declared as nvarchar(max),
+    so the declarations also stay the same however many values a list holds.
+
+    Args:
+        statement (str): The statement to wrap.
+        params (Optional[dict]): The values of the parameters referenced in the statement.
+
+    Returns:
+        Tuple[str, Optional[dict]]: The query and the parameters to pass to the cursor.
+    """
+
+    if params is None:
+        params: dict = {}
+
+    names: List[str] = []
+
+    def replace_parameter(match: Match) -> str:
+        name: Optional[str] = match.group(1)
+
+        if name is None:
+            return match.group(0)
+
+        if name not in names:
+            names.append(name)
+
+        return f"@{name}"
+
+    body: str = STATEMENT_TOKEN_PATTERN.sub(replace_parameter, statement).replace("'", "''")
+
+    if len(names) < 1:
+        return f"EXEC sp_executesql N'{body}';", None
+
+    # The parameters are passed to the cursor, so pymssql %-formats the query.
+    body: str = body.replace('%', '%%')
+
+    list_names: List[str] = LIST_PARAMETER_PATTERN.findall(statement)
+
+    declarations: str = ', '.join(
+        f"@{name} {'nvarchar(max)' if name in list_names else get_parameter_type(params[name])}" for name in names
+    )
+    assignments: str = ', '.join(f"@{name} = %({name})s" for name in names)
+
+    return f"EXEC sp_executesql N'{body}', N'{declarations}', {assignments};", {name: params[name] for name in names}
+
+
 try:
     import pymssql
 except ImportError:
@@ -30,11 +198,15 @@ except ImportError:
                 self,
                 *args,
                 argument_spec: Optional[dict] = None,
+                supports_login_hosts: bool = False,
                 **kwargs) -> None:
 
             if argument_spec is None:
                 argument_spec: dict = {}
 
+            if supports_login_hosts:
+                argument_spec: dict = dict(argument_spec, **LOGIN_HOSTS_ARGSPEC)
+
             argspec: dict = MssqlModule.generate_argspec(**argument_spec)
 
             super(MssqlModule, self).__init__(
@@ -72,20 +244,40 @@ else:
 
         conn: pymssql.Connection
         cursor: pymssql.Cursor
+        perf: Optional[MssqlPerfRecorder]
+        profiler: Optional[MssqlProfiler]
+        catalog_cache: Optional[MssqlCatalogCache]
+        cassette: Optional[MssqlCassette]
+        host: Optional[str]
 
         def __init__(
                 self,
                 *args,
                 argument_spec: Optional[dict] = None,
+                supports_login_hosts: bool = False,
                 **kwargs) -> None:
 
             if argument_spec is None:
                 argument_spec: dict = {}
 
+            if supports_login_hosts:
+                argument_spec: dict = dict(argument_spec, **LOGIN_HOSTS_ARGSPEC)
+                kwargs['mutually_exclusive'] = list(kwargs.get('mutually_exclusive', [])) + [('login_host', 'login_hosts')]
+
             argspec: dict = MssqlModule.generate_argspec(**argument_spec)
 
             self.conn = None
             self.cursor = None
+            self.perf = None
+            self.profiler = None
+            self.catalog_cache = None
+            self.cassette = None
+            self.host = None
+
+            if os.environ.get(PROFILE_ENVIRONMENT_VARIABLE):
+                self.profiler = MssqlProfiler(os.environ[PROFILE_ENVIRONMENT_VARIABLE])
+
+            start: float = time.perf_counter()
 
             super(MssqlModule, self).__init__(
                 *args,
@@ -94,6 +286,30 @@ else:
                 **kwargs
             )
 
+            if self.profiler is not None:
+                self.profiler.argspec_seconds = time.perf_counter() - start
+                self.profiler.name = self._name
+
+            if self.params['perf_stats']:
+                self.perf = MssqlPerfRecorder()
+
+            if self.profiler is not None and self.perf is not None:
+                self.profiler.recorder = self.perf
+
+            if self.params['cassette_path'] is not None:
+                try:
+                    self.cassette = MssqlCassette(self.params['cassette_path'], self.params['cassette_mode'], self.no_log_values)
+                except (IOError, OSError, ValueError) as e:
+                    self.fail_json(msg=f"Failed to open the cassette '{self.params['cassette_path']}': {to_native(e)}")
+
+            if self.params['catalog_cache_path'] is not None and self.params.get('login_hosts') is None and self.cassette is None:
+                if self._socket_path is not None:
+                    instance: str = self._socket_path
+                else:
+                    instance: str = f"{self.params['login_host']}:{self.params['login_port']}"
+
+                self.catalog_cache = MssqlCatalogCache(self.params['catalog_cache_path'], instance)
+
         @classmethod
         def generate_argspec(cls, **kwargs) -> dict:
             """
@@ -124,6 +340,50 @@ else:
                 self.conn.close()
                 self.conn = None
 
+        def exit_json(self, **kwargs) -> None:
+            """
+            Returns the module result, including the performance data as _perf if it is collected.
+            If the module is profiled, the profile is written after the result.
+            """
+
+            if self.perf is not None:
+                kwargs['_perf'] = self.perf.to_dict()
+
+            if self.profiler is None:
+                super(MssqlModule, self).exit_json(**kwargs)
+
+            start: float = time.perf_counter()
+
+            try:
+                super(MssqlModule, self).exit_json(**kwargs)
+            finally:
+                self.profiler.exit_seconds = time.perf_counter() - start
+                self.profiler.write()
+
+        def fail_json(self, msg, **kwargs) -> None:
+            """
+            Returns the module failure, including the performance data as _perf if it is collected.
+            If the module is profiled, the profile is written after the failure.
+            On a copy of the module for one of the hosts of login_hosts, MssqlHostError is raised instead.
+            """
+
+            if self.host is not None:
+                raise MssqlHostError(msg)
+
+            if self.perf is not None:
+                kwargs['_perf'] = self.perf.to_dict()
+
+            if self.profiler is None:
+                super(MssqlModule, self).fail_json(msg, **kwargs)
+
+            start: float = time.perf_counter()
+
+            try:
+                super(MssqlModule, self).fail_json(msg, **kwargs)
+            finally:
+                self.profiler.exit_seconds = time.perf_counter() - start
+                self.profiler.write()
+
         def handle_error(self, error) -> None:
             """
             Handle an error, if it occurred, in the module.
@@ -136,30 +396,403 @@ else:
                 self.close_client_session()
                 self.fail_json(msg=error.message, exception=error.exception)
 
+        def run_reconcile(self, reconcile: Callable[['MssqlModule'], dict]) -> None:
+            """
+            Connects, runs the reconcile function, and exits with the result it returns.
+            If login_hosts is specified, the function runs on a copy of the module for each host instead,
+            with up to login_hosts_max_workers hosts configured at the same time, each on its own connection.
+            The result of each host is returned in hosts, and the module fails if any host failed.
+
+            Args:
+                reconcile (Callable[[MssqlModule], dict]): A function that configures the instance of the module it is given and returns the result.
+            """
+
+            if self.params.get('login_hosts') is None:
+                self.initialize_client()
+                result: dict = reconcile(self)
+                self.close_client_session()
+                self.exit_json(**result)
+
+            hosts: List[str] = list(dict.fromkeys(self.params['login_hosts']))
+
+            if self._socket_path is not None:
+                self.fail_json(msg='The login_hosts parameter cannot be used with the trippsc2.mssql.mssql connection plugin.')
+
+            if len(hosts) < 1:
+                self.fail_json(msg='At least one host must be specified in login_hosts.')
+
+            missing_params: list[str] = [key for key in ['login_user', 'login_password'] if self.params[key] is None]
+
+            if len(missing_params) > 0 and not self.is_replaying():
+                self.fail_json(msg=f"missing required arguments: {', '.join(missing_params)}")
+
+            def run_host(host: str) -> dict:
+                host_module: MssqlModule = self.copy_for_host(host)
+
+                try:
+                    host_module.conn = host_module.connect()
+                    host_module.cursor = host_module.conn.cursor()
+
+                    return dict(host=host, **reconcile(host_module))
+                except MssqlHostError as e:
+                    return dict(host=host, changed=False, failed=True, msg=e.message)
+                except Exception as e:
+                    return dict(host=host, changed=False, failed=True, msg=to_native(e))
+                finally:
+                    try:
+                        host_module.close_client_session()
+                    except Exception:
+                        pass
+
+            max_workers: int = max(1, min(self.params['login_hosts_max_workers'], len(hosts)))
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results: List[dict] = list(executor.map(run_host, hosts))
+
+            failures: List[dict] = [host_result for host_result in results if host_result.get('failed', False)]
+            result: dict = dict(changed=any(host_result['changed'] for host_result in results), hosts=results)
+
+            if len(failures) > 0:
+                self.fail_json(msg=f"Failed to configure {len(failures)} of {len(hosts)} hosts.", **result)
+
+            self.exit_json(**result)
+
+        def copy_for_host(self, host: str) -> 'MssqlModule':
+            """
+            Creates a copy of the module that connects to one of the hosts of login_hosts.
+            The copy shares the parameters and performance recorder of the module, but has its own connection and catalog cache,
+            and raises MssqlHostError instead of failing the module.
+
+            Args:
+                host (str): The hostname of the SQL Server instance.
+
+            Returns:
+                MssqlModule: The copy of the module.
+            """
+
+            host_module: MssqlModule = copy.copy(self)
+            host_module.params = dict(self.params, login_host=host)
+            host_module.host = host
+            host_module.conn = None
+            host_module.cursor = None
+
+            if self.params['catalog_cache_path'] is not None and self.cassette is None:
+                host_module.catalog_cache = MssqlCatalogCache(self.params['catalog_cache_path'], f"{host}:{self.params['login_port']}")
+
+            return host_module
+
         def initialize_client(self) -> None:
             """
             Initializes the Microsoft SQL Server client.
+            If the task uses the trippsc2.mssql.mssql connection plugin, the session held open by the plugin is reused.
             If an error occurs, the module failure is handled.
             """
 
-            login_user = self.params['login_user']
-            login_password = self.params['login_password']
-            login_host = self.params['login_host']
-            login_port = self.params['login_port']
+            if self._socket_path is not None and not self.is_replaying():
+                self.conn = MssqlPersistentConnection(self._socket_path)
+
+                if self.cassette is not None:
+                    self.conn = MssqlRecordingConnection(self.conn, self.cassette, self.host)
+
+                recorder: Optional[MssqlPerfRecorder] = self.get_perf_recorder()
+
+                if recorder is not None:
+                    self.conn = MssqlPerfConnection(self.conn, recorder)
+
+                self.cursor = self.conn.cursor()
+                return
+
+            missing_params: list[str] = [key for key in ['login_user', 'login_password', 'login_host'] if self.params[key] is None]
+
+            if len(missing_params) > 0 and not self.is_replaying():
+                self.fail_json(
+                    msg=f"missing required arguments: {', '.join(missing_params)}. "
+                        "They may only be omitted when the trippsc2.mssql.mssql connection plugin is used.")
 
             try:
-                self.conn = pymssql.connect(
-                    server=login_host,
-                    port=login_port,
-                    user=login_user,
-                    password=login_password,
-                    as_dict=True
-                )
+                self.conn = self.connect()
             except pymssql.Error as e:
                 self.fail_json(msg=to_native(e))
 
             self.cursor = self.conn.cursor()
 
+        def connect(self) -> pymssql.Connection:
+            """
+            Opens a new connection with the login options of the module.
+            If a cassette is recorded, the connection records its statements to the cassette.
+            If a cassette is replayed, no connection is opened and the statements are answered from the cassette instead.
+            If performance data or a profile is collected, the connect time is recorded and the connection records its statements.
+
+            Returns:
+                pymssql.Connection: The connection.
+            """
+
+            start: float = time.perf_counter()
+
+            if self.is_replaying():
+                conn: MssqlReplayConnection = MssqlReplayConnection(self.cassette, self.host)
+            else:
+                conn: pymssql.Connection = pymssql.connect(
+                    server=self.params['login_host'],
+                    port=self.params['login_port'],
+                    user=self.params['login_user'],
+                    password=self.params['login_password'],
+                    as_dict=True
+                )
+
+                if self.cassette is not None:
+                    conn: MssqlRecordingConnection = MssqlRecordingConnection(conn, self.cassette, self.host)
+
+            recorder: Optional[MssqlPerfRecorder] = self.get_perf_recorder()
+
+            if recorder is None:
+                return conn
+
+            recorder.record_connect(time.perf_counter() - start)
+
+            return MssqlPerfConnection(conn, recorder)
+
+        def get_perf_recorder(self) -> Optional[MssqlPerfRecorder]:
+            """
+            Gets the recorder of the connect time and statements of the module.
+            The recorder of the profiler is used if the module is profiled without returning performance data.
+
+            Returns:
+                Optional[MssqlPerfRecorder]: The recorder, or None if neither performance data nor a profile is collected.
+            """
+
+            if self.perf is not None:
+                return self.perf
+
+            if self.profiler is not None:
+                return self.profiler.recorder
+
+            return None
+
+        def is_replaying(self) -> bool:
+            """
+            Gets whether statements are answered from a cassette instead of a SQL Server instance.
+
+            Returns:
+                bool: Whether a cassette is replayed.
+            """
+
+            return self.cassette is not None and self.cassette.mode == 'replay'
+
+        def execute_batch(self, statements: List[str], database: Optional[str] = None, params: Optional[dict] = None) -> None:
+            """
+            Executes the statements as a single T-SQL batch in one transaction with one commit.
+            If any statement fails, the whole batch is rolled back and the module failure is handled.
+            Cached catalog snapshots are invalidated before the batch is executed.
+
+            Args:
+                statements (List[str]): The statements to execute.
+                database (Optional[str]): The database in which to execute the statements.
+                params (Optional[dict]): The values of the parameters referenced in the statements as %(name)s.
+            """
+
+            if len(statements) < 1:
+                return
+
+            if self.catalog_cache is not None:
+                self.catalog_cache.invalidate()
+
+            try:
+                self.run_batch(self.conn, self.cursor, statements, database=database, params=params)
+            except Exception as e:
+                self.handle_error(MssqlModuleError(message=to_native(e), exception=traceback.format_exc()))
+
+        def execute_batches(self, batches: dict, max_workers: int = 1) -> dict:
+            """
+            Executes the statements of each database as a single T-SQL batch in its own transaction.
+            Up to max_workers batches run at the same time, each worker on its own connection.
+            The batches run one after another in the current session if only one worker or one batch is requested,
+            or if the trippsc2.mssql.mssql connection plugin is used.
+            A failed batch is rolled back without failing the module, so the results can be reported for each database.
+            Cached catalog snapshots are invalidated before the batches are executed.
+
+            Args:
+                batches (dict): The statements to execute, keyed by the database in which to execute them.
+                max_workers (int): The maximum number of batches to run at the same time.
+
+            Returns:
+                dict: The error message of each failed batch, keyed by database.
+            """
+
+            errors: dict = {}
+            batches: dict = dict((database, statements) for database, statements in batches.items() if len(statements) > 0)
+
+            if len(batches) > 0 and self.catalog_cache is not None:
+                self.catalog_cache.invalidate()
+
+            if max_workers <= 1 or len(batches) <= 1 or self._socket_path is not None:
+                for database, statements in batches.items():
+                    try:
+                        self.run_batch(self.conn, self.cursor, statements, database=database)
+                    except Exception as e:
+                        errors[database] = to_native(e)
+
+                return errors
+
+            worker_state: threading.local = threading.local()
+            connections: List[pymssql.Connection] = []
+            connections_lock: threading.Lock = threading.Lock()
+
+            def run_worker_batch(database: str, statements: List[str]) -> None:
+                if getattr(worker_state, 'conn', None) is None:
+                    worker_state.conn = self.connect()
+
+                    with connections_lock:
+                        connections.append(worker_state.conn)
+
+                self.run_batch(worker_state.conn, worker_state.conn.cursor(), statements, database=database)
+
+            try:
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+                    futures: dict = dict(
+                        (database, executor.submit(run_worker_batch, database, statements))
+                        for database, statements in batches.items()
+                    )
+
+                    for database, future in futures.items():
+                        try:
+                            future.result()
+                        except Exception as e:
+                            errors[database] = to_native(e)
+            finally:
+                for conn in connections:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+            return errors
+
+        def run_batch(
+                self,
+                conn: pymssql.Connection,
+                cursor: pymssql.Cursor,
+                statements: List[str],
+                database: Optional[str] = None,
+                params: Optional[dict] = None) -> None:
+            """
+            Executes the statements as a single T-SQL batch in one transaction on the connection.
+            If any statement fails, the whole batch is rolled back and the error is raised.
+            After the transaction, XACT_ABORT is turned off again and, if a database was selected for the batch, master is selected,
+            so the session state set by the batch does not leak into later statements on the same session.
+
+            Args:
+                conn (pymssql.Connection): The connection.
+                cursor (pymssql.Cursor): A cursor of the connection.
+                statements (List[str]): The statements to execute.
+                database (Optional[str]): The database in which to execute the statements.
+                params (Optional[dict]): The values of the parameters referenced in the statements as %(name)s.
+            """
+
+            body: str = '\n'.join(statements)
+
+            query: str = f"""
+            SET XACT_ABORT ON;
+            BEGIN TRY
+                BEGIN TRANSACTION;
+                {body}
+                COMMIT TRANSACTION;
+            END TRY
+            BEGIN CATCH
+                IF @@TRANCOUNT > 0 ROLLBACK TRANSACTION;
+                THROW;
+            END CATCH
+            SET XACT_ABORT OFF;
+            """
+
+            if database is not None:
+                query: str = f"USE {quote_name(database)};\n{query}USE [master];\n"
+
+            try:
+                if params is None:
+                    cursor.execute(query)
+                else:
+                    cursor.execute(escape_percent(query, params), params)
+
+                conn.commit()
+            except Exception:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+
+                raise
+
+        def execute_query(self, statement: str, params: Optional[dict] = None) -> List[dict]:
+            """
+            Executes a statement through sp_executesql and fetches the rows of its first result set.
+            Parameters are referenced in the statement as %(name)s.
+            If an error occurs, the module failure is handled.
+
+            Args:
+                statement (str): The statement to execute.
+                params (Optional[dict]): The values of the parameters referenced in the statement.
+
+            Returns:
+                List[dict]: The rows of the first result set, if any.
+            """
+
+            query, query_params = to_executesql(statement, params)
+
+            try:
+                if query_params is None:
+                    self.cursor.execute(query)
+                else:
+                    self.cursor.execute(query, query_params)
+
+                if self.cursor.description is None:
+                    return []
+
+                return self.cursor.fetchall()
+            except Exception as e:
+                self.handle_error(MssqlModuleError(message=to_native(e), exception=traceback.format_exc()))
+
+        def iterate_query(self, statement: str, params: Optional[dict] = None, size: int = 1000) -> Iterator[tuple]:
+            """
+            Executes a statement through sp_executesql and yields the rows of its first result set as tuples.
+            Rows are fetched size rows at a time, so large result sets are never held in memory at once.
+            The rows must be consumed before another statement is executed.
+            If an error occurs, the module failure is handled.
+
+            Args:
+                statement (str): The statement to execute.
+                params (Optional[dict]): The values of the parameters referenced in the statement.
+                size (int): The number of rows to fetch at a time.
+
+            Returns:
+                Iterator[tuple]: The rows of the first result set, if any.
+            """
+
+            query, query_params = to_executesql(statement, params)
+            cursor: pymssql.Cursor = self.conn.cursor(as_dict=False)
+
+            try:
+                if query_params is None:
+                    cursor.execute(query)
+                else:
+                    cursor.execute(query, query_params)
+
+                if cursor.description is None:
+                    return
+
+                while True:
+                    rows: List[tuple] = cursor.fetchmany(size)
+
+                    if len(rows) < 1:
+                        break
+
+                    for row in rows:
+                        yield row
+            except Exception as e:
+                self.handle_error(MssqlModuleError(message=to_native(e), exception=traceback.format_exc()))
+            finally:
+                cursor.close()
+
         def get_defined_non_connection_params(self) -> dict:
             """
             Get the defined non-connection parameters for the module.
@@ -169,12 +802,12 @@ else:
             """
 
             filtered_params: dict = self.params.copy()
-            delete_keys: list[str] = [key for key in self.params.keys() if key in LOGIN_ARGSPEC]
+            delete_keys: list[str] = [key for key in self.params.keys() if key in LOGIN_ARGSPEC or key in LOGIN_HOSTS_ARGSPEC]
 
             for key in delete_keys:
                 del filtered_params[key]
 
-            delete_keys: list[str] = [key for key in self.params.keys() if self.params[key] is None]
+            delete_keys: list[str] = [key for key in filtered_params.keys() if filtered_params[key] is None]
 
             for key in delete_keys:
                 del filtered_params[key]
@@ -16,3 +16,16 @@ class MssqlModuleError():
     def __init__(self, message: str, exception: Optional[str] = None) -> None:
         self.message = message
         self.exception = exception
+
+
+class MssqlHostError(Exception):
+    """
+    Raised instead of failing the module when an error occurs on one of the hosts of login_hosts,
+    so the other hosts can still be configured and the failure can be reported for the host.
+    """
+
+    message: str
+
+    def __init__(self, message: str) -> None:
+        super(MssqlHostError, self).__init__(message)
+        self.message = message
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function)
+
+import re
+import threading
+import time
+
+from typing import Any, List, Pattern
+
+STATEMENT_PREVIEW_LENGTH: int = 200
+
+WHITESPACE_PATTERN: Pattern = re.compile(r'\s+')
+
+
+class MssqlPerfRecorder():
+    """
+    Records the number of statements, their server round-trip times, the number of connections opened and their connect time,
+    and the number of commits of a module.
+    Connections opened by worker threads share the same recorder.
+    """
+
+    connect_seconds: float
+    connections: int
+    commits: int
+    statements: List[dict]
+
+    def __init__(self) -> None:
+        self.connect_seconds = 0.0
+        self.connections = 0
+        self.commits = 0
+        self.statements = []
+        self._lock = threading.Lock()
+
+    def record_connect(self, seconds: float) -> None:
+        """
+        Records a connection and the time taken to open it.
+
+        Args:
+            seconds (float): The time taken, in seconds.
+        """
+
+        with self._lock:
+            self.connect_seconds += seconds
+            self.connections += 1
+
+    def record_statement(self, query: str, seconds: float) -> None:
+        """
+        Records the round-trip time of a statement.
+        Only the start of the statement text is kept. Parameter values are never recorded.
+
+        Args:
+            query (str): The statement text, before parameters are substituted.
+            seconds (float): The time taken, in seconds.
+        """
+
+        preview: str = WHITESPACE_PATTERN.sub(' ', query).strip()[:STATEMENT_PREVIEW_LENGTH]
+
+        with self._lock:
+            self.statements.append(dict(statement=preview, seconds=round(seconds, 6)))
+
+    def record_commit(self) -> None:
+        """
+        Records a commit.
+        """
+
+        with self._lock:
+            self.commits += 1
+
+    def to_dict(self) -> dict:
+        """
+        Gets the recorded data in the format returned by modules as _perf.
+
+        Returns:
+            dict: The recorded data.
+        """
+
+        with self._lock:
+            return dict(
+                statement_count=len(self.statements),
+                total_seconds=round(sum(statement['seconds'] for statement in self.statements), 6),
+                connect_seconds=round(self.connect_seconds, 6),
+                connection_count=self.connections,
+                commits=self.commits,
+                statements=list(self.statements)
+            )
+
+
+class MssqlPerfConnection():
+    """
+    Wraps a pymssql.Connection, or a connection with the same interface, to record commits and the statements of its cursors.
+    """
+
+    def __init__(self, conn: Any, recorder: MssqlPerfRecorder) -> None:
+        self._conn = conn
+        self._recorder = recorder
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, **kwargs) -> 'MssqlPerfCursor':
+        """
+        Creates a cursor that records the round-trip time of each statement.
+
+        Returns:
+            MssqlPerfCursor: The cursor.
+        """
+
+        return MssqlPerfCursor(self._conn.cursor(*args, **kwargs), self._recorder)
+
+    def commit(self) -> None:
+        """
+        Commits the current transaction and records the commit.
+        """
+
+        self._conn.commit()
+        self._recorder.record_commit()
+
+
+class MssqlPerfCursor():
+    """
+    Wraps a pymssql.Cursor, or a cursor with the same interface, to record the round-trip time of each statement.
+    """
+
+    def __init__(self, cursor: Any, recorder: MssqlPerfRecorder) -> None:
+        self._cursor = cursor
+        self._recorder = recorder
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+    def execute(self, query: str, *args, **kwargs) -> None:
+        """
+        Executes a statement and records its round-trip time, whether or not it succeeds.
+
+        Args:
+            query (str): The statement to execute.
+        """
+
+        start: float = time.perf_counter()
+
+        try:
+            self._cursor.execute(query, *args, **kwargs)
+        finally:
+            self._recorder.record_statement(query, time.perf_counter() - start)
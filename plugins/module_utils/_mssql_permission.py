@@ -0,0 +1,375 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function)
+
+import json
+
+from typing import List, Optional
+
+from ._mssql_module import quote_name
+
+SERVER_PERMISSIONS: List[str] = [
+    'administer_bulk_operations',
+    'alter_any_availability_group',
+    'alter_any_connection',
+    'alter_any_credential',
+    'alter_any_database',
+    'alter_any_endpoint',
+    'alter_any_event_notification',
+    'alter_any_event_session',
+    'alter_any_linked_server',
+    'alter_any_login',
+    'alter_any_server_audit',
+    'alter_any_server_role',
+    'alter_resources',
+    'alter_server_state',
+    'alter_settings',
+    'alter_trace',
+    'authenticate_server',
+    'connect_any_database',
+    'connect_sql',
+    'control_server',
+    'create_any_database',
+    'create_availability_group',
+    'create_ddl_event_notification',
+    'create_endpoint',
+    'create_server_role',
+    'create_trace_event_notification',
+    'external_access_assembly',
+    'impersonate_any_login',
+    'select_all_user_securables',
+    'shutdown',
+    'unsafe_assembly',
+    'view_any_database',
+    'view_any_definition',
+    'view_server_state'
+]
+
+DATABASE_PERMISSIONS: List[str] = [
+    'administer_database_bulk_operations',
+    'alter',
+    'alter_any_application_role',
+    'alter_any_assembly',
+    'alter_any_asymmetric_key',
+    'alter_any_certificate',
+    'alter_any_column_encryption_key',
+    'alter_any_column_master_key_definition',
+    'alter_any_contract',
+    'alter_any_database_audit',
+    'alter_any_database_ddl_trigger',
+    'alter_any_database_event_notification',
+    'alter_any_database_event_session',
+    'alter_any_database_scoped_configuration',
+    'alter_any_dataspace',
+    'alter_any_external_data_source',
+    'alter_any_external_file_format',
+    'alter_any_external_library',
+    'alter_any_fulltext_catalog',
+    'alter_any_mask',
+    'alter_any_message_type',
+    'alter_any_remote_service_binding',
+    'alter_any_role',
+    'alter_any_route',
+    'alter_any_schema',
+    'alter_any_security_policy',
+    'alter_any_sensitivity_classification',
+    'alter_any_service',
+    'alter_any_symmetric_key',
+    'alter_any_user',
+    'authenticate',
+    'backup_database',
+    'backup_log',
+    'checkpoint',
+    'connect',
+    'connect_replication',
+    'control',
+    'create_aggregate',
+    'create_any_external_library',
+    'create_assembly',
+    'create_asymmetric_key',
+    'create_certificate',
+    'create_contract',
+    'create_database',
+    'create_database_ddl_event_notification',
+    'create_default',
+    'create_fulltext_catalog',
+    'create_function',
+    'create_message_type',
+    'create_procedure',
+    'create_queue',
+    'create_remote_service_binding',
+    'create_role',
+    'create_route',
+    'create_rule',
+    'create_schema',
+    'create_service',
+    'create_symmetric_key',
+    'create_synonym',
+    'create_table',
+    'create_type',
+    'create_view',
+    'create_xml_schema_collection',
+    'delete',
+    'execute',
+    'execute_any_external_endpoint',
+    'execute_any_external_script',
+    'execute_external_script',
+    'insert',
+    'kill_database_connection',
+    'references',
+    'select',
+    'showplan',
+    'subscribe_query_notifications',
+    'take_ownership',
+    'unmask',
+    'update',
+    'view_any_column_encryption_key_definition',
+    'view_any_column_master_key_definition',
+    'view_database_state',
+    'view_definition'
+]
+
+OBJECT_PERMISSIONS: List[str] = [
+    'alter',
+    'control',
+    'delete',
+    'execute',
+    'insert',
+    'receive',
+    'references',
+    'select',
+    'take_ownership',
+    'update',
+    'view_change_tracking',
+    'view_definition'
+]
+
+SCHEMA_PERMISSIONS: List[str] = [
+    'alter',
+    'control',
+    'create_sequence',
+    'delete',
+    'execute',
+    'insert',
+    'references',
+    'select',
+    'take_ownership',
+    'update',
+    'view_change_tracking',
+    'view_definition'
+]
+
+PERMISSION_STATES: List[str] = ['grant', 'deny', 'grant_with_grant_option', 'revoke']
+
+
+def convert_permission_to_query(permission: str) -> str:
+    """
+    Converts the permission to the query string.
+
+    Args:
+        permission (str): The permission to convert.
+
+    Returns:
+        str: The query string.
+    """
+
+    return permission.replace('_', ' ').upper()
+
+
+def convert_permission_from_query(permission: str) -> str:
+    """
+    Converts the permission name returned by SQL Server to the permission.
+
+    Args:
+        permission (str): The permission name returned by SQL Server.
+
+    Returns:
+        str: The permission.
+    """
+
+    return permission.replace(' ', '_').lower()
+
+
+def get_unlisted_permissions(held_permissions: dict, permissions: List[str]) -> dict:
+    """
+    Gets the held permissions that are not in the list of permissions, so they can be revoked.
+
+    Args:
+        held_permissions (dict): The state of each held permission, keyed by the permission name used in queries.
+        permissions (List[str]): The permissions that are kept.
+
+    Returns:
+        dict: The state of each unlisted permission, keyed by the permission.
+    """
+
+    listed: set = set(convert_permission_to_query(permission) for permission in permissions)
+
+    return dict(
+        (convert_permission_from_query(permission), state)
+        for permission, state in held_permissions.items()
+        if permission not in listed and state != 'revoke'
+    )
+
+
+def get_permission_query(
+        principal: str,
+        permission: str,
+        previous_state: str,
+        state: str,
+        securable: Optional[str] = None) -> Optional[str]:
+    """
+    Gets the query to move a permission from its previous state to the desired state.
+
+    Args:
+        principal (str): The name of the principal.
+        permission (str): The permission.
+        previous_state (str): The previous state of the permission.
+        state (str): The desired state of the permission.
+        securable (Optional[str]): The securable of the permission, such as OBJECT::[dbo].[table] or SCHEMA::[dbo]. Omit for server and database permissions.
+
+    Returns:
+        Optional[str]: The query, if the permission must be modified.
+    """
+
+    if previous_state == state:
+        return None
+
+    target: str = convert_permission_to_query(permission)
+
+    if securable is not None:
+        target: str = f"{target} ON {securable}"
+
+    if state == 'revoke':
+        if previous_state == 'grant_with_grant_option':
+            query: str = f'REVOKE {target} TO {quote_name(principal)} CASCADE;'
+        else:
+            query: str = f'REVOKE {target} TO {quote_name(principal)};'
+    elif state == 'grant':
+        if previous_state == 'grant_with_grant_option':
+            query: str = f'REVOKE GRANT OPTION FOR {target} TO {quote_name(principal)} CASCADE;'
+        else:
+            query: str = f'GRANT {target} TO {quote_name(principal)};'
+    elif state == 'deny':
+        if previous_state == 'grant_with_grant_option':
+            query: str = f'DENY {target} TO {quote_name(principal)} CASCADE;'
+        else:
+            query: str = f'DENY {target} TO {quote_name(principal)};'
+    elif state == 'grant_with_grant_option':
+        query: str = f'GRANT {target} TO {quote_name(principal)} WITH GRANT OPTION;'
+
+    return query
+
+
+def server_permissions_match(principals: List[str], permissions: List[str], state: str, module) -> bool:
+    """
+    Checks with a single query whether every server principal exists and already holds every permission in the desired state.
+    The comparison runs on the server, so the existing permissions only have to be read if something must change.
+
+    Args:
+        principals (List[str]): The names of the server principals.
+        permissions (List[str]): The server-level permissions.
+        state (str): The desired state of the permissions.
+        module (MssqlModule): The module instance.
+
+    Returns:
+        bool: Whether every principal exists and every permission is in the desired state.
+    """
+
+    statement: str = """
+    SELECT CASE
+        WHEN (
+            SELECT COUNT(*)
+            FROM OPENJSON(%(principals)s) requested
+            JOIN sys.server_principals principals ON principals.name = requested.value COLLATE DATABASE_DEFAULT
+        ) <> %(principal_count)s THEN 0
+        WHEN EXISTS (
+            SELECT 1
+            FROM OPENJSON(%(principals)s) requested_principals
+            JOIN sys.server_principals principals ON principals.name = requested_principals.value COLLATE DATABASE_DEFAULT
+            CROSS JOIN OPENJSON(%(permissions)s) requested_permissions
+            LEFT JOIN sys.server_permissions permissions
+            ON permissions.grantee_principal_id = principals.principal_id
+            AND permissions.class_desc = 'SERVER'
+            AND permissions.permission_name = requested_permissions.value COLLATE DATABASE_DEFAULT
+            WHERE ISNULL(permissions.state_desc, 'REVOKE') <> %(state)s
+        ) THEN 0
+        ELSE 1
+    END AS permissions_match
+    """
+
+    rows: List[dict] = module.execute_query(
+        statement,
+        dict(
+            principals=json.dumps(principals),
+            principal_count=len(principals),
+            permissions=json.dumps([convert_permission_to_query(permission) for permission in permissions]),
+            state=state.upper()
+        )
+    )
+
+    return len(rows) > 0 and bool(rows[0]['permissions_match'])
+
+
+def database_permissions_match(principal: str, database: str, permissions: List[str], state: str, module) -> bool:
+    """
+    Checks with a single query whether the database and the database principal exist
+    and the principal already holds every permission in the desired state.
+    The comparison runs on the server, so the existing permissions only have to be read if something must change.
+
+    Args:
+        principal (str): The name of the database principal.
+        database (str): The name of the database.
+        permissions (List[str]): The database-level permissions.
+        state (str): The desired state of the permissions.
+        module (MssqlModule): The module instance.
+
+    Returns:
+        bool: Whether the database and principal exist and every permission is in the desired state.
+    """
+
+    statement: str = """
+    DECLARE @permissions_match bit = 0;
+    DECLARE @sql nvarchar(max);
+
+    IF DB_ID(%(database)s) IS NOT NULL
+    BEGIN
+        SET @sql = N'USE ' + QUOTENAME(%(database)s) + N';
+        SELECT @permissions_match = CASE
+            WHEN NOT EXISTS (SELECT 1 FROM sys.database_principals WHERE name = @principal) THEN 0
+            WHEN EXISTS (
+                SELECT 1
+                FROM sys.database_principals principals
+                CROSS JOIN OPENJSON(@permissions) requested
+                LEFT JOIN sys.database_permissions permissions
+                ON permissions.grantee_principal_id = principals.principal_id
+                AND permissions.class = 0
+                AND permissions.permission_name = requested.value COLLATE DATABASE_DEFAULT
+                WHERE principals.name = @principal
+                AND ISNULL(permissions.state_desc, N''REVOKE'') <> @state
+            ) THEN 0
+            ELSE 1
+        END;';
+
+        EXEC sp_executesql
+            @sql,
+            N'@principal sysname, @permissions nvarchar(max), @state nvarchar(60), @permissions_match bit OUTPUT',
+            %(principal)s,
+            %(permissions)s,
+            %(state)s,
+            @permissions_match OUTPUT;
+    END
+
+    SELECT @permissions_match AS permissions_match;
+    """
+
+    rows: List[dict] = module.execute_query(
+        statement,
+        dict(
+            database=database,
+            principal=principal,
+            permissions=json.dumps([convert_permission_to_query(permission) for permission in permissions]),
+            state=state.upper()
+        )
+    )
+
+    return len(rows) > 0 and bool(rows[0]['permissions_match'])
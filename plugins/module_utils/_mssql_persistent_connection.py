@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function)
+
+from typing import Any, List, Optional
+
+from ansible.module_utils.connection import Connection
+
+
+class MssqlPersistentConnection():
+    """
+    Sends queries through the session held open by the trippsc2.mssql.mssql connection plugin.
+    Mimics the parts of pymssql.Connection used by the modules in this collection.
+    """
+
+    connection: Connection
+
+    def __init__(self, socket_path: str) -> None:
+        self.connection = Connection(socket_path)
+
+    def cursor(self, as_dict: bool = True) -> 'MssqlPersistentCursor':
+        """
+        Creates a cursor for the session.
+
+        Args:
+            as_dict (bool): Whether rows are returned as dictionaries instead of tuples.
+
+        Returns:
+            MssqlPersistentCursor: The cursor.
+        """
+
+        return MssqlPersistentCursor(self, as_dict=as_dict)
+
+    def commit(self) -> None:
+        """
+        Commits the current transaction in the session.
+        """
+
+        self.connection.commit()
+
+    def rollback(self) -> None:
+        """
+        Rolls back the current transaction in the session.
+        """
+
+        self.connection.rollback()
+
+    def close(self) -> None:
+        """
+        Releases the session for the next task.
+        The session itself stays open, but any uncommitted work is rolled back and the selected database and XACT_ABORT are restored,
+        so they cannot leak into the next task.
+        """
+
+        self.connection.reset()
+
+
+class MssqlPersistentCursor():
+    """
+    Mimics the parts of pymssql.Cursor used by the modules in this collection.
+    """
+
+    conn: MssqlPersistentConnection
+    as_dict: bool
+    rows: List[Any]
+    result_sets: List[List[Any]]
+    description: Optional[bool]
+
+    def __init__(self, conn: Optional[MssqlPersistentConnection], as_dict: bool = True) -> None:
+        self.conn = conn
+        self.as_dict = as_dict
+        self.rows = []
+        self.result_sets = []
+        self.description = None
+
+    def execute(self, query: str, params: Any = None) -> None:
+        """
+        Executes a query in the session.
+
+        Args:
+            query (str): The query to execute.
+            params (Any): The parameters to substitute into the query.
+        """
+
+        self.set_result_sets(self.conn.connection.execute_query(query, params, self.as_dict))
+
+    def set_result_sets(self, result_sets: Optional[List[List[Any]]]) -> None:
+        """
+        Sets the result sets from which rows are fetched.
+
+        Args:
+            result_sets (Optional[List[List[Any]]]): The rows of each result set, or None if the query returned no result set.
+        """
+
+        if result_sets is None:
+            self.rows = []
+            self.result_sets = []
+            self.description = None
+        else:
+            self.rows = list(result_sets[0])
+            self.result_sets = result_sets[1:]
+            self.description = True
+
+    def nextset(self) -> Optional[bool]:
+        """
+        Moves to the next result set.
+
+        Returns:
+            Optional[bool]: True if there is another result set, None otherwise.
+        """
+
+        if len(self.result_sets) < 1:
+            self.rows = []
+            return None
+
+        self.rows = list(self.result_sets.pop(0))
+
+        return True
+
+    def fetchone(self) -> Optional[Any]:
+        """
+        Fetches the next row of the result set.
+
+        Returns:
+            Optional[Any]: The next row, if one remains.
+        """
+
+        if len(self.rows) < 1:
+            return None
+
+        return self.rows.pop(0)
+
+    def fetchmany(self, size: int = 1) -> List[Any]:
+        """
+        Fetches the next rows of the result set.
+
+        Args:
+            size (int): The maximum number of rows to fetch.
+
+        Returns:
+            List[Any]: The rows.
+        """
+
+        rows: List[Any] = self.rows[:size]
+        self.rows = self.rows[size:]
+
+        return rows
+
+    def fetchall(self) -> List[Any]:
+        """
+        Fetches the remaining rows of the result set.
+
+        Returns:
+            List[Any]: The rows.
+        """
+
+        rows: List[Any] = self.rows
+        self.rows = []
+
+        return rows
+
+    def close(self) -> None:
+        """
+        Closes the cursor.
+        """
+
+        self.rows = []
+        self.result_sets = []
+        self.description = None
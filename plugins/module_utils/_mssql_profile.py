@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function)
+
+import cProfile
+import json
+import os
+import time
+import tracemalloc
+
+from typing import List, Optional
+
+from ._mssql_perf import MssqlPerfRecorder
+
+PROFILE_ENVIRONMENT_VARIABLE: str = 'TRIPPSC2_MSSQL_PROFILE'
+
+ALLOCATION_SUMMARY_LENGTH: int = 50
+
+
+def get_process_age() -> Optional[float]:
+    """
+    Gets the time since the current process was started, which includes the time taken to import the module.
+
+    Returns:
+        Optional[float]: The time since the process was started, in seconds, or None if it cannot be read on this platform.
+    """
+
+    try:
+        with open('/proc/self/stat', 'r') as stat_file:
+            fields: List[str] = stat_file.read().rsplit(')', 1)[1].split()
+
+        start_ticks: int = int(fields[19])
+
+        return time.clock_gettime(time.CLOCK_BOOTTIME) - start_ticks / os.sysconf('SC_CLK_TCK')
+    except (AttributeError, IndexError, OSError, ValueError):
+        return None
+
+
+class MssqlProfiler():
+    """
+    Profiles a module run with cProfile and tracemalloc and writes the results to a directory, one set of files per run:
+    a .prof file that can be read with pstats or snakeviz, a .alloc.txt file with the lines that allocated the most memory,
+    and a .json file with the time split between import, argument validation, connecting, SQL statements, exit_json,
+    and the rest of the Python code of the module.
+    Only the main thread is profiled by cProfile. The time spent in SQL statements includes statements sent by worker threads.
+    """
+
+    directory: str
+    name: str
+    recorder: MssqlPerfRecorder
+    import_seconds: Optional[float]
+    argspec_seconds: float
+    exit_seconds: float
+
+    def __init__(self, directory: str) -> None:
+        self.directory = os.path.expanduser(directory)
+        self.name = 'mssql'
+        self.recorder = MssqlPerfRecorder()
+        self.import_seconds = get_process_age()
+        self.argspec_seconds = 0.0
+        self.exit_seconds = 0.0
+        self._start = time.perf_counter()
+        self._profile = cProfile.Profile()
+        self._started_tracemalloc = not tracemalloc.is_tracing()
+
+        if self._started_tracemalloc:
+            tracemalloc.start()
+
+        self._profile.enable()
+
+    def write(self) -> None:
+        """
+        Stops profiling and writes the results.
+        Errors writing the files are ignored, so an unwritable profile directory can never change the result of the module.
+        """
+
+        self._profile.disable()
+
+        try:
+            total_seconds: float = time.perf_counter() - self._start
+            snapshot: tracemalloc.Snapshot = tracemalloc.take_snapshot()
+            current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+
+            perf: dict = self.recorder.to_dict()
+            python_seconds: float = total_seconds - self.argspec_seconds - perf['connect_seconds'] - perf['total_seconds'] - self.exit_seconds
+
+            if self.import_seconds is not None:
+                total_seconds += self.import_seconds
+
+            summary: dict = dict(
+                module=self.name,
+                pid=os.getpid(),
+                total_seconds=round(total_seconds, 6),
+                import_seconds=round(self.import_seconds, 6) if self.import_seconds is not None else None,
+                argspec_seconds=round(self.argspec_seconds, 6),
+                connect_seconds=perf['connect_seconds'],
+                sql_seconds=perf['total_seconds'],
+                exit_json_seconds=round(self.exit_seconds, 6),
+                python_seconds=round(max(python_seconds, 0.0), 6),
+                statement_count=perf['statement_count'],
+                current_memory_bytes=current_bytes,
+                peak_memory_bytes=peak_bytes
+            )
+
+            prefix: str = os.path.join(self.directory, f"{self.name}-{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{int(time.time() * 1000000) % 1000000000}")
+
+            os.makedirs(self.directory, exist_ok=True)
+
+            self._profile.dump_stats(f"{prefix}.prof")
+
+            with open(f"{prefix}.alloc.txt", 'w') as allocation_file:
+                allocation_file.write(f"Peak traced memory: {peak_bytes} bytes\n")
+                allocation_file.write(f"Traced memory at exit: {current_bytes} bytes\n\n")
+
+                for statistic in snapshot.statistics('lineno')[:ALLOCATION_SUMMARY_LENGTH]:
+                    allocation_file.write(f"{statistic}\n")
+
+            with open(f"{prefix}.json", 'w') as summary_file:
+                json.dump(summary, summary_file, indent=2)
+        except (IOError, OSError):
+            pass
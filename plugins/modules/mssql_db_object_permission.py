@@ -19,6 +19,7 @@ attributes:
       - This module supports check mode.
 extends_documentation_fragment:
   - trippsc2.mssql.login
+  - trippsc2.mssql.login_hosts
 options:
   principal:
     type: str
@@ -35,14 +36,17 @@ options:
     required: false
     description:
       - The name of the schema in which the object exists for which to configure permissions.
+      - When O(object_pattern) or O(object_types) is specified, only objects in this schema are matched.
+      - Mutually exclusive with O(objects).
   object:
     type: str
-    required: true
+    required: false
     description:
       - The name of the object for which to configure permissions.
+      - One of O(object), O(objects), O(object_pattern), or O(object_types) is required.
   permissions:
     type: list
-    required: true
+    required: false
     elements: str
     choices:
       - alter
@@ -59,6 +63,76 @@ options:
       - view_definition
     description:
       - The type of database object-level permission to configure.
+      - Required when O(object), O(object_pattern), or O(object_types) is specified.
+      - Mutually exclusive with O(objects).
+  objects:
+    type: list
+    required: false
+    elements: dict
+    version_added: 1.5.0
+    description:
+      - A list of objects for which to configure permissions.
+      - All objects are resolved and all of their permissions are read and modified together, rather than one task per object.
+      - One of O(object), O(objects), O(object_pattern), or O(object_types) is required.
+    suboptions:
+      schema:
+        type: str
+        required: false
+        description:
+          - The name of the schema in which the object exists.
+          - If not specified, the object name must be unique in the database.
+      name:
+        type: str
+        required: true
+        description:
+          - The name of the object.
+      permissions:
+        type: list
+        required: true
+        elements: str
+        choices:
+          - alter
+          - control
+          - delete
+          - execute
+          - insert
+          - receive
+          - references
+          - select
+          - take_ownership
+          - update
+          - view_change_tracking
+          - view_definition
+        description:
+          - The type of database object-level permission to configure on the object.
+  object_pattern:
+    type: str
+    required: false
+    version_added: 1.5.0
+    description:
+      - A C(LIKE) pattern matching the names of the objects for which to configure permissions, such as C(usp_api_%).
+      - The matching objects and the state of their permissions are resolved with a single query on the server.
+      - Objects that do not match are not changed. If no object matches, the task does not change anything.
+      - Can be combined with O(schema) and O(object_types).
+      - Mutually exclusive with O(object) and O(objects).
+  object_types:
+    type: list
+    required: false
+    elements: str
+    version_added: 1.5.0
+    choices:
+      - function
+      - procedure
+      - queue
+      - sequence
+      - synonym
+      - table
+      - view
+    description:
+      - The types of the objects for which to configure permissions.
+      - If O(object_pattern) is specified without O(object_types), objects of every type are matched.
+      - Can be combined with O(schema) and O(object_pattern).
+      - Mutually exclusive with O(object) and O(objects).
   state:
     type: str
     required: false
@@ -74,52 +148,106 @@ options:
 
 EXAMPLES = r"""
 - name: Grant SQL database object-level permissions
-  trippsc2.mssql.mssql_db_permission:
+  trippsc2.mssql.mssql_db_object_permission:
     login_user: sa
     login_password: password
     login_host: localhost
-    user: test
-    database: tempdb
+    principal: test
+    database: msdb
+    schema: dbo
+    object: sysjobs
     permissions:
-      - connect
+      - select
       - update
     state: grant
 
 - name: Deny SQL database object-level permissions
-  trippsc2.mssql.mssql_db_permission:
+  trippsc2.mssql.mssql_db_object_permission:
     login_user: sa
     login_password: password
     login_host: localhost
-    user: test
-    database: tempdb
+    principal: test
+    database: msdb
+    schema: dbo
+    object: sysjobs
     permissions:
-      - connect
+      - select
       - update
     state: deny
 
 - name: Grant SQL database object-level permissions with grant option
-  trippsc2.mssql.mssql_db_permission:
+  trippsc2.mssql.mssql_db_object_permission:
     login_user: sa
     login_password: password
     login_host: localhost
-    user: test
-    database: tempdb
+    principal: test
+    database: msdb
+    schema: dbo
+    object: sysjobs
     permissions:
-      - connect
+      - select
       - update
     state: grant_with_grant_option
 
 - name: Remove SQL database object-level permissions
-  trippsc2.mssql.mssql_db_permission:
+  trippsc2.mssql.mssql_db_object_permission:
     login_user: sa
     login_password: password
     login_host: localhost
-    user: test
-    database: tempdb
+    principal: test
+    database: msdb
+    schema: dbo
+    object: sysjobs
     permissions:
-      - connect
+      - select
       - update
     state: revoke
+
+- name: Grant SQL database object-level permissions on multiple objects
+  trippsc2.mssql.mssql_db_object_permission:
+    login_user: sa
+    login_password: password
+    login_host: localhost
+    principal: test
+    database: msdb
+    objects:
+      - schema: dbo
+        name: sysjobs
+        permissions:
+          - select
+      - schema: dbo
+        name: agent_datetime
+        permissions:
+          - execute
+    state: grant
+
+- name: Grant SELECT on every view in a schema
+  trippsc2.mssql.mssql_db_object_permission:
+    login_user: sa
+    login_password: password
+    login_host: localhost
+    principal: test
+    database: reporting
+    schema: rpt
+    object_types:
+      - view
+    permissions:
+      - select
+    state: grant
+
+- name: Grant EXECUTE on every procedure matching a pattern
+  trippsc2.mssql.mssql_db_object_permission:
+    login_user: sa
+    login_password: password
+    login_host: localhost
+    principal: api
+    database: app
+    object_pattern: usp_api_%
+    object_types:
+      - procedure
+    permissions:
+      - execute
+    state: grant
 """
 
 RETURN = r"""
@@ -134,6 +262,16 @@ current:
     - permission: update
       state: grant_with_grant_option
   contains:
+    schema:
+      type: str
+      returned: O(objects), O(object_pattern), or O(object_types) is specified
+      description:
+        - The schema of the object.
+    object:
+      type: str
+      returned: O(objects), O(object_pattern), or O(object_types) is specified
+      description:
+        - The name of the object.
     permission:
       type: str
       description:
@@ -142,6 +280,33 @@ current:
       type: str
       description:
         - The state of the database object-level permission.
+hosts:
+  type: list
+  elements: dict
+  returned: O(login_hosts) is specified
+  version_added: 1.5.0
+  description:
+    - The result for each host in O(login_hosts).
+    - Each element also contains the values that the module returns when O(login_host) is specified.
+  contains:
+    host:
+      type: str
+      description:
+        - The hostname of the SQL Server instance.
+    changed:
+      type: bool
+      description:
+        - Whether the SQL Server instance was changed.
+    failed:
+      type: bool
+      returned: The SQL Server instance could not be configured.
+      description:
+        - Whether the SQL Server instance could not be configured.
+    msg:
+      type: str
+      returned: The SQL Server instance could not be configured.
+      description:
+        - The error that occurred on the SQL Server instance.
 previous:
   type: dict
   returned: changed
@@ -153,6 +318,16 @@ previous:
     - permission: update
       state: deny
   contains:
+    schema:
+      type: str
+      returned: O(objects), O(object_pattern), or O(object_types) is specified
+      description:
+        - The schema of the object.
+    object:
+      type: str
+      returned: O(objects), O(object_pattern), or O(object_types) is specified
+      description:
+        - The name of the object.
     permission:
       type: str
       description:
@@ -163,11 +338,11 @@ previous:
         - The state of the database object-level permission.
 """
 
+import json
 import traceback
 
-from ansible.module_utils.common.text.converters import to_native
 
-from typing import Optional
+from typing import List, Optional
 
 try:
     import pymssql
@@ -178,8 +353,26 @@ else:
     HAS_PYMSSQL: bool = True
     PYMSSQL_IMPORT_ERROR: Optional[str] = None
 
-from ..module_utils._mssql_module import MssqlModule
+from ..module_utils._mssql_lookup import MssqlLookupResult, lookup_securables
+from ..module_utils._mssql_module import MssqlModule, quote_name, unique
 from ..module_utils._mssql_module_error import MssqlModuleError
+from ..module_utils._mssql_permission import (
+    OBJECT_PERMISSIONS,
+    PERMISSION_STATES,
+    convert_permission_from_query,
+    convert_permission_to_query,
+    get_permission_query
+)
+
+OBJECT_TYPES: dict = {
+    'function': ['AF', 'FN', 'FS', 'FT', 'IF', 'TF'],
+    'procedure': ['P', 'PC'],
+    'queue': ['SQ'],
+    'sequence': ['SO'],
+    'synonym': ['SN'],
+    'table': ['U'],
+    'view': ['V']
+}
 
 
 def run_module() -> None:
@@ -188,79 +381,140 @@ def run_module() -> None:
             principal=dict(type='str', required=True),
             database=dict(type='str', required=True),
             schema=dict(type='str', required=False),
-            object=dict(type='str', required=True),
+            object=dict(type='str', required=False),
             permissions=dict(
                 type='list',
-                required=True,
+                required=False,
                 elements='str',
-                choices=[
-                    'alter',
-                    'control',
-                    'delete',
-                    'execute',
-                    'insert',
-                    'receive',
-                    'references',
-                    'select',
-                    'take_ownership',
-                    'update',
-                    'view_change_tracking',
-                    'view_definition'
-                ]
+                choices=OBJECT_PERMISSIONS
+            ),
+            objects=dict(
+                type='list',
+                required=False,
+                elements='dict',
+                options=dict(
+                    schema=dict(type='str', required=False),
+                    name=dict(type='str', required=True),
+                    permissions=dict(
+                        type='list',
+                        required=True,
+                        elements='str',
+                        choices=OBJECT_PERMISSIONS
+                    )
+                )
+            ),
+            object_pattern=dict(type='str', required=False),
+            object_types=dict(
+                type='list',
+                required=False,
+                elements='str',
+                choices=list(OBJECT_TYPES.keys())
             ),
             state=dict(
                 type='str',
                 required=False,
                 default='grant',
-                choices=['grant', 'deny', 'grant_with_grant_option', 'revoke']
+                choices=PERMISSION_STATES
             )
-        )
+        ),
+        mutually_exclusive=[
+            ('object', 'objects'),
+            ('schema', 'objects'),
+            ('permissions', 'objects'),
+            ('object', 'object_pattern'),
+            ('object', 'object_types'),
+            ('objects', 'object_pattern'),
+            ('objects', 'object_types')
+        ],
+        required_one_of=[
+            ('object', 'objects', 'object_pattern', 'object_types')
+        ],
+        required_by=dict(
+            object=['permissions'],
+            object_pattern=['permissions'],
+            object_types=['permissions']
+        ),
+        supports_login_hosts=True
     )
 
+    module.run_reconcile(reconcile)
+
+
+def reconcile(module: MssqlModule) -> dict:
+    """
+    Configures the database object-level permissions on the SQL Server instance of the module.
+
+    Args:
+        module (MssqlModule): The module instance.
+
+    Returns:
+        dict: The module result.
+    """
+
     params: dict = module.get_defined_non_connection_params()
-    module.initialize_client()
-    validate_params(params, module)
 
-    if params.get('schema', None) is None:
-        schema: str = resolve_schema(params['database'], params['object'], module)
+    if 'objects' in params:
+        requested_objects: List[dict] = params['objects']
+    elif 'object' in params:
+        requested_objects: List[dict] = [
+            dict(
+                schema=params.get('schema', None),
+                name=params['object'],
+                permissions=params['permissions']
+            )
+        ]
     else:
-        schema: str = params['schema']
-
-    previous_permissions: dict = get_db_object_permissions(
-        params['principal'],
-        params['database'],
-        schema,
-        params['object'],
-        params['permissions'],
-        module
-    )
+        requested_objects: List[dict] = []
 
-    changed: bool = False
-
-    previous: list[dict] = []
-    current: list[dict] = []
+    lookup: MssqlLookupResult = validate_params(params, requested_objects, module)
 
-    for permission, previous_state in previous_permissions.items():
-        if previous_state != params['state']:
-            changed: bool = True
+    if 'object' in params or 'objects' in params:
+        objects: List[dict] = resolve_objects(requested_objects, lookup, module)
 
-        if previous_state != 'revoke':
-            previous.append(dict(permission=permission, state=previous_state))
+        previous_permissions: dict = get_db_object_permissions(
+            params['principal'],
+            params['database'],
+            objects,
+            module
+        )
+    else:
+        previous_permissions: dict = get_matching_db_object_permissions(
+            lookup.principal_id,
+            params,
+            module
+        )
 
-        if params['state'] != 'revoke':
-            current.append(dict(permission=permission, state=params['state']))
+    changed: bool = False
 
-        if not module.check_mode:
-            modify_permission(
-                params['principal'],
-                params['database'],
-                schema,
-                params['object'],
-                permission,
-                previous_state,
-                params['state'],
-                module
-            )
+    previous: List[dict] = []
+    current: List[dict] = []
+
+    for (schema, object_name), object_permissions in previous_permissions.items():
+        for permission, previous_state in object_permissions.items():
+            if previous_state != params['state']:
+                changed: bool = True
+
+            if 'object' not in params:
+                previous_item: dict = dict(schema=schema, object=object_name, permission=permission, state=previous_state)
+                current_item: dict = dict(schema=schema, object=object_name, permission=permission, state=params['state'])
+            else:
+                previous_item: dict = dict(permission=permission, state=previous_state)
+                current_item: dict = dict(permission=permission, state=params['state'])
+
+            if previous_state != 'revoke':
+                previous.append(previous_item)
+
+            if params['state'] != 'revoke':
+                current.append(current_item)
+
+    if not module.check_mode:
+        modify_permissions(
+            params['principal'],
+            params['database'],
+            previous_permissions,
+            params['state'],
+            module
+        )
 
     if len(previous) > 0:
         if len(current) > 0:
@@ -273,304 +527,236 @@ def run_module() -> None:
         else:
             result: dict = dict(changed=changed)
 
-    module.close_client_session()
-    module.exit_json(**result)
+    return result
 
 
-def validate_params(params: dict, module: MssqlModule) -> None:
+def validate_params(params: dict, requested_objects: List[dict], module: MssqlModule) -> MssqlLookupResult:
     """
     Validates the module parameters.
 
     Args:
         params (dict): The module parameters.
+        requested_objects (List[dict]): The requested objects, each with a name, an optional schema, and permissions.
         module (MssqlModule): The module instance.
+
+    Returns:
+        MssqlLookupResult: The result of the lookup of the database, principal, and objects.
     """
 
-    if len(params['permissions']) < 1:
-        module.handle_error(MssqlModuleError(message='At least one permission must be specified.'))
+    if 'objects' in params:
+        if len(params['objects']) < 1:
+            module.handle_error(MssqlModuleError(message='At least one object must be specified.'))
 
-    query = f"SELECT name FROM sys.databases WHERE name = '{params['database']}'"
+        for requested_object in params['objects']:
+            if len(requested_object['permissions']) < 1:
+                module.handle_error(MssqlModuleError(message=f"At least one permission must be specified for the object '{requested_object['name']}'."))
+    elif len(params['permissions']) < 1:
+        module.handle_error(MssqlModuleError(message='At least one permission must be specified.'))
 
-    try:
-        module.cursor.execute(query)
-        result: Optional[dict] = module.cursor.fetchone()
-    except Exception as e:
-        module.handle_error(MssqlModuleError(message=to_native(e), exception=e))
+    lookup: MssqlLookupResult = lookup_securables(
+        module,
+        database=params['database'],
+        principal=params['principal'],
+        objects=requested_objects
+    )
 
-    if result is None:
+    if not lookup.database_exists:
         module.handle_error(MssqlModuleError(message=f"No database exists with the name '{params['database']}'."))
 
-    query: str = f"""
-    SELECT name FROM {params['database']}.sys.database_principals
-    WHERE name = '{params['principal']}'
-    """
-
-    try:
-        module.cursor.execute(query)
-        result: Optional[dict] = module.cursor.fetchone()
-    except Exception as e:
-        module.handle_error(MssqlModuleError(message=to_native(e), exception=e))
-
-    if result is None:
+    if not lookup.principal_exists:
         module.handle_error(MssqlModuleError(message=f"No database principal exists with the name '{params['principal']}'."))
 
-    if params.get('schema', None) is None:
-        query: str = f"SELECT name FROM {params['database']}.sys.objects WHERE name = '{params['object']}'"
-
-        try:
-            module.cursor.execute(query)
-            result: Optional[list] = module.cursor.fetchall()
-        except Exception as e:
-            module.handle_error(MssqlModuleError(message=to_native(e), exception=e))
+    return lookup
 
-        if result is None or len(result) == 0:
-            module.handle_error(MssqlModuleError(message=f"No object exists with the name '{params['object']}'."))
 
-        if len(result) > 1:
-            module.handle_error(MssqlModuleError(message=f"Multiple objects exist with the name '{params['object']}'. Please specify the schema."))
-    else:
-        query: str = f"""
-        SELECT objects.name FROM {params['database']}.sys.objects objects
-        JOIN {params['database']}.sys.schemas schemas
-        ON objects.schema_id = schemas.schema_id
-        WHERE objects.name = '{params['object']}'
-        AND schemas.name = '{params['schema']}'
-        """
-
-        try:
-            module.cursor.execute(query)
-            result: Optional[dict] = module.cursor.fetchone()
-        except Exception as e:
-            module.handle_error(MssqlModuleError(message=to_native(e), exception=e))
-
-        if result is None:
-            module.handle_error(MssqlModuleError(message=f"No object exists with the name '{params['object']}' in the schema '{params['schema']}'."))
-
-
-def resolve_schema(database: str, object_name: str, module: MssqlModule) -> str:
+def resolve_objects(requested_objects: List[dict], lookup: MssqlLookupResult, module: MssqlModule) -> List[dict]:
     """
-    Resolves the schema of the database object.
+    Resolves the schema and object ID of every requested database object from the lookup result.
 
     Args:
-        database (str): The name of the database.
-        object (str): The name of the object.
+        requested_objects (List[dict]): The requested objects, each with a name, an optional schema, and permissions.
+        lookup (MssqlLookupResult): The result of the lookup of the objects.
         module (MssqlModule): The module instance.
 
     Returns:
-        str: The name of the schema.
-    """
-
-    query: str = f"""
-    SELECT objects.name AS name,
-            schemas.name AS schema_name
-    FROM {database}.sys.objects objects
-    JOIN {database}.sys.schemas schemas
-    ON objects.schema_id = schemas.schema_id
-    WHERE objects.name = '{object_name}'
+        List[dict]: The resolved objects, each with a schema, name, object ID, and permissions.
     """
 
-    try:
-        module.cursor.execute(query)
-        result: Optional[dict] = module.cursor.fetchone()
-    except Exception as e:
-        module.handle_error(MssqlModuleError(message=to_native(e), exception=e))
+    results: List[dict] = []
+
+    for index, requested_object in enumerate(requested_objects):
+        object_matches: List[dict] = lookup.get_object_matches(index)
+
+        if len(object_matches) == 0:
+            if requested_object.get('schema', None) is None:
+                module.handle_error(MssqlModuleError(message=f"No object exists with the name '{requested_object['name']}'."))
+            else:
+                module.handle_error(
+                    MssqlModuleError(
+                        message=f"No object exists with the name '{requested_object['name']}' in the schema '{requested_object['schema']}'."))
+
+        if len(object_matches) > 1:
+            module.handle_error(
+                MssqlModuleError(message=f"Multiple objects exist with the name '{requested_object['name']}'. Please specify the schema."))
+
+        results.append(
+            dict(
+                schema=object_matches[0]['schema'],
+                name=object_matches[0]['name'],
+                object_id=object_matches[0]['object_id'],
+                permissions=requested_object['permissions']
+            )
+        )
 
-    return result['schema_name']
+    return results
 
 
 def get_db_object_permissions(
         principal: str,
         database: str,
-        schema: str,
-        object: str,
-        permissions: list,
+        objects: List[dict],
         module: MssqlModule) -> dict:
     """
-    Retrieves the database object-level permissions.
+    Retrieves the database object-level permissions of every object with a single query.
 
     Args:
         principal (str): The name of the principal.
         database (str): The name of the database.
-        schema (str): The name of the schema.
-        object (str): The name of the object.
-        permissions (list): The permissions to retrieve.
+        objects (List[dict]): The resolved objects, each with a schema, name, object ID, and permissions.
         module (MssqlModule): The module instance.
 
     Returns:
-        dict: The database object-level permissions.
+        dict: The state of each requested permission, keyed by the schema and name of each object.
+    """
+
+    statement: str = f"""
+    SELECT permissions.major_id AS object_id,
+            permissions.permission_name AS permission,
+            permissions.state_desc AS state
+    FROM {quote_name(database)}.sys.database_permissions permissions
+    JOIN {quote_name(database)}.sys.database_principals principals
+    ON permissions.grantee_principal_id = principals.principal_id
+    WHERE principals.name = %(principal)s
+    AND permissions.class_desc = 'OBJECT_OR_COLUMN'
+    AND permissions.minor_id = 0
+    AND permissions.major_id IN (SELECT CAST(value AS int) FROM STRING_SPLIT(%(object_ids)s, ','))
     """
 
+    object_ids: str = ','.join(str(object_item['object_id']) for object_item in objects)
+    rows: List[dict] = module.execute_query(statement, dict(principal=principal, object_ids=object_ids))
+
+    held_permissions: dict = {}
+
+    for row in rows:
+        held_permissions[(row['object_id'], row['permission'])] = row['state'].lower()
+
     results: dict = {}
 
-    for permission in permissions:
-        results: dict = get_db_object_permission(
-            principal,
-            database,
-            schema,
-            object,
-            permission,
-            module,
-            results
-        )
+    for object_item in objects:
+        object_permissions: dict = results.setdefault((object_item['schema'], object_item['name']), {})
+
+        for permission in object_item['permissions']:
+            object_permissions[permission] = held_permissions.get(
+                (object_item['object_id'], convert_permission_to_query(permission)),
+                'revoke'
+            )
 
     return results
 
 
-def get_db_object_permission(
-        principal: str,
-        database: str,
-        schema: str,
-        object_name: str,
-        permission: str,
-        module: MssqlModule,
-        results: dict) -> dict:
+def get_matching_db_object_permissions(
+        principal_id: int,
+        params: dict,
+        module: MssqlModule) -> dict:
     """
-    Retrieves the database object-level permission.
+    Resolves the objects matching the schema, name pattern, and object types,
+    and retrieves the state of each of their requested permissions, with a single query.
 
     Args:
-        principal (str): The name of the principal.
-        database (str): The name of the database.
-        schema (str): The name of the schema.
-        object (str): The name of the object.
-        permission (str): The permission to retrieve.
+        principal_id (int): The ID of the database principal.
+        params (dict): The module parameters.
         module (MssqlModule): The module instance.
-        results (dict): The current results.
 
     Returns:
-        dict: The database object-level permissions.
+        dict: The state of each requested permission, keyed by the schema and name of each matching object.
     """
 
-    query: str = f"""
-    SELECT principals.name AS name,
-            permissions.class_desc AS class,
-            permissions.permission_name AS permission,
+    object_types: List[str] = params.get('object_types', list(OBJECT_TYPES.keys()))
+    type_codes: List[str] = [type_code for object_type in unique(object_types) for type_code in OBJECT_TYPES[object_type]]
+
+    statement: str = f"""
+    SELECT schemas.name AS schema_name,
+            objects.name AS object_name,
+            requested.value AS permission,
             permissions.state_desc AS state
-    FROM {database}.sys.database_permissions permissions
-    JOIN {database}.sys.database_principals principals
-    ON permissions.grantee_principal_id = principals.principal_id
-    JOIN {database}.sys.objects objects
-    ON permissions.major_id = objects.object_id
-    JOIN {database}.sys.schemas schemas
+    FROM {quote_name(params['database'])}.sys.objects objects
+    JOIN {quote_name(params['database'])}.sys.schemas schemas
     ON objects.schema_id = schemas.schema_id
-    WHERE principals.name = '{principal}'
-    AND objects.name = '{object_name}'
-    AND schemas.name = '{schema}'
-    AND permissions.class_desc = 'OBJECT_OR_COLUMN'
-    AND permissions.permission_name = '{convert_permission_to_query(permission)}'
+    CROSS JOIN OPENJSON(%(permissions)s) requested
+    LEFT JOIN {quote_name(params['database'])}.sys.database_permissions permissions
+    ON permissions.class = 1
+    AND permissions.major_id = objects.object_id
+    AND permissions.minor_id = 0
+    AND permissions.grantee_principal_id = %(principal_id)s
+    AND permissions.permission_name = requested.value COLLATE DATABASE_DEFAULT
+    WHERE objects.type IN (SELECT value COLLATE DATABASE_DEFAULT FROM OPENJSON(%(type_codes)s))
+    AND (%(schema)s IS NULL OR schemas.name = %(schema)s)
+    AND (%(object_pattern)s IS NULL OR objects.name LIKE %(object_pattern)s)
+    ORDER BY schemas.name, objects.name, CAST(requested.[key] AS int)
     """
 
-    try:
-        module.cursor.execute(query)
-        row: Optional[dict] = module.cursor.fetchone()
-    except Exception as e:
-        module.handle_error(MssqlModuleError(message=to_native(e), exception=e))
-
-    if row is None:
-        results[permission] = 'revoke'
-    else:
-        results[permission] = row['state'].lower()
-
-    return results
+    query_params: dict = dict(
+        principal_id=principal_id,
+        permissions=json.dumps([convert_permission_to_query(permission) for permission in unique(params['permissions'])]),
+        type_codes=json.dumps(type_codes),
+        schema=params.get('schema', None),
+        object_pattern=params.get('object_pattern', None)
+    )
 
+    rows: List[dict] = module.execute_query(statement, query_params)
 
-def convert_permission_to_query(permission: str) -> str:
-    """
-    Converts the permission to the query string.
-
-    Args:
-        permission (str): The permission to convert.
+    results: dict = {}
 
-    Returns:
-        str: The query string.
-    """
+    for row in rows:
+        object_permissions: dict = results.setdefault((row['schema_name'], row['object_name']), {})
+        object_permissions[convert_permission_from_query(row['permission'])] = row['state'].lower() if row['state'] is not None else 'revoke'
 
-    return permission.replace('_', ' ').upper()
+    return results
 
 
-def modify_permission(
+def modify_permissions(
         principal: str,
         database: str,
-        schema: str,
-        object: str,
-        permission: str,
-        previous_state: str,
+        previous_permissions: dict,
         state: str,
         module: MssqlModule) -> None:
     """
-    Modifies the database object-level permission.
+    Modifies the database object-level permissions in a single batch and transaction.
 
     Args:
         principal (str): The name of the principal.
         database (str): The name of the database.
-        schema (str): The name of the schema.
-        object (str): The name of the object.
-        permission (str): The permission to modify.
-        previous_state (str): The previous state of the permission.
-        state (str): The new state of the permission.
+        previous_permissions (dict): The previous state of each permission, keyed by the schema and name of each object.
+        state (str): The new state of the permissions.
         module (MssqlModule): The module instance.
     """
 
-    if previous_state == state:
-        return
-
-    if state == 'revoke':
-        if previous_state == 'grant_with_grant_option':
-            query: str = f"""
-            USE [{database}];
-            REVOKE {convert_permission_to_query(permission)}
-                ON OBJECT::{schema}.{object}
-                TO [{principal}] CASCADE
-            """
-        else:
-            query: str = f"""
-            USE [{database}];
-            REVOKE {convert_permission_to_query(permission)}
-                ON OBJECT::{schema}.{object}
-                TO [{principal}]
-            """
-    elif state == 'grant':
-        if previous_state == 'grant_with_grant_option':
-            query: str = f"""
-            USE [{database}];
-            REVOKE GRANT OPTION FOR {convert_permission_to_query(permission)}
-                ON OBJECT::{schema}.{object}
-                TO [{principal}] CASCADE
-            """
-        else:
-            query: str = f"""
-            USE [{database}];
-            GRANT {convert_permission_to_query(permission)}
-                ON OBJECT::{schema}.{object}
-                TO [{principal}];
-            """
-    elif state == 'deny':
-        if previous_state == 'grant_with_grant_option':
-            query: str = f"""
-            USE [{database}];
-            DENY {convert_permission_to_query(permission)}
-                ON OBJECT::{schema}.{object}
-                TO [{principal}] CASCADE
-            """
-        else:
-            query: str = f"""
-            USE [{database}];
-            DENY {convert_permission_to_query(permission)}
-                ON OBJECT::{schema}.{object}
-                TO [{principal}];
-            """
-    elif state == 'grant_with_grant_option':
-        query: str = f"""
-        USE [{database}];
-        GRANT {convert_permission_to_query(permission)}
-            ON OBJECT::{schema}.{object}
-            TO [{principal}] WITH GRANT OPTION
-        """
-
-    try:
-        module.cursor.execute(query)
-        module.conn.commit()
-    except Exception as e:
-        module.handle_error(MssqlModuleError(message=to_native(e), exception=e))
+    queries: List[str] = []
+
+    for (schema, object_name), object_permissions in previous_permissions.items():
+        for permission, previous_state in object_permissions.items():
+            query: Optional[str] = get_permission_query(
+                principal,
+                permission,
+                previous_state,
+                state,
+                securable=f"OBJECT::{quote_name(schema)}.{quote_name(object_name)}"
+            )
+
+            if query is not None:
+                queries.append(query)
+
+    module.execute_batch(queries, database=database)
 
 
 def main() -> None:
@@ -19,6 +19,7 @@ attributes:
       - This module supports check mode.
 extends_documentation_fragment:
   - trippsc2.mssql.login
+  - trippsc2.mssql.login_hosts
 options:
   principal:
     type: str
@@ -129,6 +130,16 @@ options:
       - revoke
     description:
       - The state of the database-level permission.
+  exclusive:
+    type: bool
+    required: false
+    default: false
+    version_added: 1.5.0
+    description:
+      - If V(true), every other database-level permission held by the principal in the database is revoked.
+      - The held permissions are read with one query and revoked in the same batch as the other changes.
+      - SQL Server grants C(CONNECT) to a user when it is created, so include V(connect) in O(permissions) to keep it.
+      - Cannot be V(true) when O(state=revoke).
 """
 
 EXAMPLES = r"""
@@ -179,6 +190,19 @@ EXAMPLES = r"""
       - connect
       - update
     state: revoke
+
+- name: Grant SQL database-level permissions and revoke every other database-level permission
+  trippsc2.mssql.mssql_db_permission:
+    login_user: sa
+    login_password: password
+    login_host: localhost
+    principal: test
+    database: tempdb
+    permissions:
+      - connect
+      - view_definition
+    state: grant
+    exclusive: true
 """
 
 RETURN = r"""
@@ -201,11 +225,39 @@ current:
       type: str
       description:
         - The state of the database-level permission.
+hosts:
+  type: list
+  elements: dict
+  returned: O(login_hosts) is specified
+  version_added: 1.5.0
+  description:
+    - The result for each host in O(login_hosts).
+    - Each element also contains the values that the module returns when O(login_host) is specified.
+  contains:
+    host:
+      type: str
+      description:
+        - The hostname of the SQL Server instance.
+    changed:
+      type: bool
+      description:
+        - Whether the SQL Server instance was changed.
+    failed:
+      type: bool
+      returned: The SQL Server instance could not be configured.
+      description:
+        - Whether the SQL Server instance could not be configured.
+    msg:
+      type: str
+      returned: The SQL Server instance could not be configured.
+      description:
+        - The error that occurred on the SQL Server instance.
 previous:
   type: dict
   returned: changed
   description:
     - The previous configuration of the SQL database-level permissions.
+    - If O(exclusive=true), includes the unlisted permissions that were revoked.
   sample:
     - permission: connect
       state: grant
@@ -225,7 +277,6 @@ previous:
 import traceback
 
 from ansible.module_utils.basic import missing_required_lib
-from ansible.module_utils.common.text.converters import to_native
 
 from typing import List, Optional
 
@@ -238,8 +289,17 @@ else:
     HAS_PYMSSQL: bool = True
     PYMSSQL_IMPORT_ERROR: Optional[str] = None
 
-from ..module_utils._mssql_module import MssqlModule
+from ..module_utils._mssql_lookup import MssqlLookupResult, lookup_securables
+from ..module_utils._mssql_module import MssqlModule, quote_name
 from ..module_utils._mssql_module_error import MssqlModuleError
+from ..module_utils._mssql_permission import (
+    PERMISSION_STATES,
+    DATABASE_PERMISSIONS,
+    convert_permission_to_query,
+    database_permissions_match,
+    get_permission_query,
+    get_unlisted_permissions
+)
 
 
 def run_module() -> None:
@@ -251,97 +311,17 @@ def run_module() -> None:
                 type='list',
                 required=True,
                 elements='str',
-                choices=[
-                    'administer_database_bulk_operations',
-                    'alter',
-                    'alter_any_application_role',
-                    'alter_any_assembly',
-                    'alter_any_asymmetric_key',
-                    'alter_any_certificate',
-                    'alter_any_column_encryption_key',
-                    'alter_any_column_master_key_definition',
-                    'alter_any_contract',
-                    'alter_any_database_audit',
-                    'alter_any_database_ddl_trigger',
-                    'alter_any_database_event_notification',
-                    'alter_any_database_event_session',
-                    'alter_any_database_scoped_configuration',
-                    'alter_any_dataspace',
-                    'alter_any_external_data_source',
-                    'alter_any_external_file_format',
-                    'alter_any_external_library',
-                    'alter_any_fulltext_catalog',
-                    'alter_any_mask',
-                    'alter_any_message_type',
-                    'alter_any_remote_service_binding',
-                    'alter_any_role',
-                    'alter_any_route',
-                    'alter_any_schema',
-                    'alter_any_security_policy',
-                    'alter_any_sensitivity_classification',
-                    'alter_any_service',
-                    'alter_any_symmetric_key',
-                    'alter_any_user',
-                    'authenticate',
-                    'backup_database',
-                    'backup_log',
-                    'checkpoint',
-                    'connect',
-                    'connect_replication',
-                    'control',
-                    'create_aggregate',
-                    'create_any_external_library',
-                    'create_assembly',
-                    'create_asymmetric_key',
-                    'create_certificate',
-                    'create_contract',
-                    'create_database',
-                    'create_database_ddl_event_notification',
-                    'create_default',
-                    'create_fulltext_catalog',
-                    'create_function',
-                    'create_message_type',
-                    'create_procedure',
-                    'create_queue',
-                    'create_remote_service_binding',
-                    'create_role',
-                    'create_route',
-                    'create_rule',
-                    'create_schema',
-                    'create_service',
-                    'create_symmetric_key',
-                    'create_synonym',
-                    'create_table',
-                    'create_type',
-                    'create_view',
-                    'create_xml_schema_collection',
-                    'delete',
-                    'execute',
-                    'execute_any_external_endpoint',
-                    'execute_any_external_script',
-                    'execute_external_script',
-                    'insert',
-                    'kill_database_connection',
-                    'references',
-                    'select',
-                    'showplan',
-                    'subscribe_query_notifications',
-                    'take_ownership',
-                    'unmask',
-                    'update',
-                    'view_any_column_encryption_key_definition',
-                    'view_any_column_master_key_definition',
-                    'view_database_state',
-                    'view_definition'
-                ]
+                choices=DATABASE_PERMISSIONS
             ),
             state=dict(
                 type='str',
                 required=False,
                 default='grant',
-                choices=['grant', 'deny', 'grant_with_grant_option', 'revoke']
-            )
-        )
+                choices=PERMISSION_STATES
+            ),
+            exclusive=dict(type='bool', required=False, default=False)
+        ),
+        supports_login_hosts=True
     )
 
     if not HAS_PYMSSQL:
@@ -349,18 +329,40 @@ def run_module() -> None:
             msg=missing_required_lib('pymssql'),
             exception=PYMSSQL_IMPORT_ERROR)
 
+    module.run_reconcile(reconcile)
+
+
+def reconcile(module: MssqlModule) -> dict:
+    """
+    Configures the database-level permissions on the SQL Server instance of the module.
+
+    Args:
+        module (MssqlModule): The module instance.
+
+    Returns:
+        dict: The module result.
+    """
+
     params: dict = module.get_defined_non_connection_params()
-    module.initialize_client()
-    validate_params(params, module)
-
-    previous_permissions: dict = get_db_permissions(
-        params['principal'],
-        params['database'],
-        params['permissions'],
-        module
-    )
 
-    changed: bool = False
+    revoked_permissions: dict = {}
+
+    if (
+        not params['exclusive']
+        and len(params['permissions']) > 0
+        and database_permissions_match(params['principal'], params['database'], params['permissions'], params['state'], module)
+    ):
+        previous_permissions: dict = dict((permission, params['state']) for permission in params['permissions'])
+    else:
+        validate_params(params, module)
+
+        held_permissions: dict = get_db_permission_states(params['principal'], params['database'], module)
+        previous_permissions: dict = get_db_permissions(held_permissions, params['permissions'])
+
+        if params['exclusive']:
+            revoked_permissions: dict = get_unlisted_permissions(held_permissions, params['permissions'])
+
+    changed: bool = len(revoked_permissions) > 0
 
     previous: List[dict] = []
     current: List[dict] = []
@@ -375,15 +377,18 @@ def run_module() -> None:
         if params['state'] != 'revoke':
             current.append(dict(permission=permission, state=params['state']))
 
-        if not module.check_mode:
-            modify_permission(
-                params['principal'],
-                params['database'],
-                permission,
-                previous_state,
-                params['state'],
-                module
-            )
+    for permission, previous_state in revoked_permissions.items():
+        previous.append(dict(permission=permission, state=previous_state))
+
+    if not module.check_mode:
+        modify_permissions(
+            params['principal'],
+            params['database'],
+            previous_permissions,
+            params['state'],
+            module,
+            revoked_permissions=revoked_permissions
+        )
 
     if len(previous) > 0:
         if len(current) > 0:
@@ -396,8 +401,7 @@ def run_module() -> None:
         else:
             result: dict = dict(changed=changed)
 
-    module.close_client_session()
-    module.exit_json(**result)
+    return result
 
 
 def validate_params(params: dict, module: MssqlModule) -> None:
@@ -412,45 +416,25 @@ def validate_params(params: dict, module: MssqlModule) -> None:
     if len(params['permissions']) < 1:
         module.handle_error(MssqlModuleError(message='At least one permission must be specified.'))
 
-    query: str = f"SELECT name FROM sys.databases WHERE name = '{params['database']}'"
+    if params['exclusive'] and params['state'] == 'revoke':
+        module.handle_error(MssqlModuleError(message='The exclusive parameter cannot be true when state is revoke.'))
 
-    try:
-        module.cursor.execute(query)
-        result: Optional[dict] = module.cursor.fetchone()
-    except Exception as e:
-        module.handle_error(MssqlModuleError(message=to_native(e), exception=e))
+    lookup: MssqlLookupResult = lookup_securables(module, database=params['database'], principal=params['principal'])
 
-    if result is None:
+    if not lookup.database_exists:
         module.handle_error(MssqlModuleError(message=f"No database exists with the name '{params['database']}'."))
 
-    query: str = f"""
-    SELECT name FROM {params['database']}.sys.database_principals
-    WHERE name = '{params['principal']}'
-    """
-
-    try:
-        module.cursor.execute(query)
-        result: Optional[dict] = module.cursor.fetchone()
-    except Exception as e:
-        module.handle_error(MssqlModuleError(message=to_native(e), exception=e))
-
-    if result is None:
+    if not lookup.principal_exists:
         module.handle_error(MssqlModuleError(message=f"No database principal exists with the name '{params['principal']}'."))
 
 
-def get_db_permissions(
-        principal: str,
-        database: str,
-        permissions: List[str],
-        module: MssqlModule) -> dict:
+def get_db_permissions(held_permissions: dict, permissions: List[str]) -> dict:
     """
-    Gets the database-level permissions.
+    Gets the state of the requested database-level permissions.
 
     Args:
-        principal (str): The name of the database principal.
-        database (str): The name of the database.
+        held_permissions (dict): The state of each held permission, as returned by get_db_permission_states.
         permissions (List[str]): The database-level permissions.
-        module (MssqlModule): The module instance.
 
     Returns:
         dict: The relevant database-level permissions.
@@ -459,138 +443,78 @@ def get_db_permissions(
     results: dict = {}
 
     for permission in permissions:
-        results = get_db_permission(principal, database, permission, module, results)
+        results[permission] = held_permissions.get(convert_permission_to_query(permission), 'revoke')
 
     return results
 
 
-def get_db_permission(
+def get_db_permission_states(
         principal: str,
         database: str,
-        permission: str,
-        module: MssqlModule,
-        results: dict) -> dict:
+        module: MssqlModule) -> dict:
     """
-    Gets the database-level permission.
+    Gets every database-level permission held by the database principal in a single query.
 
     Args:
         principal (str): The name of the database principal.
         database (str): The name of the database.
-        permission (str): The database-level permission.
         module (MssqlModule): The module instance.
-        results (dict): The results of previous operations.
 
     Returns:
-        dict: Results of this and previous operations.
+        dict: The state of each held permission, keyed by the permission name used in queries.
     """
 
-    query: str = f"""
-    SELECT principals.name AS name,
-            permissions.class_desc AS class,
-            permissions.permission_name AS permission,
+    statement: str = f"""
+    SELECT permissions.permission_name AS permission,
             permissions.state_desc AS state
-    FROM {database}.sys.database_permissions permissions
-    JOIN {database}.sys.database_principals principals
+    FROM {quote_name(database)}.sys.database_permissions permissions
+    JOIN {quote_name(database)}.sys.database_principals principals
     ON permissions.grantee_principal_id = principals.principal_id
-    WHERE principals.name = '{principal}'
+    WHERE principals.name = %(principal)s
     AND permissions.class_desc = 'DATABASE'
-    AND permissions.permission_name = '{convert_permission_to_query(permission)}'
     """
 
-    try:
-        module.cursor.execute(query)
-        row: Optional[dict] = module.cursor.fetchone()
-    except Exception as e:
-        module.handle_error(MssqlModuleError(message=to_native(e), exception=e))
-
-    if row is None:
-        results[permission] = 'revoke'
-    else:
-        results[permission] = row['state'].lower()
+    rows: List[dict] = module.execute_query(statement, dict(principal=principal))
 
-    return results
-
-
-def convert_permission_to_query(permission: str) -> str:
-    """
-    Converts the permission to the query string.
-
-    Args:
-        permission (str): The permission to convert.
+    results: dict = {}
 
-    Returns:
-        str: The query string.
-    """
+    for row in rows:
+        results[row['permission']] = row['state'].lower()
 
-    return permission.replace('_', ' ').upper()
+    return results
 
 
-def modify_permission(
+def modify_permissions(
         principal: str,
         database: str,
-        permission: str,
-        previous_state: str,
+        previous_permissions: dict,
         state: str,
-        module: MssqlModule) -> None:
+        module: MssqlModule,
+        revoked_permissions: Optional[dict] = None) -> None:
     """
-    Modifies the database-level permission.
+    Modifies the database-level permissions in a single batch and transaction.
 
     Args:
         principal (str): The name of the database principal.
         database (str): The name of the database.
-        permission (str): The database-level permission.
-        previous_state (str): The previous state of the permission.
-        state (str): The desired state of the permission.
+        previous_permissions (dict): The previous state of each permission.
+        state (str): The desired state of the permissions.
         module (MssqlModule): The module instance.
+        revoked_permissions (Optional[dict]): The previous state of each unlisted permission to revoke.
     """
 
-    if previous_state == state:
-        return
+    queries: List[str] = []
 
-    if state == 'revoke':
-        if previous_state == 'grant_with_grant_option':
-            query: str = f"""
-            USE [{database}];
-            REVOKE {convert_permission_to_query(permission)} TO [{principal}] CASCADE
-            """
-        else:
-            query: str = f"""
-            USE [{database}];
-            REVOKE {convert_permission_to_query(permission)} TO [{principal}]
-            """
-    elif state == 'grant':
-        if previous_state == 'grant_with_grant_option':
-            query: str = f"""
-            USE [{database}];
-            REVOKE GRANT OPTION FOR {convert_permission_to_query(permission)} TO [{principal}] CASCADE
-            """
-        else:
-            query: str = f"""
-            USE [{database}];
-            GRANT {convert_permission_to_query(permission)} TO [{principal}]
-            """
-    elif state == 'deny':
-        if previous_state == 'grant_with_grant_option':
-            query: str = f"""
-            USE [{database}];
-            DENY {convert_permission_to_query(permission)} TO [{principal}] CASCADE
-            """
-        else:
-            query: str = f"""
-            USE [{database}];
-            DENY {convert_permission_to_query(permission)} TO [{principal}]
-            """
-    elif state == 'grant_with_grant_option':
-        query: str = f"""
-        USE [{database}];
-        GRANT {convert_permission_to_query(permission)} TO [{principal}] WITH GRANT OPTION
-        """
-
-    try:
-        module.cursor.execute(query)
-        module.conn.commit()
-    except Exception as e:
-        module.handle_error(MssqlModuleError(message=to_native(e), exception=e))
+    for permission, previous_state in previous_permissions.items():
+        query: Optional[str] = get_permission_query(principal, permission, previous_state, state)
+
+        if query is not None:
+            queries.append(query)
+
+    for permission, previous_state in (revoked_permissions or {}).items():
+        queries.append(get_permission_query(principal, permission, previous_state, 'revoke'))
+
+    module.execute_batch(queries, database=database)
 
 
 def main() -> None:
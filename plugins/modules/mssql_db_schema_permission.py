@@ -0,0 +1,431 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+module: mssql_db_schema_permission
+version_added: 1.5.0
+author:
+  - Jim Tarpley (@trippsc2)
+short_description: Configures a SQL database schema-level permission in a Microsoft SQL Server instance.
+description:
+  - Configures a SQL database schema-level permission in a Microsoft SQL Server instance.
+  - A permission granted on a schema applies to every object in the schema, including objects created later.
+attributes:
+  check_mode:
+    support: full
+    description:
+      - This module supports check mode.
+extends_documentation_fragment:
+  - trippsc2.mssql.login
+  - trippsc2.mssql.login_hosts
+options:
+  principal:
+    type: str
+    required: true
+    description:
+      - The name of the database user or role for which to configure permissions.
+  database:
+    type: str
+    required: true
+    description:
+      - The name of the database in which the schema exists for which to configure permissions.
+  schema:
+    type: str
+    required: true
+    description:
+      - The name of the schema for which to configure permissions.
+  permissions:
+    type: list
+    required: true
+    elements: str
+    choices:
+      - alter
+      - control
+      - create_sequence
+      - delete
+      - execute
+      - insert
+      - references
+      - select
+      - take_ownership
+      - update
+      - view_change_tracking
+      - view_definition
+    description:
+      - The type of database schema-level permission to configure.
+  state:
+    type: str
+    required: false
+    default: grant
+    choices:
+      - grant
+      - deny
+      - grant_with_grant_option
+      - revoke
+    description:
+      - The state of the database schema-level permission.
+"""
+
+EXAMPLES = r"""
+- name: Grant SQL database schema-level permissions
+  trippsc2.mssql.mssql_db_schema_permission:
+    login_user: sa
+    login_password: password
+    login_host: localhost
+    principal: test
+    database: msdb
+    schema: dbo
+    permissions:
+      - select
+      - execute
+    state: grant
+
+- name: Deny SQL database schema-level permissions
+  trippsc2.mssql.mssql_db_schema_permission:
+    login_user: sa
+    login_password: password
+    login_host: localhost
+    principal: test
+    database: msdb
+    schema: dbo
+    permissions:
+      - delete
+      - update
+    state: deny
+
+- name: Grant SQL database schema-level permissions with grant option
+  trippsc2.mssql.mssql_db_schema_permission:
+    login_user: sa
+    login_password: password
+    login_host: localhost
+    principal: test
+    database: msdb
+    schema: dbo
+    permissions:
+      - select
+    state: grant_with_grant_option
+
+- name: Remove SQL database schema-level permissions
+  trippsc2.mssql.mssql_db_schema_permission:
+    login_user: sa
+    login_password: password
+    login_host: localhost
+    principal: test
+    database: msdb
+    schema: dbo
+    permissions:
+      - select
+      - execute
+    state: revoke
+"""
+
+RETURN = r"""
+current:
+  type: dict
+  returned: O(state=present)
+  description:
+    - The configuration of the SQL database schema-level permissions.
+  sample:
+    - permission: select
+      state: grant_with_grant_option
+    - permission: execute
+      state: grant_with_grant_option
+  contains:
+    permission:
+      type: str
+      description:
+        - The database schema-level permission.
+    state:
+      type: str
+      description:
+        - The state of the database schema-level permission.
+hosts:
+  type: list
+  elements: dict
+  returned: O(login_hosts) is specified
+  description:
+    - The result for each host in O(login_hosts).
+    - Each element also contains the values that the module returns when O(login_host) is specified.
+  contains:
+    host:
+      type: str
+      description:
+        - The hostname of the SQL Server instance.
+    changed:
+      type: bool
+      description:
+        - Whether the SQL Server instance was changed.
+    failed:
+      type: bool
+      returned: The SQL Server instance could not be configured.
+      description:
+        - Whether the SQL Server instance could not be configured.
+    msg:
+      type: str
+      returned: The SQL Server instance could not be configured.
+      description:
+        - The error that occurred on the SQL Server instance.
+previous:
+  type: dict
+  returned: changed
+  description:
+    - The previous configuration of the SQL database schema-level permissions.
+  sample:
+    - permission: select
+      state: grant
+    - permission: execute
+      state: deny
+  contains:
+    permission:
+      type: str
+      description:
+        - The database schema-level permission.
+    state:
+      type: str
+      description:
+        - The state of the database schema-level permission.
+"""
+
+import traceback
+
+from ansible.module_utils.basic import missing_required_lib
+
+from typing import List, Optional
+
+try:
+    import pymssql
+except ImportError:
+    HAS_PYMSSQL: bool = False
+    PYMSSQL_IMPORT_ERROR: Optional[str] = traceback.format_exc()
+else:
+    HAS_PYMSSQL: bool = True
+    PYMSSQL_IMPORT_ERROR: Optional[str] = None
+
+from ..module_utils._mssql_lookup import MssqlLookupResult, lookup_securables
+from ..module_utils._mssql_module import MssqlModule, quote_name
+from ..module_utils._mssql_module_error import MssqlModuleError
+from ..module_utils._mssql_permission import (
+    PERMISSION_STATES,
+    SCHEMA_PERMISSIONS,
+    convert_permission_to_query,
+    get_permission_query
+)
+
+
+def run_module() -> None:
+    module: MssqlModule = MssqlModule(
+        argument_spec=dict(
+            principal=dict(type='str', required=True),
+            database=dict(type='str', required=True),
+            schema=dict(type='str', required=True),
+            permissions=dict(
+                type='list',
+                required=True,
+                elements='str',
+                choices=SCHEMA_PERMISSIONS
+            ),
+            state=dict(
+                type='str',
+                required=False,
+                default='grant',
+                choices=PERMISSION_STATES
+            )
+        ),
+        supports_login_hosts=True
+    )
+
+    if not HAS_PYMSSQL:
+        module.fail_json(
+            msg=missing_required_lib('pymssql'),
+            exception=PYMSSQL_IMPORT_ERROR)
+
+    module.run_reconcile(reconcile)
+
+
+def reconcile(module: MssqlModule) -> dict:
+    """
+    Configures the database schema-level permissions on the SQL Server instance of the module.
+
+    Args:
+        module (MssqlModule): The module instance.
+
+    Returns:
+        dict: The module result.
+    """
+
+    params: dict = module.get_defined_non_connection_params()
+
+    lookup: MssqlLookupResult = validate_params(params, module)
+
+    previous_permissions: dict = get_db_schema_permissions(
+        params['principal'],
+        params['database'],
+        lookup.schema_id,
+        params['permissions'],
+        module
+    )
+
+    changed: bool = False
+
+    previous: List[dict] = []
+    current: List[dict] = []
+
+    for permission, previous_state in previous_permissions.items():
+        if previous_state != params['state']:
+            changed: bool = True
+
+        if previous_state != 'revoke':
+            previous.append(dict(permission=permission, state=previous_state))
+
+        if params['state'] != 'revoke':
+            current.append(dict(permission=permission, state=params['state']))
+
+    if not module.check_mode:
+        modify_permissions(
+            params['principal'],
+            params['database'],
+            params['schema'],
+            previous_permissions,
+            params['state'],
+            module
+        )
+
+    if len(previous) > 0:
+        if len(current) > 0:
+            result: dict = dict(changed=changed, previous=previous, current=current)
+        else:
+            result: dict = dict(changed=changed, previous=previous)
+    else:
+        if len(current) > 0:
+            result: dict = dict(changed=changed, current=current)
+        else:
+            result: dict = dict(changed=changed)
+
+    return result
+
+
+def validate_params(params: dict, module: MssqlModule) -> MssqlLookupResult:
+    """
+    Validates the module parameters.
+
+    Args:
+        params (dict): The module parameters.
+        module (MssqlModule): The module instance.
+
+    Returns:
+        MssqlLookupResult: The result of the lookup of the database, principal, and schema.
+    """
+
+    if len(params['permissions']) < 1:
+        module.handle_error(MssqlModuleError(message='At least one permission must be specified.'))
+
+    lookup: MssqlLookupResult = lookup_securables(
+        module,
+        database=params['database'],
+        principal=params['principal'],
+        schema=params['schema']
+    )
+
+    if not lookup.database_exists:
+        module.handle_error(MssqlModuleError(message=f"No database exists with the name '{params['database']}'."))
+
+    if not lookup.principal_exists:
+        module.handle_error(MssqlModuleError(message=f"No database principal exists with the name '{params['principal']}'."))
+
+    if not lookup.schema_exists:
+        module.handle_error(MssqlModuleError(message=f"No schema exists with the name '{params['schema']}'."))
+
+    return lookup
+
+
+def get_db_schema_permissions(
+        principal: str,
+        database: str,
+        schema_id: int,
+        permissions: List[str],
+        module: MssqlModule) -> dict:
+    """
+    Gets the database schema-level permissions with a single query.
+
+    Args:
+        principal (str): The name of the database principal.
+        database (str): The name of the database.
+        schema_id (int): The ID of the schema.
+        permissions (List[str]): The database schema-level permissions.
+        module (MssqlModule): The module instance.
+
+    Returns:
+        dict: The state of each requested permission.
+    """
+
+    statement: str = f"""
+    SELECT permissions.permission_name AS permission,
+            permissions.state_desc AS state
+    FROM {quote_name(database)}.sys.database_permissions permissions
+    JOIN {quote_name(database)}.sys.database_principals principals
+    ON permissions.grantee_principal_id = principals.principal_id
+    WHERE principals.name = %(principal)s
+    AND permissions.class_desc = 'SCHEMA'
+    AND permissions.major_id = %(schema_id)s
+    """
+
+    rows: List[dict] = module.execute_query(statement, dict(principal=principal, schema_id=schema_id))
+
+    held_permissions: dict = {}
+
+    for row in rows:
+        held_permissions[row['permission']] = row['state'].lower()
+
+    results: dict = {}
+
+    for permission in permissions:
+        results[permission] = held_permissions.get(convert_permission_to_query(permission), 'revoke')
+
+    return results
+
+
+def modify_permissions(
+        principal: str,
+        database: str,
+        schema: str,
+        previous_permissions: dict,
+        state: str,
+        module: MssqlModule) -> None:
+    """
+    Modifies the database schema-level permissions in a single batch and transaction.
+
+    Args:
+        principal (str): The name of the database principal.
+        database (str): The name of the database.
+        schema (str): The name of the schema.
+        previous_permissions (dict): The previous state of each permission.
+        state (str): The desired state of the permissions.
+        module (MssqlModule): The module instance.
+    """
+
+    queries: List[str] = []
+
+    for permission, previous_state in previous_permissions.items():
+        query: Optional[str] = get_permission_query(
+            principal,
+            permission,
+            previous_state,
+            state,
+            securable=f"SCHEMA::{quote_name(schema)}"
+        )
+
+        if query is not None:
+            queries.append(query)
+
+    module.execute_batch(queries, database=database)
+
+
+def main() -> None:
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -27,9 +27,38 @@ options:
       - The name of the SQL Login to configure as a database user.
   database:
     type: str
-    required: true
+    required: false
     description:
       - The name of the database for which to configure the SQL Login as a user.
+      - One of O(database), O(databases), or O(database_pattern) is required.
+  databases:
+    type: list
+    required: false
+    elements: str
+    version_added: 1.5.0
+    description:
+      - The names of the databases for which to configure the SQL Login as a user.
+      - Every database must exist and be online.
+      - The databases are configured in parallel and the result is returned for each database.
+      - One of O(database), O(databases), or O(database_pattern) is required.
+  database_pattern:
+    type: str
+    required: false
+    version_added: 1.5.0
+    description:
+      - A SQL C(LIKE) pattern matching the names of the databases for which to configure the SQL Login as a user.
+      - Only online databases are matched.
+      - The databases are configured in parallel and the result is returned for each database.
+      - One of O(database), O(databases), or O(database_pattern) is required.
+  max_workers:
+    type: int
+    required: false
+    default: 4
+    version_added: 1.5.0
+    description:
+      - The maximum number of databases to configure at the same time when O(databases) or O(database_pattern) is used.
+      - Each worker opens its own connection to the SQL Server instance.
+      - When the trippsc2.mssql.mssql connection plugin is used, the databases are configured one after another in the session.
   state:
     type: str
     required: false
@@ -43,7 +72,7 @@ options:
 
 EXAMPLES = r"""
 - name: Create a SQL database user
-  trippsc2.mssql.mssql_login:
+  trippsc2.mssql.mssql_db_user:
     login_user: sa
     login_password: password
     login_host: localhost
@@ -52,24 +81,75 @@ EXAMPLES = r"""
     state: present
 
 - name: Remove a SQL database user
-  trippsc2.mssql.mssql_login:
+  trippsc2.mssql.mssql_db_user:
     login_user: sa
     login_password: password
     login_host: localhost
     name: test
     database: tempdb
     state: absent
+
+- name: Create a SQL database user in several databases
+  trippsc2.mssql.mssql_db_user:
+    login_user: sa
+    login_password: password
+    login_host: localhost
+    name: test
+    databases:
+      - app1
+      - app2
+    state: present
+
+- name: Create a SQL database user in every database whose name starts with app_
+  trippsc2.mssql.mssql_db_user:
+    login_user: sa
+    login_password: password
+    login_host: localhost
+    name: test
+    database_pattern: app[_]%
+    max_workers: 8
+    state: present
 """
 
 RETURN = r"""
+databases:
+  type: list
+  elements: dict
+  returned: O(databases) or O(database_pattern) is defined
+  description:
+    - The result for each database.
+  sample:
+    - database: app1
+      changed: true
+    - database: app2
+      changed: false
+  contains:
+    database:
+      type: str
+      description:
+        - The name of the database.
+    changed:
+      type: bool
+      description:
+        - Whether the database user was created or removed in the database.
+    failed:
+      type: bool
+      returned: The database could not be configured.
+      description:
+        - Whether the database could not be configured.
+    msg:
+      type: str
+      returned: The database could not be configured.
+      description:
+        - The error returned by SQL Server.
 """
 
+import json
 import traceback
 
 from ansible.module_utils.basic import missing_required_lib
-from ansible.module_utils.common.text.converters import to_native
 
-from typing import Optional
+from typing import List, Optional
 
 try:
     import pymssql
@@ -80,7 +160,8 @@ else:
     HAS_PYMSSQL: bool = True
     PYMSSQL_IMPORT_ERROR: Optional[str] = None
 
-from ..module_utils._mssql_module import MssqlModule
+from ..module_utils._mssql_lookup import MssqlLookupResult, lookup_securables
+from ..module_utils._mssql_module import MssqlModule, quote_name, unique
 from ..module_utils._mssql_module_error import MssqlModuleError
 
 
@@ -88,9 +169,18 @@ def run_module():
     module = MssqlModule(
         argument_spec=dict(
             name=dict(type='str', required=True),
-            database=dict(type='str', required=True),
+            database=dict(type='str', required=False),
+            databases=dict(type='list', required=False, elements='str'),
+            database_pattern=dict(type='str', required=False),
+            max_workers=dict(type='int', required=False, default=4),
             state=dict(type='str', required=False, default='present', choices=['present', 'absent'])
-        )
+        ),
+        mutually_exclusive=[
+            ('database', 'databases', 'database_pattern')
+        ],
+        required_one_of=[
+            ('database', 'databases', 'database_pattern')
+        ]
     )
 
     if not HAS_PYMSSQL:
@@ -100,44 +190,55 @@ def run_module():
 
     params = module.get_defined_non_connection_params()
     module.initialize_client()
-    validate_params(params, module)
+
+    if 'database' not in params:
+        result: dict = ensure_databases(params, module)
+        module.close_client_session()
+        module.exit_json(**result)
+
+    lookup: MssqlLookupResult = validate_params(params, module)
 
     if params['state'] == 'present':
-        result = ensure_present(params, module)
+        result = ensure_present(params, lookup, module)
     else:
-        result = ensure_absent(params, module)
+        result = ensure_absent(params, lookup, module)
 
     module.close_client_session()
     module.exit_json(**result)
 
 
-def validate_params(params: dict, module: MssqlModule) -> None:
+def validate_params(params: dict, module: MssqlModule) -> MssqlLookupResult:
     """
     Validate the module parameters.
 
     Args:
         params (dict): The module parameters.
         module (MssqlModule): The Ansible module.
-    """
 
-    query: str = f"SELECT name FROM sys.databases WHERE name = '{params['database']}'"
+    Returns:
+        MssqlLookupResult: The result of the lookup of the database, login, and user.
+    """
 
-    try:
-        module.cursor.execute(query)
-        result: Optional[dict] = module.cursor.fetchone()
-    except Exception as e:
-        module.handle_error(MssqlModuleError(message=to_native(e), exception=e))
+    lookup: MssqlLookupResult = lookup_securables(
+        module,
+        database=params['database'],
+        principal=params['name'],
+        logins=[params['name']] if params['state'] == 'present' else None
+    )
 
-    if result is None:
+    if not lookup.database_exists:
         module.handle_error(MssqlModuleError(message=f"No database exists with the name '{params['database']}'."))
 
+    return lookup
 
-def ensure_present(params: dict, module: MssqlModule) -> dict:
+
+def ensure_present(params: dict, lookup: MssqlLookupResult, module: MssqlModule) -> dict:
     """
     Ensure the login is present in the database.
 
     Args:
         params (dict): The module parameters.
+        lookup (MssqlLookupResult): The result of the lookup of the login and user.
         module (MssqlModule): The Ansible module.
 
     Returns:
@@ -147,33 +248,25 @@ def ensure_present(params: dict, module: MssqlModule) -> dict:
     name: str = params['name']
     database: str = params['database']
 
-    if not get_login(name, module):
+    if not lookup.login_exists(name):
         module.handle_error(MssqlModuleError(message=f"No server login exists for '{name}'."))
 
-    if get_user(name, database, module):
+    if lookup.principal_exists:
         return dict(changed=False)
 
     if not module.check_mode:
-        query: str = f"""
-        USE [{database}];
-        CREATE USER [{name}] FOR LOGIN [{name}]
-        """
-
-        try:
-            module.cursor.execute(query)
-            module.conn.commit()
-        except Exception as e:
-            module.handle_error(MssqlModuleError(message=to_native(e), exception=e))
+        module.execute_batch([f"CREATE USER {quote_name(name)} FOR LOGIN {quote_name(name)};"], database=database)
 
     return dict(changed=True)
 
 
-def ensure_absent(params: dict, module: MssqlModule) -> dict:
+def ensure_absent(params: dict, lookup: MssqlLookupResult, module: MssqlModule) -> dict:
     """
     Ensure the login is absent in the database.
 
     Args:
         params (dict): The module parameters.
+        lookup (MssqlLookupResult): The result of the lookup of the user.
         module (MssqlModule): The Ansible module.
 
     Returns:
@@ -183,69 +276,147 @@ def ensure_absent(params: dict, module: MssqlModule) -> dict:
     name: str = params['name']
     database: str = params['database']
 
-    if not get_user(name, database, module):
+    if not lookup.principal_exists:
         return dict(changed=False)
 
     if not module.check_mode:
-        query: str = f"""
-        USE [{database}];
-        DROP USER [{name}]
-        """
-
-        try:
-            module.cursor.execute(query)
-            module.conn.commit()
-        except Exception as e:
-            module.handle_error(MssqlModuleError(message=to_native(e), exception=e))
+        module.execute_batch([f"DROP USER {quote_name(name)};"], database=database)
 
     return dict(changed=True)
 
 
-def get_login(name: str, module: MssqlModule) -> bool:
+def ensure_databases(params: dict, module: MssqlModule) -> dict:
+    """
+    Ensure the login is present in or absent from several databases.
+    The databases are configured in parallel, each in its own transaction, and the result is reported for each database.
+
+    Args:
+        params (dict): The module parameters.
+        module (MssqlModule): The Ansible module.
+
+    Returns:
+        dict: The module result.
+    """
+
+    name: str = params['name']
+
+    if params['max_workers'] < 1:
+        module.handle_error(MssqlModuleError(message='The max_workers parameter must be at least 1.'))
+
+    if params['state'] == 'present':
+        lookup: MssqlLookupResult = lookup_securables(module, logins=[name])
+
+        if not lookup.login_exists(name):
+            module.handle_error(MssqlModuleError(message=f"No server login exists for '{name}'."))
+
+    databases: List[str] = get_databases(params, module)
+    user_databases: List[str] = get_user_databases(name, databases, module)
+
+    batches: dict = {}
+
+    for database in databases:
+        if params['state'] == 'present' and database not in user_databases:
+            batches[database] = [f"CREATE USER {quote_name(name)} FOR LOGIN {quote_name(name)};"]
+        elif params['state'] == 'absent' and database in user_databases:
+            batches[database] = [f"DROP USER {quote_name(name)};"]
+
+    errors: dict = {}
+
+    if not module.check_mode:
+        errors: dict = module.execute_batches(batches, max_workers=params['max_workers'])
+
+    results: List[dict] = []
+
+    for database in databases:
+        if database in errors:
+            results.append(dict(database=database, changed=False, failed=True, msg=errors[database]))
+        else:
+            results.append(dict(database=database, changed=database in batches))
+
+    result: dict = dict(changed=any(database_result['changed'] for database_result in results), databases=results)
+
+    if len(errors) > 0:
+        module.close_client_session()
+        module.fail_json(msg=f"Failed to configure the database user in {len(errors)} of {len(batches)} databases.", **result)
+
+    return result
+
+
+def get_databases(params: dict, module: MssqlModule) -> List[str]:
     """
-    Check if the login exists in the database.
+    Gets the databases to configure with a single query.
+    If the databases are listed, every database must exist and be online.
 
     Args:
-        name (str): The name of the login.
+        params (dict): The module parameters.
         module (MssqlModule): The Ansible module.
 
     Returns:
-        bool: True if the login exists, False otherwise.
+        List[str]: The names of the databases.
+    """
+
+    if 'database_pattern' in params:
+        statement: str = """
+        SELECT name
+        FROM sys.databases
+        WHERE name LIKE %(pattern)s
+        AND state_desc = 'ONLINE'
+        ORDER BY name
+        """
+
+        rows: List[dict] = module.execute_query(statement, dict(pattern=params['database_pattern']))
+
+        return [row['name'] for row in rows]
+
+    requested: List[str] = unique(params['databases'])
+
+    if len(requested) < 1:
+        module.handle_error(MssqlModuleError(message='At least one database must be specified.'))
+
+    statement: str = """
+    SELECT CAST(requested.[key] AS int) AS request_index,
+            databases.state_desc AS state
+    FROM OPENJSON(%(databases)s) requested
+    JOIN sys.databases databases ON databases.name = requested.value COLLATE DATABASE_DEFAULT
     """
 
-    query: str = f"SELECT name FROM sys.server_principals WHERE name = '{name}'"
+    rows: List[dict] = module.execute_query(statement, dict(databases=json.dumps(requested)))
+    states: dict = dict((requested[row['request_index']], row['state']) for row in rows)
+
+    for database in requested:
+        if database not in states:
+            module.handle_error(MssqlModuleError(message=f"No database exists with the name '{database}'."))
 
-    try:
-        module.cursor.execute(query)
-        result: Optional[dict] = module.cursor.fetchone()
-    except Exception as e:
-        module.handle_error(MssqlModuleError(message=to_native(e), exception=e))
+        if states[database] != 'ONLINE':
+            module.handle_error(MssqlModuleError(message=f"The database '{database}' is not online."))
 
-    return result is not None
+    return requested
 
 
-def get_user(name: str, database: str, module: MssqlModule) -> bool:
+def get_user_databases(name: str, databases: List[str], module: MssqlModule) -> List[str]:
     """
-    Check if the user exists in the database.
+    Gets the databases in which the database user exists with a single query.
 
     Args:
-        name (str): The name of the login.
-        database (str): The name of the database.
+        name (str): The name of the database user.
+        databases (List[str]): The names of the databases to check.
         module (MssqlModule): The Ansible module.
 
     Returns:
-        bool: True if the user exists, False otherwise.
+        List[str]: The names of the databases in which the database user exists.
     """
 
-    query: str = f"SELECT name FROM {database}.sys.database_principals WHERE name = '{name}'"
+    if len(databases) < 1:
+        return []
+
+    statement: str = '\nUNION ALL\n'.join(
+        f"SELECT {index} AS database_index FROM {quote_name(database)}.sys.database_principals WHERE name = %(name)s"
+        for index, database in enumerate(databases)
+    )
 
-    try:
-        module.cursor.execute(query)
-        result: Optional[dict] = module.cursor.fetchone()
-    except Exception as e:
-        module.handle_error(MssqlModuleError(message=to_native(e), exception=e))
+    rows: List[dict] = module.execute_query(statement, dict(name=name))
 
-    return result is not None
+    return [databases[row['database_index']] for row in rows]
 
 
 def main() -> None:
@@ -0,0 +1,671 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+module: mssql_info
+version_added: 1.5.0
+author:
+  - Jim Tarpley (@trippsc2)
+short_description: Gathers information about the security model of a Microsoft SQL Server instance.
+description:
+  - Gathers the logins, databases, database users, role memberships, and permissions of a Microsoft SQL Server instance.
+  - Each kind of information is read with a single query, and each query is read in pages, so large instances do not exhaust the memory of the module.
+  - Database-level information is only gathered for online databases that the login used by the module can access.
+attributes:
+  check_mode:
+    support: full
+    description:
+      - This module does not make any changes.
+extends_documentation_fragment:
+  - trippsc2.mssql.login
+options:
+  gather_subset:
+    type: list
+    required: false
+    elements: str
+    default:
+      - all
+    choices:
+      - all
+      - logins
+      - server_role_members
+      - server_permissions
+      - databases
+      - users
+      - database_role_members
+      - database_permissions
+      - object_permissions
+    description:
+      - The kinds of information to gather.
+      - V(all) gathers every kind of information.
+  databases:
+    type: list
+    required: false
+    elements: str
+    description:
+      - The names of the databases for which to gather database-level information.
+      - If not specified, database-level information is gathered for every database.
+"""
+
+EXAMPLES = r"""
+- name: Gather all information
+  trippsc2.mssql.mssql_info:
+    login_user: sa
+    login_password: password
+    login_host: localhost
+  register: mssql_info
+
+- name: Gather logins and server-level permissions
+  trippsc2.mssql.mssql_info:
+    login_user: sa
+    login_password: password
+    login_host: localhost
+    gather_subset:
+      - logins
+      - server_permissions
+
+- name: Gather the users and permissions of a database
+  trippsc2.mssql.mssql_info:
+    login_user: sa
+    login_password: password
+    login_host: localhost
+    gather_subset:
+      - users
+      - database_permissions
+      - object_permissions
+    databases:
+      - appdb
+"""
+
+RETURN = r"""
+logins:
+  type: list
+  elements: dict
+  returned: O(gather_subset) contains V(all) or V(logins)
+  description:
+    - The logins of the instance, in the format returned by M(trippsc2.mssql.mssql_login).
+  sample:
+    - name: test
+      type: sql
+      enabled: true
+      login_password_expiration_enabled: false
+      login_password_policy_enforced: true
+server_role_members:
+  type: list
+  elements: dict
+  returned: O(gather_subset) contains V(all) or V(server_role_members)
+  description:
+    - The members of the server roles.
+  sample:
+    - role: sysadmin
+      member: sa
+  contains:
+    role:
+      type: str
+      description:
+        - The name of the server role.
+    member:
+      type: str
+      description:
+        - The name of the member.
+server_permissions:
+  type: list
+  elements: dict
+  returned: O(gather_subset) contains V(all) or V(server_permissions)
+  description:
+    - The server-level permissions, in the format used by M(trippsc2.mssql.mssql_server_permission).
+  sample:
+    - principal: test
+      permission: view_server_state
+      state: grant
+  contains:
+    principal:
+      type: str
+      description:
+        - The name of the server principal.
+    permission:
+      type: str
+      description:
+        - The server-level permission.
+    state:
+      type: str
+      description:
+        - The state of the server-level permission.
+databases:
+  type: list
+  elements: dict
+  returned: O(gather_subset) contains V(all) or V(databases)
+  description:
+    - The databases of the instance.
+  sample:
+    - name: tempdb
+      state: online
+      accessible: true
+  contains:
+    name:
+      type: str
+      description:
+        - The name of the database.
+    state:
+      type: str
+      description:
+        - The state of the database.
+    accessible:
+      type: bool
+      description:
+        - Whether the login used by the module can access the database.
+users:
+  type: list
+  elements: dict
+  returned: O(gather_subset) contains V(all) or V(users)
+  description:
+    - The users of the databases.
+  sample:
+    - database: tempdb
+      name: test
+      type: sql
+      login: test
+  contains:
+    database:
+      type: str
+      description:
+        - The name of the database.
+    name:
+      type: str
+      description:
+        - The name of the database user.
+    type:
+      type: str
+      description:
+        - The type of the database user.
+    login:
+      type: str
+      description:
+        - The name of the login mapped to the database user, if any.
+database_role_members:
+  type: list
+  elements: dict
+  returned: O(gather_subset) contains V(all) or V(database_role_members)
+  description:
+    - The members of the database roles.
+  sample:
+    - database: tempdb
+      role: db_datareader
+      member: test
+  contains:
+    database:
+      type: str
+      description:
+        - The name of the database.
+    role:
+      type: str
+      description:
+        - The name of the database role.
+    member:
+      type: str
+      description:
+        - The name of the member.
+database_permissions:
+  type: list
+  elements: dict
+  returned: O(gather_subset) contains V(all) or V(database_permissions)
+  description:
+    - The database-level permissions, in the format used by M(trippsc2.mssql.mssql_db_permission).
+  sample:
+    - database: tempdb
+      principal: test
+      permission: connect
+      state: grant
+  contains:
+    database:
+      type: str
+      description:
+        - The name of the database.
+    principal:
+      type: str
+      description:
+        - The name of the database principal.
+    permission:
+      type: str
+      description:
+        - The database-level permission.
+    state:
+      type: str
+      description:
+        - The state of the database-level permission.
+object_permissions:
+  type: list
+  elements: dict
+  returned: O(gather_subset) contains V(all) or V(object_permissions)
+  description:
+    - The database object-level permissions, in the format used by M(trippsc2.mssql.mssql_db_object_permission).
+    - Column-level permissions are not included.
+  sample:
+    - database: msdb
+      principal: test
+      schema: dbo
+      object: sysjobs
+      permission: select
+      state: grant
+  contains:
+    database:
+      type: str
+      description:
+        - The name of the database.
+    principal:
+      type: str
+      description:
+        - The name of the database principal.
+    schema:
+      type: str
+      description:
+        - The name of the schema of the object.
+    object:
+      type: str
+      description:
+        - The name of the object.
+    permission:
+      type: str
+      description:
+        - The database object-level permission.
+    state:
+      type: str
+      description:
+        - The state of the database object-level permission.
+"""
+
+import json
+import traceback
+
+from ansible.module_utils.basic import missing_required_lib
+
+from typing import List, Optional
+
+try:
+    import pymssql
+except ImportError:
+    HAS_PYMSSQL: bool = False
+    PYMSSQL_IMPORT_ERROR: Optional[str] = traceback.format_exc()
+else:
+    HAS_PYMSSQL: bool = True
+    PYMSSQL_IMPORT_ERROR: Optional[str] = None
+
+from ..module_utils._mssql_login import PRINCIPAL_TYPES, format_login
+from ..module_utils._mssql_module import MssqlModule, quote_name
+from ..module_utils._mssql_module_error import MssqlModuleError
+from ..module_utils._mssql_permission import convert_permission_from_query
+
+SUBSETS: List[str] = [
+    'logins',
+    'server_role_members',
+    'server_permissions',
+    'databases',
+    'users',
+    'database_role_members',
+    'database_permissions',
+    'object_permissions'
+]
+
+DATABASE_SUBSETS: List[str] = ['users', 'database_role_members', 'database_permissions', 'object_permissions']
+
+
+def run_module() -> None:
+    module: MssqlModule = MssqlModule(
+        argument_spec=dict(
+            gather_subset=dict(type='list', required=False, elements='str', default=['all'], choices=['all'] + SUBSETS),
+            databases=dict(type='list', required=False, elements='str')
+        )
+    )
+
+    if not HAS_PYMSSQL:
+        module.fail_json(
+            msg=missing_required_lib('pymssql'),
+            exception=PYMSSQL_IMPORT_ERROR)
+
+    params: dict = module.get_defined_non_connection_params()
+    module.initialize_client()
+
+    if 'all' in params['gather_subset']:
+        subsets: List[str] = SUBSETS
+    else:
+        subsets: List[str] = [subset for subset in SUBSETS if subset in params['gather_subset']]
+
+    result: dict = dict(changed=False)
+
+    if 'logins' in subsets:
+        result['logins'] = get_logins(module)
+
+    if 'server_role_members' in subsets:
+        result['server_role_members'] = get_server_role_members(module)
+
+    if 'server_permissions' in subsets:
+        result['server_permissions'] = get_server_permissions(module)
+
+    if 'databases' in subsets or any(subset in DATABASE_SUBSETS for subset in subsets):
+        databases: List[dict] = get_databases(params.get('databases'), module)
+
+        if 'databases' in subsets:
+            result['databases'] = databases
+
+        accessible_databases: List[str] = [database['name'] for database in databases if database['accessible']]
+
+        if 'users' in subsets:
+            result['users'] = get_users(accessible_databases, module)
+
+        if 'database_role_members' in subsets:
+            result['database_role_members'] = get_database_role_members(accessible_databases, module)
+
+        if 'database_permissions' in subsets:
+            result['database_permissions'] = get_database_permissions(accessible_databases, module)
+
+        if 'object_permissions' in subsets:
+            result['object_permissions'] = get_object_permissions(accessible_databases, module)
+
+    module.close_client_session()
+    module.exit_json(**result)
+
+
+def get_logins(module: MssqlModule) -> List[dict]:
+    """
+    Gets every login of the instance with a single query.
+
+    Args:
+        module (MssqlModule): The module instance.
+
+    Returns:
+        List[dict]: The logins, in the format returned by format_login.
+    """
+
+    statement: str = """
+    SELECT sp.name,
+            sp.type,
+            sp.is_disabled,
+            sl.is_policy_checked,
+            sl.is_expiration_checked
+    FROM sys.server_principals sp
+    LEFT JOIN sys.sql_logins sl ON sp.principal_id = sl.principal_id
+    WHERE sp.type IN ('S', 'U', 'G', 'C', 'E', 'X', 'K')
+    ORDER BY sp.name
+    """
+
+    return [
+        format_login(
+            dict(
+                name=name,
+                type=type,
+                is_disabled=is_disabled,
+                is_policy_checked=is_policy_checked,
+                is_expiration_checked=is_expiration_checked
+            ),
+            module
+        )
+        for name, type, is_disabled, is_policy_checked, is_expiration_checked in module.iterate_query(statement)
+    ]
+
+
+def get_server_role_members(module: MssqlModule) -> List[dict]:
+    """
+    Gets the members of every server role with a single query.
+
+    Args:
+        module (MssqlModule): The module instance.
+
+    Returns:
+        List[dict]: The role memberships.
+    """
+
+    statement: str = """
+    SELECT roles.name,
+            members.name
+    FROM sys.server_role_members role_members
+    JOIN sys.server_principals roles ON role_members.role_principal_id = roles.principal_id
+    JOIN sys.server_principals members ON role_members.member_principal_id = members.principal_id
+    ORDER BY roles.name, members.name
+    """
+
+    return [dict(role=role, member=member) for role, member in module.iterate_query(statement)]
+
+
+def get_server_permissions(module: MssqlModule) -> List[dict]:
+    """
+    Gets every server-level permission with a single query.
+
+    Args:
+        module (MssqlModule): The module instance.
+
+    Returns:
+        List[dict]: The server-level permissions.
+    """
+
+    statement: str = """
+    SELECT principals.name,
+            permissions.permission_name,
+            permissions.state_desc
+    FROM sys.server_permissions permissions
+    JOIN sys.server_principals principals ON permissions.grantee_principal_id = principals.principal_id
+    WHERE permissions.class_desc = 'SERVER'
+    ORDER BY principals.name, permissions.permission_name
+    """
+
+    return [
+        dict(principal=principal, permission=convert_permission_from_query(permission), state=state.lower())
+        for principal, permission, state in module.iterate_query(statement)
+    ]
+
+
+def get_databases(names: Optional[List[str]], module: MssqlModule) -> List[dict]:
+    """
+    Gets the databases of the instance with a single query.
+
+    Args:
+        names (Optional[List[str]]): The names of the databases to get. If not specified, every database is returned.
+        module (MssqlModule): The module instance.
+
+    Returns:
+        List[dict]: The databases.
+    """
+
+    if names is None:
+        statement: str = """
+        SELECT name,
+                state_desc,
+                HAS_DBACCESS(name)
+        FROM sys.databases
+        ORDER BY name
+        """
+
+        rows: List[tuple] = list(module.iterate_query(statement))
+    else:
+        statement: str = """
+        SELECT databases.name,
+                databases.state_desc,
+                HAS_DBACCESS(databases.name)
+        FROM OPENJSON(%(names)s) requested
+        JOIN sys.databases databases ON databases.name = requested.value COLLATE DATABASE_DEFAULT
+        ORDER BY databases.name
+        """
+
+        rows: List[tuple] = list(module.iterate_query(statement, dict(names=json.dumps(names))))
+        existing_names: List[str] = [row[0] for row in rows]
+
+        for name in names:
+            if name not in existing_names:
+                module.handle_error(MssqlModuleError(message=f"No database exists with the name '{name}'."))
+
+    return [
+        dict(name=name, state=state.lower(), accessible=state == 'ONLINE' and has_access == 1)
+        for name, state, has_access in rows
+    ]
+
+
+def get_database_statement(databases: List[str], statement: str) -> str:
+    """
+    Combines a statement for each database into a single statement with UNION ALL.
+    In the statement, {database} is replaced with the quoted name of the database and {index} with its index.
+    Databases can have different collations, so every string column of the statement must be cast with COLLATE DATABASE_DEFAULT,
+    or UNION ALL fails with a collation conflict.
+
+    Args:
+        databases (List[str]): The names of the databases.
+        statement (str): The statement to run in each database.
+
+    Returns:
+        str: The combined statement.
+    """
+
+    return '\nUNION ALL\n'.join(
+        statement.format(database=quote_name(database), index=index)
+        for index, database in enumerate(databases)
+    )
+
+
+def get_users(databases: List[str], module: MssqlModule) -> List[dict]:
+    """
+    Gets the users of every database with a single query.
+
+    Args:
+        databases (List[str]): The names of the databases.
+        module (MssqlModule): The module instance.
+
+    Returns:
+        List[dict]: The database users.
+    """
+
+    if len(databases) < 1:
+        return []
+
+    statement: str = get_database_statement(databases, """
+    SELECT {index},
+            principals.name COLLATE DATABASE_DEFAULT,
+            principals.type COLLATE DATABASE_DEFAULT,
+            logins.name COLLATE DATABASE_DEFAULT
+    FROM {database}.sys.database_principals principals
+    LEFT JOIN sys.server_principals logins ON principals.sid = logins.sid
+    WHERE principals.type IN ('S', 'U', 'G', 'C', 'E', 'X', 'K')
+    """)
+
+    return [
+        dict(database=databases[index], name=name, type=PRINCIPAL_TYPES[type], login=login)
+        for index, name, type, login in module.iterate_query(statement)
+    ]
+
+
+def get_database_role_members(databases: List[str], module: MssqlModule) -> List[dict]:
+    """
+    Gets the members of the roles of every database with a single query.
+
+    Args:
+        databases (List[str]): The names of the databases.
+        module (MssqlModule): The module instance.
+
+    Returns:
+        List[dict]: The role memberships.
+    """
+
+    if len(databases) < 1:
+        return []
+
+    statement: str = get_database_statement(databases, """
+    SELECT {index},
+            roles.name COLLATE DATABASE_DEFAULT,
+            members.name COLLATE DATABASE_DEFAULT
+    FROM {database}.sys.database_role_members role_members
+    JOIN {database}.sys.database_principals roles ON role_members.role_principal_id = roles.principal_id
+    JOIN {database}.sys.database_principals members ON role_members.member_principal_id = members.principal_id
+    """)
+
+    return [
+        dict(database=databases[index], role=role, member=member)
+        for index, role, member in module.iterate_query(statement)
+    ]
+
+
+def get_database_permissions(databases: List[str], module: MssqlModule) -> List[dict]:
+    """
+    Gets the database-level permissions of every database with a single query.
+
+    Args:
+        databases (List[str]): The names of the databases.
+        module (MssqlModule): The module instance.
+
+    Returns:
+        List[dict]: The database-level permissions.
+    """
+
+    if len(databases) < 1:
+        return []
+
+    statement: str = get_database_statement(databases, """
+    SELECT {index},
+            principals.name COLLATE DATABASE_DEFAULT,
+            permissions.permission_name COLLATE DATABASE_DEFAULT,
+            permissions.state_desc COLLATE DATABASE_DEFAULT
+    FROM {database}.sys.database_permissions permissions
+    JOIN {database}.sys.database_principals principals ON permissions.grantee_principal_id = principals.principal_id
+    WHERE permissions.class_desc = 'DATABASE'
+    """)
+
+    return [
+        dict(
+            database=databases[index],
+            principal=principal,
+            permission=convert_permission_from_query(permission),
+            state=state.lower()
+        )
+        for index, principal, permission, state in module.iterate_query(statement)
+    ]
+
+
+def get_object_permissions(databases: List[str], module: MssqlModule) -> List[dict]:
+    """
+    Gets the database object-level permissions of every database with a single query.
+    Column-level permissions are not included.
+
+    Args:
+        databases (List[str]): The names of the databases.
+        module (MssqlModule): The module instance.
+
+    Returns:
+        List[dict]: The database object-level permissions.
+    """
+
+    if len(databases) < 1:
+        return []
+
+    statement: str = get_database_statement(databases, """
+    SELECT {index},
+            principals.name COLLATE DATABASE_DEFAULT,
+            schemas.name COLLATE DATABASE_DEFAULT,
+            objects.name COLLATE DATABASE_DEFAULT,
+            permissions.permission_name COLLATE DATABASE_DEFAULT,
+            permissions.state_desc COLLATE DATABASE_DEFAULT
+    FROM {database}.sys.database_permissions permissions
+    JOIN {database}.sys.database_principals principals ON permissions.grantee_principal_id = principals.principal_id
+    JOIN {database}.sys.objects objects ON permissions.major_id = objects.object_id
+    JOIN {database}.sys.schemas schemas ON objects.schema_id = schemas.schema_id
+    WHERE permissions.class_desc = 'OBJECT_OR_COLUMN'
+    AND permissions.minor_id = 0
+    """)
+
+    return [
+        dict(
+            database=databases[index],
+            principal=principal,
+            schema=schema,
+            object=object_name,
+            permission=convert_permission_from_query(permission),
+            state=state.lower()
+        )
+        for index, principal, schema, object_name, permission, state in module.iterate_query(statement)
+    ]
+
+
+def main() -> None:
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
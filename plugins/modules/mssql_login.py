@@ -22,9 +22,10 @@ extends_documentation_fragment:
 options:
   name:
     type: str
-    required: true
+    required: false
     description:
       - The name of the SQL Login to configure.
+      - One of O(name) or O(logins) is required.
   type:
     type: str
     required: false
@@ -66,6 +67,8 @@ options:
     description:
       - Specifies when to update the password.
       - Only valid when C(state=present) and C(type=sql).
+      - With V(always), the password is compared to the stored password hash first and is only set if it does not match.
+        If the password hash cannot be read by the login used by the module, the password is always set.
   login_password_expiration_enabled:
     type: bool
     required: false
@@ -78,6 +81,79 @@ options:
     description:
       - Specifies whether the SQL Login password policy is enforced.
       - Only valid when C(state=present) and C(type=sql).
+  logins:
+    type: list
+    required: false
+    elements: dict
+    version_added: 1.5.0
+    description:
+      - The SQL Logins to configure, instead of a single SQL Login.
+      - All existing logins are read with a single query and all changes are applied in a single batch in one transaction.
+      - The options of each SQL Login match the options of the module.
+        The top-level O(type), O(state), and O(update_password) options are used as the defaults of
+        O(logins[].type), O(logins[].state), and O(logins[].update_password).
+      - One of O(name) or O(logins) is required.
+    suboptions:
+      name:
+        type: str
+        required: true
+        description:
+          - The name of the SQL login.
+      type:
+        type: str
+        required: false
+        choices:
+          - sql
+          - windows
+        description:
+          - The type of login.
+          - If not specified, the value of O(type) is used.
+      state:
+        type: str
+        required: false
+        choices:
+          - present
+          - absent
+        description:
+          - The desired state of the SQL login.
+          - If not specified, the value of O(state) is used.
+      enabled:
+        type: bool
+        required: false
+        description:
+          - Specifies whether the SQL login is enabled.
+          - Only valid when O(logins[].state=present).
+      password:
+        type: str
+        required: false
+        description:
+          - The password for the SQL login.
+          - Only valid when O(logins[].state=present) and O(logins[].type=sql).
+          - Required when the SQL login does not exist and O(logins[].type=sql).
+      update_password:
+        type: str
+        required: false
+        choices:
+          - always
+          - on_create
+        description:
+          - Specifies when to update the password.
+          - If not specified, the value of O(update_password) is used.
+          - Only valid when O(logins[].state=present) and O(logins[].type=sql).
+          - With V(always), the password is compared to the stored password hash first and is only set if it does not match.
+            If the password hash cannot be read by the login used by the module, the password is always set.
+      login_password_expiration_enabled:
+        type: bool
+        required: false
+        description:
+          - Specifies whether the SQL login password expiration policy is enabled.
+          - Only valid when O(logins[].state=present) and O(logins[].type=sql).
+      login_password_policy_enforced:
+        type: bool
+        required: false
+        description:
+          - Specifies whether the SQL login password policy is enforced.
+          - Only valid when O(logins[].state=present) and O(logins[].type=sql).
 """
 
 EXAMPLES = r"""
@@ -129,6 +205,22 @@ EXAMPLES = r"""
     type: windows
     state: present
 
+- name: Configure several SQL Logins
+  trippsc2.mssql.mssql_login:
+    login_user: sa
+    login_password: password
+    login_host: localhost
+    logins:
+      - name: app1
+        password: password1
+      - name: app2
+        password: password2
+        update_password: on_create
+      - name: "TEST\\testuser"
+        type: windows
+      - name: legacy
+        state: absent
+
 - name: Remove a Windows Login
   trippsc2.mssql.mssql_login:
     login_user: sa
@@ -210,14 +302,56 @@ password_set:
   returned: changed
   sample:
     true
+logins:
+  type: list
+  elements: dict
+  returned: O(logins) is defined
+  description:
+    - The result for each SQL login.
+    - Each item contains the same values as the module returns for a single SQL login, and the name of the SQL login.
+  sample:
+    - name: app1
+      changed: true
+      password_set: true
+      current:
+        name: app1
+        type: sql
+        enabled: true
+        login_password_expiration_enabled: false
+        login_password_policy_enforced: true
+    - name: legacy
+      changed: false
+  contains:
+    name:
+      type: str
+      description:
+        - The name of the SQL login.
+    changed:
+      type: bool
+      description:
+        - Whether the SQL login was changed.
+    password_set:
+      type: bool
+      returned: O(logins[].state=present)
+      description:
+        - Whether the password was set.
+    current:
+      type: dict
+      returned: O(logins[].state=present)
+      description:
+        - The configuration of the SQL login.
+    previous:
+      type: dict
+      returned: changed
+      description:
+        - The previous configuration of the SQL login.
 """
 
 import traceback
 
 from ansible.module_utils.basic import missing_required_lib
-from ansible.module_utils.common.text.converters import to_native
 
-from typing import Optional, Union
+from typing import List, Optional
 
 try:
     import pymssql
@@ -228,14 +362,21 @@ else:
     HAS_PYMSSQL: bool = True
     PYMSSQL_IMPORT_ERROR: Optional[str] = None
 
-from ..module_utils._mssql_module import MssqlModule
+from ..module_utils._mssql_login import (
+    format_login,
+    get_alter_login_statements,
+    get_create_login_statements,
+    get_server_principal_rows,
+    validate_login
+)
+from ..module_utils._mssql_module import MssqlModule, quote_name
 from ..module_utils._mssql_module_error import MssqlModuleError
 
 
 def run_module() -> None:
     module: MssqlModule = MssqlModule(
         argument_spec=dict(
-            name=dict(type='str', required=True),
+            name=dict(type='str', required=False),
             type=dict(type='str', required=False, default='sql', choices=['sql', 'windows']),
             state=dict(type='str', required=False, default='present', choices=['present', 'absent']),
             enabled=dict(type='bool', required=False),
@@ -248,8 +389,38 @@ def run_module() -> None:
                 no_log=False
             ),
             login_password_expiration_enabled=dict(type='bool', required=False, no_log=False),
-            login_password_policy_enforced=dict(type='bool', required=False, no_log=False)
-        )
+            login_password_policy_enforced=dict(type='bool', required=False, no_log=False),
+            logins=dict(
+                type='list',
+                required=False,
+                elements='dict',
+                options=dict(
+                    name=dict(type='str', required=True),
+                    type=dict(type='str', required=False, choices=['sql', 'windows']),
+                    state=dict(type='str', required=False, choices=['present', 'absent']),
+                    enabled=dict(type='bool', required=False),
+                    password=dict(type='str', required=False, no_log=True),
+                    update_password=dict(
+                        type='str',
+                        required=False,
+                        choices=['always', 'on_create'],
+                        no_log=False
+                    ),
+                    login_password_expiration_enabled=dict(type='bool', required=False, no_log=False),
+                    login_password_policy_enforced=dict(type='bool', required=False, no_log=False)
+                )
+            )
+        ),
+        mutually_exclusive=[
+            ('name', 'logins'),
+            ('logins', 'enabled'),
+            ('logins', 'password'),
+            ('logins', 'login_password_expiration_enabled'),
+            ('logins', 'login_password_policy_enforced')
+        ],
+        required_one_of=[
+            ('name', 'logins')
+        ]
     )
 
     if not HAS_PYMSSQL:
@@ -259,193 +430,138 @@ def run_module() -> None:
 
     params: dict = module.get_defined_non_connection_params()
     module.initialize_client()
-    validate_params(params, module)
-
-    if params['state'] == 'present':
-        result: dict = ensure_present(params, module)
-    else:
-        result: dict = ensure_absent(params, module)
-
-    module.close_client_session()
-    module.exit_json(**result)
+    logins: List[dict] = validate_params(params, module)
 
+    passwords: dict = dict(
+        (login['name'], login['password'])
+        for login in logins
+        if login['state'] == 'present' and login['type'] == 'sql' and login['update_password'] == 'always' and 'password' in login
+    )
 
-def validate_params(params: dict, module: MssqlModule) -> None:
-    """
-    Validates the parameters for the module.
-
-    Args:
-        params: The parameters to validate.
-    """
-
-    if params['state'] == 'present':
-        if params['type'] != 'sql':
-            if 'password' in params:
-                module.handle_error(MssqlModuleError('The password parameter is required when state is present and type is not sql.'))
+    rows: dict = get_server_principal_rows([login['name'] for login in logins], module, passwords)
 
-            if 'login_password_expiration_enabled' in params:
-                module.handle_error(MssqlModuleError('The login_password_expiration_enabled parameter is not valid for non-SQL logins.'))
+    plan: dict = dict(statements=[], params={})
+    results: List[dict] = []
 
-            if 'login_password_policy_enforced' in params:
-                module.handle_error(MssqlModuleError('The login_password_policy_enforced parameter is not valid for non-SQL logins.'))
+    for index, login in enumerate(logins):
+        if login['state'] == 'present':
+            results.append(ensure_present(login, rows.get(login['name']), f"password_{index}", plan, module))
         else:
-            if params.get('login_password_expiration_enabled', False) and not params.get('login_password_policy_enforced', False):
-                module.handle_error(
-                    MssqlModuleError(
-                        'The login_password_expiration_enabled cannot be true if login_password_policy_enforced parameter is not set to true.'))
-    else:
-        if 'password' in params:
-            module.handle_error(MssqlModuleError('The password parameter is not valid when state is absent.'))
+            results.append(ensure_absent(login, rows.get(login['name']), plan, module))
 
-        if 'login_password_expiration_enabled' in params:
-            module.handle_error(MssqlModuleError('The login_password_expiration_enabled parameter is not valid when state is absent.'))
+    if not module.check_mode:
+        module.execute_batch(plan['statements'], params=plan['params'] if len(plan['params']) > 0 else None)
 
-        if 'login_password_policy_enforced' in params:
-            module.handle_error(MssqlModuleError('The login_password_policy_enforced parameter is not valid when state is absent.'))
+    if 'logins' in params:
+        result: dict = dict(
+            changed=any(login_result['changed'] for login_result in results),
+            logins=results
+        )
+    else:
+        result: dict = results[0]
+        del result['name']
 
-    return None
+    module.close_client_session()
+    module.exit_json(**result)
 
 
-def ensure_present(params: dict, module: MssqlModule) -> Union[dict, MssqlModuleError]:
+def validate_params(params: dict, module: MssqlModule) -> List[dict]:
     """
-    Ensures the SQL login is present.
+    Validates the parameters for the module.
 
     Args:
-        params (dict): The parameters for the module.
+        params: The parameters to validate.
         module (MssqlModule): The module object.
 
     Returns:
-        dict: The result of the operation.
+        List[dict]: The SQL logins to configure. Options that are not defined are omitted.
     """
 
-    existing_login: Optional[dict] = get_login(params['name'], module)
-
-    if isinstance(existing_login, MssqlModuleError):
-        return existing_login
+    if 'logins' not in params:
+        validate_login(params, module)
+        return [params]
 
-    if existing_login is None:
-        return create_login(params, module)
+    # The top-level type, state, and update_password options are the defaults of each SQL login.
+    defaults: dict = dict(type=params['type'], state=params['state'], update_password=params['update_password'])
 
-    return update_login(params, existing_login, module)
+    logins: List[dict] = [
+        dict(defaults, **dict((option, value) for option, value in login.items() if value is not None))
+        for login in params['logins']
+    ]
 
+    names: List[str] = []
 
-def ensure_absent(params: dict, module: MssqlModule) -> Union[dict, MssqlModuleError]:
-    """
-    Ensures the SQL login is absent.
-
-    Args:
-        params (dict): The parameters for the module.
-        module (MssqlModule): The module object.
-
-    Returns:
-        dict: The result of the operation.
-    """
+    for login in logins:
+        if login['name'] in names:
+            module.handle_error(MssqlModuleError(message=f"The SQL login '{login['name']}' is specified more than once."))
 
-    existing_login: Optional[dict] = get_login(params['name'], module)
+        names.append(login['name'])
+        validate_login(login, module)
 
-    if isinstance(existing_login, MssqlModuleError):
-        return existing_login
+    return logins
 
-    if existing_login is None:
-        return dict(changed=False)
 
-    result: dict = dict(
-        changed=True,
-        previous=existing_login
-    )
-
-    if not module.check_mode:
-        try:
-            module.cursor.execute(f"DROP LOGIN [{params['name']}]")
-            module.conn.commit()
-        except Exception as e:
-            module.handle_error(MssqlModuleError(message=to_native(e), exception=e))
-
-    return result
-
-
-def get_login(name: str, module: MssqlModule) -> Optional[dict]:
+def ensure_present(params: dict, row: Optional[dict], password_param: str, plan: dict, module: MssqlModule) -> dict:
     """
-    Gets the SQL login by name.
+    Ensures the SQL login is present.
 
     Args:
-        name (str): The name of the SQL login.
+        params (dict): The options of the SQL login.
+        row (Optional[dict]): The existing server principal with the same name, if any.
+        password_param (str): The name of the batch parameter holding the password of the SQL login.
+        plan (dict): The statements and parameters of the batch.
         module (MssqlModule): The module object.
 
     Returns:
-        Optional[dict]: The SQL login.
+        dict: The result for the SQL login.
     """
 
-    query: str = f"""
-    SELECT sp.name as name,
-            sp.type as type,
-            sp.is_disabled as is_disabled,
-            sl.is_policy_checked as is_policy_checked,
-            sl.is_expiration_checked as is_expiration_checked
-    FROM sys.server_principals sp
-    LEFT JOIN sys.sql_logins sl ON sp.principal_id = sl.principal_id
-    WHERE sp.name = '{name}'
-    """
-
-    try:
-        module.cursor.execute(query)
-        row: Optional[dict] = module.cursor.fetchone()
-    except Exception as e:
-        module.handle_error(MssqlModuleError(message=to_native(e), exception=e))
-
     if row is None:
-        return None
+        if params['type'] == 'sql' and 'password' not in params:
+            module.handle_error(MssqlModuleError(message=f"The password parameter is required to create the SQL login '{params['name']}'."))
 
-    return format_login(row, module)
+        return create_login(params, password_param, plan)
 
+    return update_login(params, format_login(row, module), bool(row['password_matches']), password_param, plan, module)
 
-def format_login(row: dict, module: MssqlModule) -> dict:
+
+def ensure_absent(params: dict, row: Optional[dict], plan: dict, module: MssqlModule) -> dict:
     """
-    Formats the SQL login information returned from SQL Server to match the module.
+    Ensures the SQL login is absent.
 
     Args:
-        row (dict): The SQL login information returned from SQL Server.
+        params (dict): The options of the SQL login.
+        row (Optional[dict]): The existing server principal with the same name, if any.
+        plan (dict): The statements and parameters of the batch.
+        module (MssqlModule): The module object.
 
     Returns:
-        dict: The formatted SQL login information.
+        dict: The result for the SQL login.
     """
 
-    if row['type'] == 'S':
-        type: str = 'sql'
-    elif row['type'] == 'U':
-        type: str = 'windows'
-    elif row['type'] == 'G':
-        type: str = 'windows'
-    elif row['type'] == 'C':
-        type: str = 'certificate'
-    elif row['type'] == 'E':
-        type: str = 'azure'
-    elif row['type'] == 'X':
-        type: str = 'azure'
-    elif row['type'] == 'K':
-        type: str = 'asymmetric_key'
-    else:
-        module.handle_error(MssqlModuleError('Existing login has unknown type: %s' % row))
+    if row is None:
+        return dict(name=params['name'], changed=False)
+
+    plan['statements'].append(f"DROP LOGIN {quote_name(params['name'])};")
 
     return dict(
-        name=row['name'],
-        type=type,
-        enabled=not row['is_disabled'],
-        login_password_expiration_enabled=row['is_expiration_checked'],
-        login_password_policy_enforced=row['is_policy_checked']
+        name=params['name'],
+        changed=True,
+        previous=format_login(row, module)
     )
 
 
-def create_login(params: dict, module: MssqlModule) -> dict:
+def create_login(params: dict, password_param: str, plan: dict) -> dict:
     """
     Creates the SQL login.
 
     Args:
-        params (dict): The parameters for the module.
-        module (MssqlModule): The module object.
+        params (dict): The options of the SQL login.
+        password_param (str): The name of the batch parameter holding the password of the SQL login.
+        plan (dict): The statements and parameters of the batch.
 
     Returns:
-        dict: The result of the operation.
+        dict: The result for the SQL login.
     """
 
     if params['type'] == 'sql':
@@ -455,6 +571,8 @@ def create_login(params: dict, module: MssqlModule) -> dict:
             enabled=params.get('enabled', True),
             login_password_expiration_enabled=params.get('login_password_expiration_enabled', False),
             login_password_policy_enforced=params.get('login_password_policy_enforced', True))
+
+        plan['params'][password_param] = params['password']
     else:
         current: dict = dict(
             name=params['name'],
@@ -462,57 +580,36 @@ def create_login(params: dict, module: MssqlModule) -> dict:
             enabled=params.get('enabled', True)
         )
 
-    result: dict = dict(
+    plan['statements'].extend(get_create_login_statements(current, password_param))
+
+    return dict(
+        name=params['name'],
         changed=True,
-        password_set=params.get('password') is not None,
+        password_set=params['type'] == 'sql',
         current=current
     )
 
-    if not module.check_mode:
-        if params['type'] == 'sql':
-
-            if current['login_password_expiration_enabled']:
-                login_password_expiration_enabled_value: str = 'ON'
-            else:
-                login_password_expiration_enabled_value: str = 'OFF'
-
-            if current['login_password_policy_enforced']:
-                login_password_policy_enforced_value: str = 'ON'
-            else:
-                login_password_policy_enforced_value: str = 'OFF'
-
-            query: str = f"""
-            CREATE LOGIN [{params['name']}]
-                WITH PASSWORD = '{params['password']}',
-                    CHECK_EXPIRATION = {login_password_expiration_enabled_value},
-                    CHECK_POLICY = {login_password_policy_enforced_value}
-            """
-        elif params['type'] == 'windows':
-            query: str = f"CREATE LOGIN [{params['name']}] FROM WINDOWS"
-        try:
-            module.cursor.execute(query)
-            module.conn.commit()
-
-            if not params.get('enabled', True):
-                module.cursor.execute(f"ALTER LOGIN [{params['name']}] DISABLE")
-                module.conn.commit()
-        except Exception as e:
-            module.handle_error(MssqlModuleError(message=to_native(e), exception=e))
-
-    return result
-
 
-def update_login(params: dict, existing_login: dict, module: MssqlModule) -> Union[dict, MssqlModuleError]:
+def update_login(
+        params: dict,
+        existing_login: dict,
+        password_matches: bool,
+        password_param: str,
+        plan: dict,
+        module: MssqlModule) -> dict:
     """
     Updates the SQL login.
 
     Args:
-        params (dict): The parameters for the module.
+        params (dict): The options of the SQL login.
         existing_login (dict): The existing SQL login.
+        password_matches (bool): Whether the password already matches the stored password hash.
+        password_param (str): The name of the batch parameter holding the password of the SQL login.
+        plan (dict): The statements and parameters of the batch.
         module (MssqlModule): The module object.
 
     Returns:
-        dict: The result of the operation.
+        dict: The result for the SQL login.
     """
 
     if params['type'] != existing_login['type']:
@@ -529,7 +626,7 @@ def update_login(params: dict, existing_login: dict, module: MssqlModule) -> Uni
             login_password_policy_enforced=params.get('login_password_policy_enforced', existing_login['login_password_policy_enforced'])
         )
 
-        password_set: bool = params['update_password'] == 'always'
+        password_set: bool = params['update_password'] == 'always' and 'password' in params and not password_matches
         login_password_expiration_enabled_changed: bool = current['login_password_expiration_enabled'] != existing_login['login_password_expiration_enabled']
         login_password_policy_enforced_changed: bool = current['login_password_policy_enforced'] != existing_login['login_password_policy_enforced']
     else:
@@ -547,6 +644,7 @@ def update_login(params: dict, existing_login: dict, module: MssqlModule) -> Uni
     changed: bool = password_set or config_changed
 
     result: dict = dict(
+        name=params['name'],
         changed=changed,
         password_set=password_set,
         current=current
@@ -555,51 +653,10 @@ def update_login(params: dict, existing_login: dict, module: MssqlModule) -> Uni
     if config_changed:
         result['previous'] = existing_login
 
-    if not module.check_mode:
-        if enabled_changed:
-            if params.get('enabled', existing_login['enabled']):
-                query: str = f"ALTER LOGIN [{params['name']}] ENABLE"
-            else:
-                query: str = f"ALTER LOGIN [{params['name']}] DISABLE"
-
-            try:
-                module.cursor.execute(query)
-                module.conn.commit()
-            except Exception as e:
-                module.handle_error(MssqlModuleError(message=to_native(e), exception=e))
-
-        if login_password_policy_enforced_changed:
-            query: str = f"""
-            ALTER LOGIN [{params['name']}]
-                WITH CHECK_POLICY = {'ON' if current['login_password_policy_enforced'] else 'OFF'}
-            """
-
-            try:
-                module.cursor.execute(query)
-                module.conn.commit()
-            except Exception as e:
-                module.handle_error(MssqlModuleError(message=to_native(e), exception=e))
-
-        if login_password_expiration_enabled_changed:
-            query: str = f"""
-            ALTER LOGIN [{params['name']}]
-                WITH CHECK_EXPIRATION = {'ON' if current['login_password_expiration_enabled'] else 'OFF'}
-            """
-
-            try:
-                module.cursor.execute(query)
-                module.conn.commit()
-            except Exception as e:
-                module.handle_error(MssqlModuleError(message=to_native(e), exception=e))
-
-        if password_set:
-            query: str = f"ALTER LOGIN [{params['name']}] WITH PASSWORD = '{params['password']}'"
-
-            try:
-                module.cursor.execute(query)
-                module.conn.commit()
-            except Exception as e:
-                module.handle_error(MssqlModuleError(message=to_native(e), exception=e))
+    if password_set:
+        plan['params'][password_param] = params['password']
+
+    plan['statements'].extend(get_alter_login_statements(current, existing_login, password_param if password_set else None))
 
     return result
 
@@ -0,0 +1,1244 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+module: mssql_security_state
+version_added: 1.5.0
+author:
+  - Jim Tarpley (@trippsc2)
+short_description: Configures the security model of a Microsoft SQL Server instance in a single task.
+description:
+  - Configures SQL logins, database users, and server-level, database-level, and database object-level permissions in a Microsoft SQL Server instance.
+  - The existing state is read with a few bulk queries, independent of the number of logins, users, and permissions.
+  - The differences are computed in memory and only the required changes are applied.
+  - Server-level changes are applied in one batch, the changes in each database are applied in one batch per database, and logins are removed in a final batch.
+    Each batch runs in its own transaction.
+  - Only the permissions listed in O(server_permissions[].permissions), O(db_permissions[].permissions),
+    or O(db_object_permissions[].permissions) are modified. Other permissions are left unchanged.
+attributes:
+  check_mode:
+    support: full
+    description:
+      - This module supports check mode.
+extends_documentation_fragment:
+  - trippsc2.mssql.login
+options:
+  logins:
+    type: list
+    required: false
+    elements: dict
+    description:
+      - The SQL logins to configure.
+      - The options match those of the M(trippsc2.mssql.mssql_login) module.
+    suboptions:
+      name:
+        type: str
+        required: true
+        description:
+          - The name of the SQL login.
+      type:
+        type: str
+        required: false
+        default: sql
+        choices:
+          - sql
+          - windows
+        description:
+          - The type of login.
+      state:
+        type: str
+        required: false
+        default: present
+        choices:
+          - present
+          - absent
+        description:
+          - The desired state of the SQL login.
+      enabled:
+        type: bool
+        required: false
+        description:
+          - Specifies whether the SQL login is enabled.
+          - Only valid when O(logins[].state=present).
+      password:
+        type: str
+        required: false
+        description:
+          - The password for the SQL login.
+          - Only valid when O(logins[].state=present) and O(logins[].type=sql).
+          - Required when the SQL login does not exist and O(logins[].type=sql).
+      update_password:
+        type: str
+        required: false
+        default: always
+        choices:
+          - always
+          - on_create
+        description:
+          - Specifies when to update the password.
+          - Only valid when O(logins[].state=present) and O(logins[].type=sql).
+          - With V(always), the password is compared to the stored password hash first and is only set if it does not match.
+            If the password hash cannot be read by the login used by the module, the password is always set.
+      login_password_expiration_enabled:
+        type: bool
+        required: false
+        description:
+          - Specifies whether the SQL login password expiration policy is enabled.
+          - Only valid when O(logins[].state=present) and O(logins[].type=sql).
+      login_password_policy_enforced:
+        type: bool
+        required: false
+        description:
+          - Specifies whether the SQL login password policy is enforced.
+          - Only valid when O(logins[].state=present) and O(logins[].type=sql).
+  db_users:
+    type: list
+    required: false
+    elements: dict
+    description:
+      - The database users to configure.
+      - Each database user is mapped to the SQL login with the same name.
+    suboptions:
+      name:
+        type: str
+        required: true
+        description:
+          - The name of the SQL login and database user.
+      database:
+        type: str
+        required: true
+        description:
+          - The name of the database.
+      state:
+        type: str
+        required: false
+        default: present
+        choices:
+          - present
+          - absent
+        description:
+          - The desired state of the database user.
+  server_permissions:
+    type: list
+    required: false
+    elements: dict
+    description:
+      - The server-level permissions to configure.
+    suboptions:
+      principal:
+        type: str
+        required: true
+        description:
+          - The name of the SQL login or server role.
+      permissions:
+        type: list
+        required: true
+        elements: str
+        choices:
+          - administer_bulk_operations
+          - alter_any_availability_group
+          - alter_any_connection
+          - alter_any_credential
+          - alter_any_database
+          - alter_any_endpoint
+          - alter_any_event_notification
+          - alter_any_event_session
+          - alter_any_linked_server
+          - alter_any_login
+          - alter_any_server_audit
+          - alter_any_server_role
+          - alter_resources
+          - alter_server_state
+          - alter_settings
+          - alter_trace
+          - authenticate_server
+          - connect_any_database
+          - connect_sql
+          - control_server
+          - create_any_database
+          - create_availability_group
+          - create_ddl_event_notification
+          - create_endpoint
+          - create_server_role
+          - create_trace_event_notification
+          - external_access_assembly
+          - impersonate_any_login
+          - select_all_user_securables
+          - shutdown
+          - unsafe_assembly
+          - view_any_database
+          - view_any_definition
+          - view_server_state
+        description:
+          - The server-level permissions.
+      state:
+        type: str
+        required: false
+        default: grant
+        choices:
+          - grant
+          - deny
+          - grant_with_grant_option
+          - revoke
+        description:
+          - The desired state of the server-level permissions.
+  db_permissions:
+    type: list
+    required: false
+    elements: dict
+    description:
+      - The database-level permissions to configure.
+    suboptions:
+      principal:
+        type: str
+        required: true
+        description:
+          - The name of the database user or role.
+      database:
+        type: str
+        required: true
+        description:
+          - The name of the database.
+      permissions:
+        type: list
+        required: true
+        elements: str
+        choices:
+          - administer_database_bulk_operations
+          - alter
+          - alter_any_application_role
+          - alter_any_assembly
+          - alter_any_asymmetric_key
+          - alter_any_certificate
+          - alter_any_column_encryption_key
+          - alter_any_column_master_key_definition
+          - alter_any_contract
+          - alter_any_database_audit
+          - alter_any_database_ddl_trigger
+          - alter_any_database_event_notification
+          - alter_any_database_event_session
+          - alter_any_database_scoped_configuration
+          - alter_any_dataspace
+          - alter_any_external_data_source
+          - alter_any_external_file_format
+          - alter_any_external_library
+          - alter_any_fulltext_catalog
+          - alter_any_mask
+          - alter_any_message_type
+          - alter_any_remote_service_binding
+          - alter_any_role
+          - alter_any_route
+          - alter_any_schema
+          - alter_any_security_policy
+          - alter_any_sensitivity_classification
+          - alter_any_service
+          - alter_any_symmetric_key
+          - alter_any_user
+          - authenticate
+          - backup_database
+          - backup_log
+          - checkpoint
+          - connect
+          - connect_replication
+          - control
+          - create_aggregate
+          - create_any_external_library
+          - create_assembly
+          - create_asymmetric_key
+          - create_certificate
+          - create_contract
+          - create_database
+          - create_database_ddl_event_notification
+          - create_default
+          - create_fulltext_catalog
+          - create_function
+          - create_message_type
+          - create_procedure
+          - create_queue
+          - create_remote_service_binding
+          - create_role
+          - create_route
+          - create_rule
+          - create_schema
+          - create_service
+          - create_symmetric_key
+          - create_synonym
+          - create_table
+          - create_type
+          - create_view
+          - create_xml_schema_collection
+          - delete
+          - execute
+          - execute_any_external_endpoint
+          - execute_any_external_script
+          - execute_external_script
+          - insert
+          - kill_database_connection
+          - references
+          - select
+          - showplan
+          - subscribe_query_notifications
+          - take_ownership
+          - unmask
+          - update
+          - view_any_column_encryption_key_definition
+          - view_any_column_master_key_definition
+          - view_database_state
+          - view_definition
+        description:
+          - The database-level permissions.
+      state:
+        type: str
+        required: false
+        default: grant
+        choices:
+          - grant
+          - deny
+          - grant_with_grant_option
+          - revoke
+        description:
+          - The desired state of the database-level permissions.
+  db_object_permissions:
+    type: list
+    required: false
+    elements: dict
+    description:
+      - The database object-level permissions to configure.
+    suboptions:
+      principal:
+        type: str
+        required: true
+        description:
+          - The name of the database user or role.
+      database:
+        type: str
+        required: true
+        description:
+          - The name of the database.
+      schema:
+        type: str
+        required: false
+        description:
+          - The name of the schema containing the object.
+          - Required if objects with the same name exist in multiple schemas.
+      object:
+        type: str
+        required: true
+        description:
+          - The name of the object.
+      permissions:
+        type: list
+        required: true
+        elements: str
+        choices:
+          - alter
+          - control
+          - delete
+          - execute
+          - insert
+          - receive
+          - references
+          - select
+          - take_ownership
+          - update
+          - view_change_tracking
+          - view_definition
+        description:
+          - The database object-level permissions.
+      state:
+        type: str
+        required: false
+        default: grant
+        choices:
+          - grant
+          - deny
+          - grant_with_grant_option
+          - revoke
+        description:
+          - The desired state of the database object-level permissions.
+"""
+
+EXAMPLES = r"""
+- name: Configure the security model of the application
+  trippsc2.mssql.mssql_security_state:
+    login_user: sa
+    login_password: password
+    login_host: localhost
+    logins:
+      - name: app
+        password: password
+        update_password: on_create
+      - name: legacy
+        state: absent
+    db_users:
+      - name: app
+        database: appdb
+    server_permissions:
+      - principal: app
+        permissions:
+          - view_server_state
+    db_permissions:
+      - principal: app
+        database: appdb
+        permissions:
+          - connect
+    db_object_permissions:
+      - principal: app
+        database: appdb
+        schema: dbo
+        object: orders
+        permissions:
+          - select
+          - insert
+          - update
+"""
+
+RETURN = r"""
+logins:
+  type: list
+  elements: dict
+  returned: always
+  description:
+    - The SQL logins that were created, modified, or removed.
+  sample:
+    - name: app
+      action: create
+      password_set: true
+  contains:
+    name:
+      type: str
+      description:
+        - The name of the SQL login.
+    action:
+      type: str
+      description:
+        - Whether the SQL login was created, modified, or removed.
+      choices:
+        - create
+        - update
+        - drop
+    password_set:
+      type: bool
+      description:
+        - Whether the password was set.
+db_users:
+  type: list
+  elements: dict
+  returned: always
+  description:
+    - The database users that were created or removed.
+  sample:
+    - name: app
+      database: appdb
+      action: create
+  contains:
+    name:
+      type: str
+      description:
+        - The name of the database user.
+    database:
+      type: str
+      description:
+        - The name of the database.
+    action:
+      type: str
+      description:
+        - Whether the database user was created or removed.
+      choices:
+        - create
+        - drop
+server_permissions:
+  type: list
+  elements: dict
+  returned: always
+  description:
+    - The server-level permissions that were modified.
+  sample:
+    - principal: app
+      permission: view_server_state
+      previous: revoke
+      current: grant
+  contains:
+    principal:
+      type: str
+      description:
+        - The name of the server principal.
+    permission:
+      type: str
+      description:
+        - The server-level permission.
+    previous:
+      type: str
+      description:
+        - The previous state of the permission.
+    current:
+      type: str
+      description:
+        - The current state of the permission.
+db_permissions:
+  type: list
+  elements: dict
+  returned: always
+  description:
+    - The database-level permissions that were modified.
+  sample:
+    - principal: app
+      database: appdb
+      permission: connect
+      previous: revoke
+      current: grant
+  contains:
+    principal:
+      type: str
+      description:
+        - The name of the database principal.
+    database:
+      type: str
+      description:
+        - The name of the database.
+    permission:
+      type: str
+      description:
+        - The database-level permission.
+    previous:
+      type: str
+      description:
+        - The previous state of the permission.
+    current:
+      type: str
+      description:
+        - The current state of the permission.
+db_object_permissions:
+  type: list
+  elements: dict
+  returned: always
+  description:
+    - The database object-level permissions that were modified.
+  sample:
+    - principal: app
+      database: appdb
+      schema: dbo
+      object: orders
+      permission: select
+      previous: revoke
+      current: grant
+  contains:
+    principal:
+      type: str
+      description:
+        - The name of the database principal.
+    database:
+      type: str
+      description:
+        - The name of the database.
+    schema:
+      type: str
+      description:
+        - The name of the schema containing the object.
+    object:
+      type: str
+      description:
+        - The name of the object.
+    permission:
+      type: str
+      description:
+        - The database object-level permission.
+    previous:
+      type: str
+      description:
+        - The previous state of the permission.
+    current:
+      type: str
+      description:
+        - The current state of the permission.
+"""
+
+import json
+import traceback
+
+from ansible.module_utils.basic import missing_required_lib
+
+from typing import List, Optional
+
+try:
+    import pymssql
+except ImportError:
+    HAS_PYMSSQL: bool = False
+    PYMSSQL_IMPORT_ERROR: Optional[str] = traceback.format_exc()
+else:
+    HAS_PYMSSQL: bool = True
+    PYMSSQL_IMPORT_ERROR: Optional[str] = None
+
+from ..module_utils._mssql_login import (
+    format_login,
+    get_alter_login_statements,
+    get_create_login_statements,
+    get_server_principal_rows,
+    validate_login
+)
+from ..module_utils._mssql_module import MssqlModule, quote_name, unique
+from ..module_utils._mssql_module_error import MssqlModuleError
+from ..module_utils._mssql_permission import (
+    DATABASE_PERMISSIONS,
+    OBJECT_PERMISSIONS,
+    PERMISSION_STATES,
+    SERVER_PERMISSIONS,
+    convert_permission_to_query,
+    get_permission_query
+)
+
+
+def run_module() -> None:
+    module: MssqlModule = MssqlModule(
+        argument_spec=dict(
+            logins=dict(
+                type='list',
+                required=False,
+                elements='dict',
+                options=dict(
+                    name=dict(type='str', required=True),
+                    type=dict(type='str', required=False, default='sql', choices=['sql', 'windows']),
+                    state=dict(type='str', required=False, default='present', choices=['present', 'absent']),
+                    enabled=dict(type='bool', required=False),
+                    password=dict(type='str', required=False, no_log=True),
+                    update_password=dict(
+                        type='str',
+                        required=False,
+                        default='always',
+                        choices=['always', 'on_create'],
+                        no_log=False
+                    ),
+                    login_password_expiration_enabled=dict(type='bool', required=False, no_log=False),
+                    login_password_policy_enforced=dict(type='bool', required=False, no_log=False)
+                )
+            ),
+            db_users=dict(
+                type='list',
+                required=False,
+                elements='dict',
+                options=dict(
+                    name=dict(type='str', required=True),
+                    database=dict(type='str', required=True),
+                    state=dict(type='str', required=False, default='present', choices=['present', 'absent'])
+                )
+            ),
+            server_permissions=dict(
+                type='list',
+                required=False,
+                elements='dict',
+                options=dict(
+                    principal=dict(type='str', required=True),
+                    permissions=dict(type='list', required=True, elements='str', choices=SERVER_PERMISSIONS),
+                    state=dict(type='str', required=False, default='grant', choices=PERMISSION_STATES)
+                )
+            ),
+            db_permissions=dict(
+                type='list',
+                required=False,
+                elements='dict',
+                options=dict(
+                    principal=dict(type='str', required=True),
+                    database=dict(type='str', required=True),
+                    permissions=dict(type='list', required=True, elements='str', choices=DATABASE_PERMISSIONS),
+                    state=dict(type='str', required=False, default='grant', choices=PERMISSION_STATES)
+                )
+            ),
+            db_object_permissions=dict(
+                type='list',
+                required=False,
+                elements='dict',
+                options=dict(
+                    principal=dict(type='str', required=True),
+                    database=dict(type='str', required=True),
+                    schema=dict(type='str', required=False),
+                    object=dict(type='str', required=True),
+                    permissions=dict(type='list', required=True, elements='str', choices=OBJECT_PERMISSIONS),
+                    state=dict(type='str', required=False, default='grant', choices=PERMISSION_STATES)
+                )
+            )
+        ),
+        required_one_of=[
+            ('logins', 'db_users', 'server_permissions', 'db_permissions', 'db_object_permissions')
+        ]
+    )
+
+    if not HAS_PYMSSQL:
+        module.fail_json(
+            msg=missing_required_lib('pymssql'),
+            exception=PYMSSQL_IMPORT_ERROR)
+
+    params: dict = get_desired_state(module.get_defined_non_connection_params(), module)
+    module.initialize_client()
+
+    current_state: dict = get_current_state(params, module)
+    plan: dict = get_plan(params, current_state, module)
+
+    if not module.check_mode:
+        apply_plan(plan, module)
+
+    changes: dict = plan['changes']
+    changed: bool = any(len(items) > 0 for items in changes.values())
+
+    module.close_client_session()
+    module.exit_json(changed=changed, **changes)
+
+
+def get_desired_state(params: dict, module: MssqlModule) -> dict:
+    """
+    Validates the module parameters and removes the undefined options of each item.
+
+    Args:
+        params (dict): The module parameters.
+        module (MssqlModule): The module instance.
+
+    Returns:
+        dict: The desired state, with a list for each kind of item.
+    """
+
+    desired_state: dict = {}
+
+    for key in ['logins', 'db_users', 'server_permissions', 'db_permissions', 'db_object_permissions']:
+        desired_state[key] = [
+            dict((option, value) for option, value in item.items() if value is not None)
+            for item in params.get(key, [])
+        ]
+
+    for login in desired_state['logins']:
+        validate_login(login, module)
+
+    for key in ['server_permissions', 'db_permissions', 'db_object_permissions']:
+        for item in desired_state[key]:
+            if len(item['permissions']) < 1:
+                module.handle_error(MssqlModuleError(message=f"At least one permission must be specified for the principal '{item['principal']}'."))
+
+    return desired_state
+
+
+def get_current_state(params: dict, module: MssqlModule) -> dict:
+    """
+    Reads the existing state of every login, user, object, and permission referenced by the desired state.
+    The server is read with two queries, and each database with three queries.
+
+    Args:
+        params (dict): The desired state.
+        module (MssqlModule): The module instance.
+
+    Returns:
+        dict: The existing state.
+    """
+
+    server_principal_names: List[str] = unique(
+        [login['name'] for login in params['logins']] +
+        [user['name'] for user in params['db_users'] if user['state'] == 'present'] +
+        [item['principal'] for item in params['server_permissions']]
+    )
+
+    passwords: dict = dict(
+        (login['name'], login['password'])
+        for login in params['logins']
+        if login['state'] == 'present' and login['type'] == 'sql' and login['update_password'] == 'always' and 'password' in login
+    )
+
+    server_principals: dict = get_server_principal_rows(server_principal_names, module, passwords)
+    server_permissions: dict = get_server_permission_states(
+        unique([item['principal'] for item in params['server_permissions']]),
+        module
+    )
+
+    database_names: List[str] = unique(
+        [user['database'] for user in params['db_users']] +
+        [item['database'] for item in params['db_permissions']] +
+        [item['database'] for item in params['db_object_permissions']]
+    )
+
+    databases: dict = {}
+
+    for database in get_existing_databases(database_names, module):
+        principal_names: List[str] = unique(
+            [user['name'] for user in params['db_users'] if user['database'] == database] +
+            [item['principal'] for item in params['db_permissions'] if item['database'] == database] +
+            [item['principal'] for item in params['db_object_permissions'] if item['database'] == database]
+        )
+
+        objects: List[dict] = [
+            dict(schema=schema, name=name)
+            for schema, name in dict.fromkeys(
+                (item.get('schema', None), item['object'])
+                for item in params['db_object_permissions'] if item['database'] == database
+            )
+        ]
+
+        databases[database] = get_database_state(database, principal_names, objects, module)
+
+    return dict(
+        server_principals=server_principals,
+        server_permissions=server_permissions,
+        databases=databases
+    )
+
+
+def get_server_permission_states(principals: List[str], module: MssqlModule) -> dict:
+    """
+    Gets every server-level permission held by the server principals with a single query.
+
+    Args:
+        principals (List[str]): The names of the server principals.
+        module (MssqlModule): The module instance.
+
+    Returns:
+        dict: The state of each held permission, keyed by the permission name used in queries, keyed by the requested principal name.
+    """
+
+    results: dict = dict((principal, {}) for principal in principals)
+
+    if len(principals) < 1:
+        return results
+
+    statement: str = """
+    SELECT CAST(requested.[key] AS int) AS request_index,
+            permissions.permission_name AS permission,
+            permissions.state_desc AS state
+    FROM OPENJSON(%(principals)s) requested
+    JOIN sys.server_principals principals
+    ON principals.name = requested.value COLLATE DATABASE_DEFAULT
+    JOIN sys.server_permissions permissions
+    ON permissions.grantee_principal_id = principals.principal_id
+    WHERE permissions.class_desc = 'SERVER'
+    """
+
+    rows: List[dict] = module.execute_query(statement, dict(principals=json.dumps(principals)))
+
+    for row in rows:
+        results[principals[row['request_index']]][row['permission']] = row['state'].lower()
+
+    return results
+
+
+def get_existing_databases(databases: List[str], module: MssqlModule) -> List[str]:
+    """
+    Gets the databases that exist with a single query.
+
+    Args:
+        databases (List[str]): The names of the databases.
+        module (MssqlModule): The module instance.
+
+    Returns:
+        List[str]: The requested names of the databases that exist.
+    """
+
+    if len(databases) < 1:
+        return []
+
+    statement: str = """
+    SELECT CAST(requested.[key] AS int) AS request_index
+    FROM OPENJSON(%(databases)s) requested
+    WHERE DB_ID(requested.value) IS NOT NULL
+    """
+
+    rows: List[dict] = module.execute_query(statement, dict(databases=json.dumps(databases)))
+
+    return [databases[row['request_index']] for row in rows]
+
+
+def get_database_state(database: str, principals: List[str], objects: List[dict], module: MssqlModule) -> dict:
+    """
+    Reads the database principals, objects, and permissions referenced in a database with three queries.
+
+    Args:
+        database (str): The name of the database.
+        principals (List[str]): The names of the database principals.
+        objects (List[dict]): The objects, each with a name and an optional schema.
+        module (MssqlModule): The module instance.
+
+    Returns:
+        dict: The ID of each existing principal, the matches of each object, and the permissions held by each principal.
+    """
+
+    principal_ids: dict = {}
+
+    if len(principals) > 0:
+        statement: str = f"""
+        SELECT CAST(requested.[key] AS int) AS request_index,
+                principals.principal_id AS principal_id
+        FROM OPENJSON(%(principals)s) requested
+        JOIN {quote_name(database)}.sys.database_principals principals
+        ON principals.name = requested.value COLLATE DATABASE_DEFAULT
+        """
+
+        for row in module.execute_query(statement, dict(principals=json.dumps(principals))):
+            principal_ids[principals[row['request_index']]] = row['principal_id']
+
+    object_matches: dict = {}
+
+    if len(objects) > 0:
+        statement: str = f"""
+        SELECT requested.request_index AS request_index,
+                objects.object_id AS object_id,
+                objects.name AS name,
+                schemas.name AS schema_name
+        FROM OPENJSON(%(objects)s)
+        WITH (
+            request_index int '$.index',
+            object_name sysname '$.name',
+            schema_name sysname '$.schema'
+        ) requested
+        JOIN {quote_name(database)}.sys.objects objects
+        ON objects.name = requested.object_name COLLATE DATABASE_DEFAULT
+        JOIN {quote_name(database)}.sys.schemas schemas
+        ON objects.schema_id = schemas.schema_id
+        WHERE requested.schema_name IS NULL
+        OR schemas.name = requested.schema_name COLLATE DATABASE_DEFAULT
+        """
+
+        requested_objects: str = json.dumps(
+            [dict(index=index, name=item['name'], schema=item['schema']) for index, item in enumerate(objects)]
+        )
+
+        for row in module.execute_query(statement, dict(objects=requested_objects)):
+            object_matches.setdefault((objects[row['request_index']]['schema'], objects[row['request_index']]['name']), []).append(
+                dict(schema=row['schema_name'], name=row['name'], object_id=row['object_id'])
+            )
+
+    permissions: dict = dict((principal_id, {}) for principal_id in principal_ids.values())
+
+    if len(principal_ids) > 0:
+        statement: str = f"""
+        SELECT permissions.grantee_principal_id AS principal_id,
+                permissions.major_id AS major_id,
+                permissions.class_desc AS class_desc,
+                permissions.permission_name AS permission,
+                permissions.state_desc AS state
+        FROM {quote_name(database)}.sys.database_permissions permissions
+        WHERE permissions.grantee_principal_id IN (SELECT CAST(value AS int) FROM OPENJSON(%(principal_ids)s))
+        AND (
+            permissions.class_desc = 'DATABASE'
+            OR (permissions.class_desc = 'OBJECT_OR_COLUMN' AND permissions.minor_id = 0)
+        )
+        """
+
+        rows: List[dict] = module.execute_query(statement, dict(principal_ids=json.dumps(list(principal_ids.values()))))
+
+        for row in rows:
+            securable: Optional[int] = row['major_id'] if row['class_desc'] == 'OBJECT_OR_COLUMN' else None
+            permissions[row['principal_id']][(securable, row['permission'])] = row['state'].lower()
+
+    return dict(
+        principal_ids=principal_ids,
+        object_matches=object_matches,
+        permissions=permissions
+    )
+
+
+def get_plan(params: dict, current_state: dict, module: MssqlModule) -> dict:
+    """
+    Computes the statements required to move from the existing state to the desired state.
+
+    Args:
+        params (dict): The desired state.
+        current_state (dict): The existing state.
+        module (MssqlModule): The module instance.
+
+    Returns:
+        dict: The statements of each batch, their parameters, and the changes they make.
+    """
+
+    plan: dict = dict(
+        server_statements=[],
+        server_params={},
+        database_statements={},
+        drop_login_statements=[],
+        changes=dict(
+            logins=[],
+            db_users=[],
+            server_permissions=[],
+            db_permissions=[],
+            db_object_permissions=[]
+        )
+    )
+
+    server_principals: dict = current_state['server_principals']
+    planned_logins: set = set(server_principals.keys())
+
+    for index, login in enumerate(params['logins']):
+        plan_login(index, login, server_principals.get(login['name']), plan, module)
+
+        if login['state'] == 'present':
+            planned_logins.add(login['name'])
+        else:
+            planned_logins.discard(login['name'])
+
+    server_permissions: dict = current_state['server_permissions']
+
+    for item in params['server_permissions']:
+        if item['principal'] not in planned_logins:
+            module.handle_error(MssqlModuleError(message=f"No server principal exists with the name '{item['principal']}'."))
+
+        principal_permissions: dict = server_permissions.setdefault(item['principal'], {})
+
+        for permission in item['permissions']:
+            key: str = convert_permission_to_query(permission)
+            previous_state: str = principal_permissions.get(key, 'revoke')
+            query: Optional[str] = get_permission_query(item['principal'], permission, previous_state, item['state'])
+
+            if query is None:
+                continue
+
+            plan['server_statements'].append(query)
+            plan['changes']['server_permissions'].append(
+                dict(principal=item['principal'], permission=permission, previous=previous_state, current=item['state'])
+            )
+            principal_permissions[key] = item['state']
+
+    databases: dict = current_state['databases']
+
+    for user in params['db_users']:
+        database_state: dict = get_database_or_fail(user['database'], databases, module)
+        statements: List[str] = plan['database_statements'].setdefault(user['database'], [])
+        principal_ids: dict = database_state['principal_ids']
+
+        if user['state'] == 'present':
+            if user['name'] not in planned_logins:
+                module.handle_error(MssqlModuleError(message=f"No server login exists for '{user['name']}'."))
+
+            if user['name'] in principal_ids:
+                continue
+
+            statements.append(f"CREATE USER {quote_name(user['name'])} FOR LOGIN {quote_name(user['name'])};")
+            principal_ids[user['name']] = None
+            plan['changes']['db_users'].append(dict(name=user['name'], database=user['database'], action='create'))
+        elif user['name'] in principal_ids:
+            database_state.setdefault('drop_user_statements', []).append(f"DROP USER {quote_name(user['name'])};")
+            plan['changes']['db_users'].append(dict(name=user['name'], database=user['database'], action='drop'))
+
+    for item in params['db_permissions']:
+        database_state: dict = get_database_or_fail(item['database'], databases, module)
+        principal_permissions: dict = get_principal_permissions_or_fail(item['principal'], database_state, module)
+        statements: List[str] = plan['database_statements'].setdefault(item['database'], [])
+
+        for permission in item['permissions']:
+            key: tuple = (None, convert_permission_to_query(permission))
+            previous_state: str = principal_permissions.get(key, 'revoke')
+            query: Optional[str] = get_permission_query(item['principal'], permission, previous_state, item['state'])
+
+            if query is None:
+                continue
+
+            statements.append(query)
+            plan['changes']['db_permissions'].append(
+                dict(principal=item['principal'], database=item['database'], permission=permission, previous=previous_state, current=item['state'])
+            )
+            principal_permissions[key] = item['state']
+
+    for item in params['db_object_permissions']:
+        database_state: dict = get_database_or_fail(item['database'], databases, module)
+        principal_permissions: dict = get_principal_permissions_or_fail(item['principal'], database_state, module)
+        resolved_object: dict = get_object_or_fail(item, database_state, module)
+        statements: List[str] = plan['database_statements'].setdefault(item['database'], [])
+        securable: str = f"OBJECT::{quote_name(resolved_object['schema'])}.{quote_name(resolved_object['name'])}"
+
+        for permission in item['permissions']:
+            key: tuple = (resolved_object['object_id'], convert_permission_to_query(permission))
+            previous_state: str = principal_permissions.get(key, 'revoke')
+            query: Optional[str] = get_permission_query(item['principal'], permission, previous_state, item['state'], securable=securable)
+
+            if query is None:
+                continue
+
+            statements.append(query)
+            plan['changes']['db_object_permissions'].append(
+                dict(
+                    principal=item['principal'],
+                    database=item['database'],
+                    schema=resolved_object['schema'],
+                    object=resolved_object['name'],
+                    permission=permission,
+                    previous=previous_state,
+                    current=item['state']
+                )
+            )
+            principal_permissions[key] = item['state']
+
+    for database, database_state in databases.items():
+        if 'drop_user_statements' in database_state:
+            plan['database_statements'].setdefault(database, []).extend(database_state['drop_user_statements'])
+
+    return plan
+
+
+def plan_login(index: int, login: dict, row: Optional[dict], plan: dict, module: MssqlModule) -> None:
+    """
+    Adds the statements required to configure a SQL login to the plan.
+
+    Args:
+        index (int): The index of the SQL login, used to name the password parameter.
+        login (dict): The desired configuration of the SQL login.
+        row (Optional[dict]): The existing server principal with the same name, if any.
+        plan (dict): The plan.
+        module (MssqlModule): The module instance.
+    """
+
+    if login['state'] == 'absent':
+        if row is not None:
+            plan['drop_login_statements'].append(f"DROP LOGIN {quote_name(login['name'])};")
+            plan['changes']['logins'].append(dict(name=login['name'], action='drop', password_set=False))
+
+        return
+
+    password_param: str = f"password_{index}"
+
+    if row is None:
+        if login['type'] == 'sql' and 'password' not in login:
+            module.handle_error(MssqlModuleError(message=f"The password parameter is required to create the SQL login '{login['name']}'."))
+
+        if login['type'] == 'sql':
+            current: dict = dict(
+                name=login['name'],
+                type=login['type'],
+                enabled=login.get('enabled', True),
+                login_password_expiration_enabled=login.get('login_password_expiration_enabled', False),
+                login_password_policy_enforced=login.get('login_password_policy_enforced', True)
+            )
+            plan['server_params'][password_param] = login['password']
+        else:
+            current: dict = dict(
+                name=login['name'],
+                type=login['type'],
+                enabled=login.get('enabled', True)
+            )
+
+        plan['server_statements'].extend(get_create_login_statements(current, password_param))
+        plan['changes']['logins'].append(dict(name=login['name'], action='create', password_set='password' in login))
+
+        return
+
+    existing_login: dict = format_login(row, module)
+
+    if login['type'] != existing_login['type']:
+        module.handle_error(
+            MssqlModuleError(
+                f"Cannot change the type of the login '{login['name']}'. Remove the existing login first and then create it with the new type."))
+
+    if login['type'] == 'sql':
+        current: dict = dict(
+            name=login['name'],
+            type=login['type'],
+            enabled=login.get('enabled', existing_login['enabled']),
+            login_password_expiration_enabled=login.get('login_password_expiration_enabled', existing_login['login_password_expiration_enabled']),
+            login_password_policy_enforced=login.get('login_password_policy_enforced', existing_login['login_password_policy_enforced'])
+        )
+        password_set: bool = login['update_password'] == 'always' and 'password' in login and not row['password_matches']
+    else:
+        current: dict = dict(
+            name=login['name'],
+            type=login['type'],
+            enabled=login.get('enabled', existing_login['enabled'])
+        )
+        password_set: bool = False
+
+    if password_set:
+        plan['server_params'][password_param] = login['password']
+
+    statements: List[str] = get_alter_login_statements(current, existing_login, password_param if password_set else None)
+
+    if len(statements) > 0:
+        plan['server_statements'].extend(statements)
+        plan['changes']['logins'].append(dict(name=login['name'], action='update', password_set=password_set))
+
+
+def get_database_or_fail(database: str, databases: dict, module: MssqlModule) -> dict:
+    """
+    Gets the existing state of a database, failing if the database does not exist.
+
+    Args:
+        database (str): The name of the database.
+        databases (dict): The existing state of each database.
+        module (MssqlModule): The module instance.
+
+    Returns:
+        dict: The existing state of the database.
+    """
+
+    if database not in databases:
+        module.handle_error(MssqlModuleError(message=f"No database exists with the name '{database}'."))
+
+    return databases[database]
+
+
+def get_principal_permissions_or_fail(principal: str, database_state: dict, module: MssqlModule) -> dict:
+    """
+    Gets the permissions held by a database principal, failing if the principal does not exist and is not created by the plan.
+
+    Args:
+        principal (str): The name of the database principal.
+        database_state (dict): The existing state of the database.
+        module (MssqlModule): The module instance.
+
+    Returns:
+        dict: The state of each held permission, keyed by the object ID and the permission name used in queries.
+    """
+
+    if principal not in database_state['principal_ids']:
+        module.handle_error(MssqlModuleError(message=f"No database principal exists with the name '{principal}'."))
+
+    principal_id: Optional[int] = database_state['principal_ids'][principal]
+
+    if principal_id is None:
+        return database_state.setdefault('planned_permissions', {}).setdefault(principal, {})
+
+    return database_state['permissions'][principal_id]
+
+
+def get_object_or_fail(item: dict, database_state: dict, module: MssqlModule) -> dict:
+    """
+    Gets the object referenced by a database object-level permission, failing unless exactly one object matches.
+
+    Args:
+        item (dict): The database object-level permission.
+        database_state (dict): The existing state of the database.
+        module (MssqlModule): The module instance.
+
+    Returns:
+        dict: The object, with a schema, name, and object ID.
+    """
+
+    object_matches: List[dict] = database_state['object_matches'].get((item.get('schema', None), item['object']), [])
+
+    if len(object_matches) == 0:
+        if item.get('schema', None) is None:
+            module.handle_error(MssqlModuleError(message=f"No object exists with the name '{item['object']}'."))
+        else:
+            module.handle_error(MssqlModuleError(message=f"No object exists with the name '{item['object']}' in the schema '{item['schema']}'."))
+
+    if len(object_matches) > 1:
+        module.handle_error(MssqlModuleError(message=f"Multiple objects exist with the name '{item['object']}'. Please specify the schema."))
+
+    return object_matches[0]
+
+
+def apply_plan(plan: dict, module: MssqlModule) -> None:
+    """
+    Applies the plan.
+    Server-level changes are applied first, then the changes in each database, and finally the removal of logins.
+
+    Args:
+        plan (dict): The plan.
+        module (MssqlModule): The module instance.
+    """
+
+    module.execute_batch(plan['server_statements'], params=plan['server_params'] if len(plan['server_params']) > 0 else None)
+
+    for database, statements in plan['database_statements'].items():
+        module.execute_batch(statements, database=database)
+
+    module.execute_batch(plan['drop_login_statements'])
+
+
+def main() -> None:
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -19,12 +19,24 @@ attributes:
       - This module supports check mode.
 extends_documentation_fragment:
   - trippsc2.mssql.login
+  - trippsc2.mssql.login_hosts
 options:
   principal:
     type: str
-    required: true
+    required: false
     description:
       - The name of the SQL login or role for which to configure server-level permissions.
+      - Exactly one of O(principal) or O(principals) is required.
+  principals:
+    type: list
+    required: false
+    elements: str
+    version_added: 1.5.0
+    description:
+      - The names of the SQL logins or roles for which to configure server-level permissions.
+      - The same permissions are configured for every principal.
+      - The principals are validated with one query, their permissions are read with one query, and all changes are applied in one batch.
+      - Exactly one of O(principal) or O(principals) is required.
   permissions:
     type: list
     required: true
@@ -77,6 +89,16 @@ options:
       - revoke
     description:
       - The state of the server-level permissions.
+  exclusive:
+    type: bool
+    required: false
+    default: false
+    version_added: 1.5.0
+    description:
+      - If V(true), every other server-level permission held by each principal is revoked.
+      - The held permissions are read with one query and revoked in the same batch as the other changes.
+      - SQL Server grants C(CONNECT SQL) to a login when it is created, so include V(connect_sql) in O(permissions) to keep it.
+      - Cannot be V(true) when O(state=revoke).
 """
 
 EXAMPLES = r"""
@@ -123,6 +145,31 @@ EXAMPLES = r"""
       - connect_sql
       - view_server_state
     state: revoke
+
+- name: Grant SQL server-level permissions to multiple principals
+  trippsc2.mssql.mssql_server_permission:
+    login_user: sa
+    login_password: password
+    login_host: localhost
+    principals:
+      - app1
+      - app2
+    permissions:
+      - connect_sql
+      - view_server_state
+    state: grant
+
+- name: Grant SQL server-level permissions and revoke every other server-level permission
+  trippsc2.mssql.mssql_server_permission:
+    login_user: sa
+    login_password: password
+    login_host: localhost
+    principal: test
+    permissions:
+      - connect_sql
+      - view_server_state
+    state: grant
+    exclusive: true
 """
 
 RETURN = r"""
@@ -145,11 +192,39 @@ current:
       type: str
       description:
         - The state of the server-level permission.
+hosts:
+  type: list
+  elements: dict
+  returned: O(login_hosts) is specified
+  version_added: 1.5.0
+  description:
+    - The result for each host in O(login_hosts).
+    - Each element also contains the values that the module returns when O(login_host) is specified.
+  contains:
+    host:
+      type: str
+      description:
+        - The hostname of the SQL Server instance.
+    changed:
+      type: bool
+      description:
+        - Whether the SQL Server instance was changed.
+    failed:
+      type: bool
+      returned: The SQL Server instance could not be configured.
+      description:
+        - Whether the SQL Server instance could not be configured.
+    msg:
+      type: str
+      returned: The SQL Server instance could not be configured.
+      description:
+        - The error that occurred on the SQL Server instance.
 previous:
   type: dict
   returned: changed
   description:
     - The previous configuration of the SQL server-level permissions.
+    - If O(exclusive=true), includes the unlisted permissions that were revoked.
   sample:
     - permission: connect_sql
       state: grant
@@ -164,12 +239,48 @@ previous:
       type: str
       description:
         - The state of the server-level permission.
+principals:
+  type: list
+  elements: dict
+  returned: O(principals) is specified
+  version_added: 1.5.0
+  description:
+    - The result for each server principal.
+  sample:
+    - principal: app1
+      changed: true
+      previous:
+        - permission: connect_sql
+          state: grant
+      current:
+        - permission: connect_sql
+          state: grant
+        - permission: view_server_state
+          state: grant
+  contains:
+    principal:
+      type: str
+      description:
+        - The name of the server principal.
+    changed:
+      type: bool
+      description:
+        - Whether the permissions of the server principal were changed.
+    previous:
+      type: list
+      elements: dict
+      description:
+        - The previous configuration of the SQL server-level permissions of the server principal.
+    current:
+      type: list
+      elements: dict
+      description:
+        - The configuration of the SQL server-level permissions of the server principal.
 """
 
 import traceback
 
 from ansible.module_utils.basic import missing_required_lib
-from ansible.module_utils.common.text.converters import to_native
 
 from typing import List, Optional
 
@@ -182,62 +293,45 @@ else:
     HAS_PYMSSQL: bool = True
     PYMSSQL_IMPORT_ERROR: Optional[str] = None
 
+from ..module_utils._mssql_lookup import MssqlLookupResult, lookup_securables
 from ..module_utils._mssql_module import MssqlModule
 from ..module_utils._mssql_module_error import MssqlModuleError
+from ..module_utils._mssql_permission import (
+    PERMISSION_STATES,
+    SERVER_PERMISSIONS,
+    convert_permission_to_query,
+    get_permission_query,
+    get_unlisted_permissions,
+    server_permissions_match
+)
 
 
 def run_module() -> None:
     module: MssqlModule = MssqlModule(
         argument_spec=dict(
-            principal=dict(type='str', required=True),
+            principal=dict(type='str', required=False),
+            principals=dict(type='list', required=False, elements='str'),
             permissions=dict(
                 type='list',
                 required=True,
                 elements='str',
-                choices=[
-                    'administer_bulk_operations',
-                    'alter_any_availability_group',
-                    'alter_any_connection',
-                    'alter_any_credential',
-                    'alter_any_database',
-                    'alter_any_endpoint',
-                    'alter_any_event_notification',
-                    'alter_any_event_session',
-                    'alter_any_linked_server',
-                    'alter_any_login',
-                    'alter_any_server_audit',
-                    'alter_any_server_role',
-                    'alter_resources',
-                    'alter_server_state',
-                    'alter_settings',
-                    'alter_trace',
-                    'authenticate_server',
-                    'connect_any_database',
-                    'connect_sql',
-                    'control_server',
-                    'create_any_database',
-                    'create_availability_group',
-                    'create_ddl_event_notification',
-                    'create_endpoint',
-                    'create_server_role',
-                    'create_trace_event_notification',
-                    'external_access_assembly',
-                    'impersonate_any_login',
-                    'select_all_user_securables',
-                    'shutdown',
-                    'unsafe_assembly',
-                    'view_any_database',
-                    'view_any_definition',
-                    'view_server_state'
-                ]
+                choices=SERVER_PERMISSIONS
             ),
             state=dict(
                 type='str',
                 required=False,
                 default='grant',
-                choices=['grant', 'deny', 'grant_with_grant_option', 'revoke']
-            )
-        )
+                choices=PERMISSION_STATES
+            ),
+            exclusive=dict(type='bool', required=False, default=False)
+        ),
+        mutually_exclusive=[
+            ('principal', 'principals')
+        ],
+        required_one_of=[
+            ('principal', 'principals')
+        ],
+        supports_login_hosts=True
     )
 
     if not HAS_PYMSSQL:
@@ -245,49 +339,95 @@ def run_module() -> None:
             msg=missing_required_lib('pymssql'),
             exception=PYMSSQL_IMPORT_ERROR)
 
+    module.run_reconcile(reconcile)
+
+
+def reconcile(module: MssqlModule) -> dict:
+    """
+    Configures the server-level permissions on the SQL Server instance of the module.
+
+    Args:
+        module (MssqlModule): The module instance.
+
+    Returns:
+        dict: The module result.
+    """
+
     params: dict = module.get_defined_non_connection_params()
-    module.initialize_client()
     validate_params(params, module)
 
-    previous_permissions: dict = get_server_permissions(params['principal'], params['permissions'], module)
+    if 'principals' in params:
+        requested_principals: List[str] = params['principals']
+    else:
+        requested_principals: List[str] = [params['principal']]
+
+    revoked_permissions: dict = {}
+
+    if not params['exclusive'] and server_permissions_match(requested_principals, params['permissions'], params['state'], module):
+        previous_permissions: dict = dict(
+            (principal, dict((permission, params['state']) for permission in params['permissions']))
+            for principal in requested_principals
+        )
+    else:
+        principals: dict = resolve_principals(requested_principals, module)
+        held_permissions: dict = get_server_permission_states(principals, module)
+        previous_permissions: dict = get_server_permissions(held_permissions, params['permissions'])
+
+        if params['exclusive']:
+            revoked_permissions: dict = dict(
+                (principal, get_unlisted_permissions(principal_permissions, params['permissions']))
+                for principal, principal_permissions in held_permissions.items()
+            )
 
     changed: bool = False
 
-    previous: List[dict] = []
-    current: List[dict] = []
+    principal_results: List[dict] = []
 
-    for permission, previous_state in previous_permissions.items():
-        if previous_state != params['state']:
-            changed: bool = True
+    for principal, principal_permissions in previous_permissions.items():
+        principal_changed: bool = False
+
+        previous: List[dict] = []
+        current: List[dict] = []
+
+        for permission, previous_state in principal_permissions.items():
+            if previous_state != params['state']:
+                principal_changed: bool = True
 
-        if previous_state != 'revoke':
+            if previous_state != 'revoke':
+                previous.append(dict(permission=permission, state=previous_state))
+
+            if params['state'] != 'revoke':
+                current.append(dict(permission=permission, state=params['state']))
+
+        for permission, previous_state in revoked_permissions.get(principal, {}).items():
+            principal_changed: bool = True
             previous.append(dict(permission=permission, state=previous_state))
 
-        if params['state'] != 'revoke':
-            current.append(dict(permission=permission, state=params['state']))
+        if principal_changed:
+            changed: bool = True
+
+        if 'principals' in params:
+            principal_result: dict = dict(principal=principal, changed=principal_changed)
+        else:
+            principal_result: dict = dict(changed=principal_changed)
 
-        if not module.check_mode:
-            modify_permission(
-                params['principal'],
-                permission,
-                previous_state,
-                params['state'],
-                module
-            )
+        if len(previous) > 0:
+            principal_result['previous'] = previous
 
-    if len(previous) > 0:
         if len(current) > 0:
-            result: dict = dict(changed=changed, previous=previous, current=current)
-        else:
-            result: dict = dict(changed=changed, previous=previous)
+            principal_result['current'] = current
+
+        principal_results.append(principal_result)
+
+    if not module.check_mode:
+        modify_permissions(previous_permissions, params['state'], module, revoked_permissions=revoked_permissions)
+
+    if 'principals' in params:
+        result: dict = dict(changed=changed, principals=principal_results)
     else:
-        if len(current) > 0:
-            result: dict = dict(changed=changed, current=current)
-        else:
-            result: dict = dict(changed=changed)
+        result: dict = principal_results[0]
 
-    module.close_client_session()
-    module.exit_json(**result)
+    return result
 
 
 def validate_params(params: dict, module: MssqlModule) -> None:
@@ -302,142 +442,122 @@ def validate_params(params: dict, module: MssqlModule) -> None:
     if len(params['permissions']) < 1:
         module.handle_error(MssqlModuleError(message='At least one permission must be specified.'))
 
-    query: str = f"SELECT name FROM sys.server_principals WHERE name = '{params['principal']}'"
+    if 'principals' in params and len(params['principals']) < 1:
+        module.handle_error(MssqlModuleError(message='At least one principal must be specified.'))
 
-    try:
-        module.cursor.execute(query)
-        result: Optional[dict] = module.cursor.fetchone()
-    except Exception as e:
-        module.handle_error(MssqlModuleError(message=to_native(e), exception=e))
+    if params['exclusive'] and params['state'] == 'revoke':
+        module.handle_error(MssqlModuleError(message='The exclusive parameter cannot be true when state is revoke.'))
 
-    if result is None:
-        module.handle_error(MssqlModuleError(message=f"No server principal exists with the name '{params['principal']}'."))
 
-
-def get_server_permissions(
-        principal: str,
-        permissions: List[str],
-        module: MssqlModule) -> dict:
+def resolve_principals(principals: List[str], module: MssqlModule) -> dict:
     """
-    Gets the server-level permissions.
+    Resolves the ID of every server principal with a single lookup.
 
     Args:
-        name (str): The name of the SQL Login.
-        permissions (list): The server-level permissions.
+        principals (List[str]): The names of the server principals.
         module (MssqlModule): The module instance.
 
     Returns:
-        dict: The relevant server-level permissions.
+        dict: The ID of each server principal, keyed by the requested name.
     """
 
+    lookup: MssqlLookupResult = lookup_securables(module, logins=principals)
+
     results: dict = {}
 
-    for permission in permissions:
-        results: dict = get_server_permission(principal, permission, module, results)
+    for principal in principals:
+        if not lookup.login_exists(principal):
+            module.handle_error(MssqlModuleError(message=f"No server principal exists with the name '{principal}'."))
+
+        results[principal] = lookup.logins[principal]
 
     return results
 
 
-def get_server_permission(
-        principal: str,
-        permission: str,
-        module: MssqlModule,
-        results: dict) -> dict:
+def get_server_permission_states(principals: dict, module: MssqlModule) -> dict:
     """
-    Gets the server-level permission.
+    Gets every server-level permission held by every server principal with a single query.
 
     Args:
-        name (str): The name of the SQL Login.
-        permission (str): The server-level permission.
+        principals (dict): The ID of each server principal, keyed by name.
         module (MssqlModule): The module instance.
-        results (dict): The results of previous operations.
 
     Returns:
-        dict: Results of this and previous operations.
+        dict: The state of each held permission, keyed by the name of each server principal and then by the permission name used in queries.
     """
 
-    query: str = f"""
-    SELECT principals.name as name,
-            permissions.permission_name as permission,
-            permissions.state_desc as state
+    statement: str = """
+    SELECT permissions.grantee_principal_id AS principal_id,
+            permissions.permission_name AS permission,
+            permissions.state_desc AS state
     FROM sys.server_permissions permissions
-    JOIN sys.server_principals principals
-    ON permissions.grantee_principal_id = principals.principal_id
-    WHERE principals.name = '{principal}'
-    AND permissions.permission_name = '{convert_permission_to_query(permission)}'
+    WHERE permissions.class_desc = 'SERVER'
+    AND permissions.grantee_principal_id IN (SELECT CAST(value AS int) FROM STRING_SPLIT(%(principal_ids)s, ','))
     """
 
-    try:
-        module.cursor.execute(query)
-        row: Optional[dict] = module.cursor.fetchone()
-    except Exception as e:
-        module.handle_error(MssqlModuleError(message=to_native(e), exception=e))
+    principal_ids: str = ','.join(str(principal_id) for principal_id in principals.values())
+    rows: List[dict] = module.execute_query(statement, dict(principal_ids=principal_ids))
 
-    if row is None:
-        results[permission] = 'revoke'
-    else:
-        results[permission] = row['state'].lower()
+    held_permissions: dict = {}
 
-    return results
+    for row in rows:
+        held_permissions.setdefault(row['principal_id'], {})[row['permission']] = row['state'].lower()
+
+    return dict((principal, held_permissions.get(principal_id, {})) for principal, principal_id in principals.items())
 
 
-def convert_permission_to_query(permission: str) -> str:
+def get_server_permissions(held_permissions: dict, permissions: List[str]) -> dict:
     """
-    Converts the server-level permission to a SQL query.
+    Gets the state of the requested server-level permissions of every server principal.
 
     Args:
-        permission (str): The server-level permission.
+        held_permissions (dict): The state of each held permission, as returned by get_server_permission_states.
+        permissions (list): The server-level permissions.
 
     Returns:
-        str: The SQL query.
+        dict: The state of each requested permission, keyed by the name of each server principal.
     """
 
-    return permission.replace('_', ' ').upper()
+    results: dict = {}
+
+    for principal, principal_permissions in held_permissions.items():
+        results[principal] = dict(
+            (permission, principal_permissions.get(convert_permission_to_query(permission), 'revoke'))
+            for permission in permissions
+        )
+
+    return results
 
 
-def modify_permission(
-        principal: str,
-        permission: str,
-        previous_state: str,
+def modify_permissions(
+        previous_permissions: dict,
         state: str,
-        module: MssqlModule) -> None:
+        module: MssqlModule,
+        revoked_permissions: Optional[dict] = None) -> None:
     """
-    Modifies the server-level permission.
+    Modifies the server-level permissions in a single batch and transaction.
 
     Args:
-        name (str): The name of the SQL Login.
-        permission (str): The server-level permission.
-        previous_state (str): The previous state of the permission.
-        state (str): The desired state of the permission.
+        previous_permissions (dict): The previous state of each permission, keyed by the name of each server principal.
+        state (str): The desired state of the permissions.
         module (MssqlModule): The module instance.
+        revoked_permissions (Optional[dict]): The previous state of each unlisted permission to revoke, keyed by the name of each server principal.
     """
 
-    if previous_state == state:
-        return
+    queries: List[str] = []
 
-    if state == 'revoke':
-        if previous_state == 'grant_with_grant_option':
-            query: str = f'REVOKE {convert_permission_to_query(permission)} TO [{principal}] CASCADE;'
-        else:
-            query: str = f'REVOKE {convert_permission_to_query(permission)} TO [{principal}];'
-    elif state == 'grant':
-        if previous_state == 'grant_with_grant_option':
-            query: str = f'REVOKE GRANT OPTION FOR {convert_permission_to_query(permission)} TO [{principal}] CASCADE;'
-        else:
-            query: str = f'GRANT {convert_permission_to_query(permission)} TO [{principal}];'
-    elif state == 'deny':
-        if previous_state == 'grant_with_grant_option':
-            query: str = f'DENY {convert_permission_to_query(permission)} TO [{principal}] CASCADE;'
-        else:
-            query: str = f'DENY {convert_permission_to_query(permission)} TO [{principal}];'
-    elif state == 'grant_with_grant_option':
-        query: str = f'GRANT {convert_permission_to_query(permission)} TO [{principal}] WITH GRANT OPTION;'
-
-    try:
-        module.cursor.execute(query)
-        module.conn.commit()
-    except Exception as e:
-        module.handle_error(MssqlModuleError(message=to_native(e), exception=e))
+    for principal, principal_permissions in previous_permissions.items():
+        for permission, previous_state in principal_permissions.items():
+            query: Optional[str] = get_permission_query(principal, permission, previous_state, state)
+
+            if query is not None:
+                queries.append(query)
+
+    for principal, principal_permissions in (revoked_permissions or {}).items():
+        for permission, previous_state in principal_permissions.items():
+            queries.append(get_permission_query(principal, permission, previous_state, 'revoke'))
+
+    module.execute_batch(queries)
 
 
 def main() -> None:
@@ -0,0 +1,276 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+module: mssql_server_role_member
+version_added: 1.5.0
+author:
+  - Jim Tarpley (@trippsc2)
+short_description: Configures the members of a server role in a Microsoft SQL Server instance.
+description:
+  - Configures the members of a server role in a Microsoft SQL Server instance.
+  - The role, the members, and the existing memberships are read with one query, and all changes are applied in one batch.
+attributes:
+  check_mode:
+    support: full
+    description:
+      - This module supports check mode.
+extends_documentation_fragment:
+  - trippsc2.mssql.login
+  - trippsc2.mssql.login_hosts
+options:
+  role:
+    type: str
+    required: true
+    description:
+      - The name of the server role.
+  members:
+    type: list
+    required: true
+    elements: str
+    description:
+      - The names of the SQL logins or server roles to add to or remove from the server role.
+      - When O(state=present), every member must exist.
+  state:
+    type: str
+    required: false
+    default: present
+    choices:
+      - present
+      - absent
+    description:
+      - Whether the members should be members of the server role.
+"""
+
+EXAMPLES = r"""
+- name: Add members to a server role
+  trippsc2.mssql.mssql_server_role_member:
+    login_user: sa
+    login_password: password
+    login_host: localhost
+    role: sysadmin
+    members:
+      - admin1
+      - admin2
+    state: present
+
+- name: Remove members from a server role
+  trippsc2.mssql.mssql_server_role_member:
+    login_user: sa
+    login_password: password
+    login_host: localhost
+    role: sysadmin
+    members:
+      - admin1
+      - admin2
+    state: absent
+"""
+
+RETURN = r"""
+added:
+  type: list
+  elements: str
+  returned: O(state=present)
+  description:
+    - The members added to the server role.
+  sample:
+    - admin1
+hosts:
+  type: list
+  elements: dict
+  returned: O(login_hosts) is specified
+  description:
+    - The result for each host in O(login_hosts).
+    - Each element also contains the values that the module returns when O(login_host) is specified.
+  contains:
+    host:
+      type: str
+      description:
+        - The hostname of the SQL Server instance.
+    changed:
+      type: bool
+      description:
+        - Whether the SQL Server instance was changed.
+    failed:
+      type: bool
+      returned: The SQL Server instance could not be configured.
+      description:
+        - Whether the SQL Server instance could not be configured.
+    msg:
+      type: str
+      returned: The SQL Server instance could not be configured.
+      description:
+        - The error that occurred on the SQL Server instance.
+removed:
+  type: list
+  elements: str
+  returned: O(state=absent)
+  description:
+    - The members removed from the server role.
+  sample:
+    - admin2
+"""
+
+import json
+import traceback
+
+from ansible.module_utils.basic import missing_required_lib
+
+from typing import List, Optional
+
+try:
+    import pymssql
+except ImportError:
+    HAS_PYMSSQL: bool = False
+    PYMSSQL_IMPORT_ERROR: Optional[str] = traceback.format_exc()
+else:
+    HAS_PYMSSQL: bool = True
+    PYMSSQL_IMPORT_ERROR: Optional[str] = None
+
+from ..module_utils._mssql_module import MssqlModule, quote_name, unique
+from ..module_utils._mssql_module_error import MssqlModuleError
+
+
+def run_module() -> None:
+    module: MssqlModule = MssqlModule(
+        argument_spec=dict(
+            role=dict(type='str', required=True),
+            members=dict(type='list', required=True, elements='str'),
+            state=dict(
+                type='str',
+                required=False,
+                default='present',
+                choices=['present', 'absent']
+            )
+        ),
+        supports_login_hosts=True
+    )
+
+    if not HAS_PYMSSQL:
+        module.fail_json(
+            msg=missing_required_lib('pymssql'),
+            exception=PYMSSQL_IMPORT_ERROR)
+
+    module.run_reconcile(reconcile)
+
+
+def reconcile(module: MssqlModule) -> dict:
+    """
+    Configures the members of the server role on the SQL Server instance of the module.
+
+    Args:
+        module (MssqlModule): The module instance.
+
+    Returns:
+        dict: The module result.
+    """
+
+    params: dict = module.get_defined_non_connection_params()
+    validate_params(params, module)
+
+    members: List[str] = unique(params['members'])
+    memberships: dict = get_server_role_memberships(params['role'], members, module)
+
+    if params['state'] == 'present':
+        missing_members: List[str] = [member for member in members if memberships[member] is None]
+
+        if len(missing_members) > 0:
+            module.handle_error(MssqlModuleError(message=f"No server principal exists with the name '{missing_members[0]}'."))
+
+        changed_members: List[str] = [member for member in members if not memberships[member]]
+        result_key: str = 'added'
+    else:
+        changed_members: List[str] = [member for member in members if memberships[member]]
+        result_key: str = 'removed'
+
+    if not module.check_mode:
+        modify_server_role_members(params['role'], changed_members, params['state'], module)
+
+    result: dict = dict(changed=len(changed_members) > 0)
+    result[result_key] = changed_members
+
+    return result
+
+
+def validate_params(params: dict, module: MssqlModule) -> None:
+    """
+    Validates the module parameters.
+
+    Args:
+        params (dict): The module parameters.
+        module (MssqlModule): The module instance.
+    """
+
+    if len(params['members']) < 1:
+        module.handle_error(MssqlModuleError(message='At least one member must be specified.'))
+
+
+def get_server_role_memberships(role: str, members: List[str], module: MssqlModule) -> dict:
+    """
+    Gets whether each server principal is a member of the server role with a single query.
+
+    Args:
+        role (str): The name of the server role.
+        members (List[str]): The names of the server principals.
+        module (MssqlModule): The module instance.
+
+    Returns:
+        dict: Whether each server principal is a member of the server role, keyed by name, or None if the server principal does not exist.
+    """
+
+    statement: str = """
+    SELECT CAST(requested.[key] AS int) AS request_index,
+            roles.principal_id AS role_id,
+            members.principal_id AS member_id,
+            CASE WHEN role_members.member_principal_id IS NULL THEN 0 ELSE 1 END AS is_member
+    FROM OPENJSON(%(members)s) requested
+    LEFT JOIN sys.server_principals roles
+    ON roles.name = %(role)s
+    AND roles.type = 'R'
+    LEFT JOIN sys.server_principals members
+    ON members.name = requested.value COLLATE DATABASE_DEFAULT
+    LEFT JOIN sys.server_role_members role_members
+    ON role_members.role_principal_id = roles.principal_id
+    AND role_members.member_principal_id = members.principal_id
+    """
+
+    rows: List[dict] = module.execute_query(statement, dict(role=role, members=json.dumps(members)))
+
+    if len(rows) < 1 or rows[0]['role_id'] is None:
+        module.handle_error(MssqlModuleError(message=f"No server role exists with the name '{role}'."))
+
+    results: dict = {}
+
+    for row in rows:
+        results[members[row['request_index']]] = bool(row['is_member']) if row['member_id'] is not None else None
+
+    return results
+
+
+def modify_server_role_members(role: str, members: List[str], state: str, module: MssqlModule) -> None:
+    """
+    Adds or removes the members of the server role in a single batch and transaction.
+
+    Args:
+        role (str): The name of the server role.
+        members (List[str]): The names of the server principals to add or remove.
+        state (str): Whether the server principals should be members of the server role.
+        module (MssqlModule): The module instance.
+    """
+
+    action: str = 'ADD' if state == 'present' else 'DROP'
+
+    queries: List[str] = [f"ALTER SERVER ROLE {quote_name(role)} {action} MEMBER {quote_name(member)};" for member in members]
+
+    module.execute_batch(queries)
+
+
+def main() -> None:
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
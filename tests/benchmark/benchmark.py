@@ -0,0 +1,495 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks the modules of the collection against the fake SQL Server instance in fake_pymssql.
+
+Each scenario runs the run_module function of a module in this process with a realistic workload,
+once against an instance on which nothing is configured yet and once against an instance that is already converged.
+The number of round trips, the wall time, and the peak memory allocated by Python are reported for each run.
+The number of round trips is compared to the budget of the scenario, and the script exits with status 1 if any budget is exceeded,
+so a change that adds queries to a module fails the benchmark even though its timing is noisy.
+Budgets are derived from the round trips each module is designed to use, not from the counts observed today,
+so they do not grow with the workload except where one batch per database is part of the design.
+The script also exits with status 1 if a module fails, or reports a change on the converged instance or none on the initial one.
+
+Usage:
+    python tests/benchmark/benchmark.py [--latency SECONDS] [--scenario PATTERN] [--json PATH]
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import argparse
+import contextlib
+import fnmatch
+import importlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from typing import Callable, List, Optional
+
+BENCHMARK_DIRECTORY: str = os.path.dirname(os.path.abspath(__file__))
+COLLECTION_DIRECTORY: str = os.path.dirname(os.path.dirname(BENCHMARK_DIRECTORY))
+
+sys.path.insert(0, BENCHMARK_DIRECTORY)
+
+import fake_pymssql  # noqa: E402
+
+LOGIN_ARGS: dict = dict(login_user='sa', login_password='SecurePassword123!', login_host='localhost')
+
+LOGIN_PASSWORD: str = 'AppPassword123!'
+
+SERVER_PERMISSIONS: List[str] = ['CONNECT SQL', 'VIEW SERVER STATE', 'VIEW ANY DEFINITION']
+
+# The round trips a module is designed to use.
+# READ is one set-based catalog query, however many items it covers, and BATCH is one T-SQL batch applying every change.
+READ: int = 1
+BATCH: int = 1
+
+# The number of principals configured in each database by the mssql_security_state and mssql_info scenarios.
+PRINCIPALS_PER_DATABASE: int = 10
+
+
+class Scenario():
+    """
+    Represents a module invocation with a workload and the round trips it may use.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            module: str,
+            args: dict,
+            seed: Callable[[fake_pymssql.FakeServer, bool], None],
+            budget: Callable[[bool], int],
+            changes: bool = True) -> None:
+        self.name = name
+        self.module = module
+        self.args = args
+        self.seed = seed
+        self.budget = budget
+        self.changes = changes
+
+
+def seed_server_permission(count: int) -> Callable[[fake_pymssql.FakeServer, bool], None]:
+    def seed(server: fake_pymssql.FakeServer, converged: bool) -> None:
+        for index in range(count):
+            principal_id = server.add_login(f"app{index}")
+
+            if converged:
+                for permission in SERVER_PERMISSIONS:
+                    server.server_permissions[(principal_id, permission)] = 'GRANT'
+
+    return seed
+
+
+def seed_db_permission(permissions: List[str]) -> Callable[[fake_pymssql.FakeServer, bool], None]:
+    def seed(server: fake_pymssql.FakeServer, converged: bool) -> None:
+        database = server.add_database('app')
+        principal_id = database.add_principal('app_user')
+
+        if converged:
+            for permission in permissions:
+                database.permissions[(principal_id, 0, 0, permission.replace('_', ' ').upper())] = 'GRANT'
+
+    return seed
+
+
+def seed_db_object_permission(count: int) -> Callable[[fake_pymssql.FakeServer, bool], None]:
+    def seed(server: fake_pymssql.FakeServer, converged: bool) -> None:
+        database = server.add_database('app')
+        principal_id = database.add_principal('app_user')
+
+        for index in range(count):
+            object_id = database.add_object('dbo', f"table{index}")
+
+            if converged:
+                database.permissions[(principal_id, 1, object_id, 'SELECT')] = 'GRANT'
+
+    return seed
+
+
+def seed_db_user(count: int) -> Callable[[fake_pymssql.FakeServer, bool], None]:
+    def seed(server: fake_pymssql.FakeServer, converged: bool) -> None:
+        server.add_login('app_user')
+
+        for index in range(count):
+            database = server.add_database(f"app{index:04d}")
+
+            if converged:
+                database.add_principal('app_user')
+
+    return seed
+
+
+def seed_login(count: int) -> Callable[[fake_pymssql.FakeServer, bool], None]:
+    def seed(server: fake_pymssql.FakeServer, converged: bool) -> None:
+        if converged:
+            for index in range(count):
+                server.add_login(f"app{index}", LOGIN_PASSWORD)
+
+    return seed
+
+
+def seed_server_role_member(count: int) -> Callable[[fake_pymssql.FakeServer, bool], None]:
+    def seed(server: fake_pymssql.FakeServer, converged: bool) -> None:
+        role_id = server.add_server_role('app_role')
+
+        for index in range(count):
+            principal_id = server.add_login(f"app{index}")
+
+            if converged:
+                server.server_role_members.add((role_id, principal_id))
+
+    return seed
+
+
+def seed_db_role_member(count: int) -> Callable[[fake_pymssql.FakeServer, bool], None]:
+    def seed(server: fake_pymssql.FakeServer, converged: bool) -> None:
+        database = server.add_database('app')
+        role_id = database.add_role('app_role')
+
+        for index in range(count):
+            principal_id = database.add_principal(f"app{index}")
+
+            if converged:
+                database.role_members.add((role_id, principal_id))
+
+    return seed
+
+
+def get_security_state_args(count: int) -> dict:
+    principals: List[str] = [f"app{index}" for index in range(PRINCIPALS_PER_DATABASE)]
+    databases: List[str] = [f"app{index:04d}" for index in range(count)]
+
+    return dict(
+        logins=[dict(name=principal, password=LOGIN_PASSWORD) for principal in principals],
+        server_permissions=[dict(principal=principal, permissions=['connect_sql']) for principal in principals],
+        db_users=[dict(name=principal, database=database) for database in databases for principal in principals],
+        db_permissions=[dict(principal=principal, database=database, permissions=['connect']) for database in databases for principal in principals],
+        db_object_permissions=[
+            dict(principal=principal, database=database, schema='dbo', object='table0', permissions=['select'])
+            for database in databases
+            for principal in principals
+        ]
+    )
+
+
+def seed_security_state(count: int) -> Callable[[fake_pymssql.FakeServer, bool], None]:
+    def seed(server: fake_pymssql.FakeServer, converged: bool) -> None:
+        for index in range(count):
+            database = server.add_database(f"app{index:04d}")
+            object_id = database.add_object('dbo', 'table0')
+
+            if not converged:
+                continue
+
+            for principal in range(PRINCIPALS_PER_DATABASE):
+                principal_id = database.add_principal(f"app{principal}")
+                database.permissions[(principal_id, 0, 0, 'CONNECT')] = 'GRANT'
+                database.permissions[(principal_id, 1, object_id, 'SELECT')] = 'GRANT'
+
+        if converged:
+            for principal in range(PRINCIPALS_PER_DATABASE):
+                principal_id = server.add_login(f"app{principal}", LOGIN_PASSWORD)
+                server.server_permissions[(principal_id, 'CONNECT SQL')] = 'GRANT'
+
+    return seed
+
+
+def seed_info(count: int) -> Callable[[fake_pymssql.FakeServer, bool], None]:
+    def seed(server: fake_pymssql.FakeServer, converged: bool) -> None:
+        role_id = server.add_server_role('app_role')
+
+        for index in range(count):
+            database = server.add_database(f"app{index:04d}")
+
+            if not converged:
+                continue
+
+            database_role_id = database.add_role('app_role')
+            object_id = database.add_object('dbo', 'table0')
+
+            for principal in range(PRINCIPALS_PER_DATABASE):
+                principal_id = database.add_principal(f"app{principal}")
+                database.role_members.add((database_role_id, principal_id))
+                database.permissions[(principal_id, 0, 0, 'CONNECT')] = 'GRANT'
+                database.permissions[(principal_id, 1, object_id, 'SELECT')] = 'GRANT'
+
+        if converged:
+            for principal in range(PRINCIPALS_PER_DATABASE):
+                principal_id = server.add_login(f"app{principal}", LOGIN_PASSWORD)
+                server.server_role_members.add((role_id, principal_id))
+                server.server_permissions[(principal_id, 'CONNECT SQL')] = 'GRANT'
+
+    return seed
+
+
+def get_scenarios() -> List[Scenario]:
+    """
+    Gets every scenario.
+
+    Returns:
+        List[Scenario]: The scenarios.
+    """
+
+    from ansible_collections.trippsc2.mssql.plugins.module_utils._mssql_permission import DATABASE_PERMISSIONS
+
+    scenarios: List[Scenario] = []
+
+    for count in [1, 50, 500]:
+        scenarios.append(
+            Scenario(
+                f"mssql_server_permission/principals={count}",
+                'mssql_server_permission',
+                dict(principals=[f"app{index}" for index in range(count)], permissions=['connect_sql', 'view_server_state', 'view_any_definition']),
+                seed_server_permission(count),
+                # The fingerprint; otherwise the lookup, the fingerprint, the held permissions, and the changes.
+                lambda converged: READ if converged else READ + READ + READ + BATCH
+            )
+        )
+
+    for count in [1, 50, 500]:
+        # Only as many distinct database-level permissions exist, so larger workloads repeat them.
+        permissions: List[str] = [DATABASE_PERMISSIONS[index % len(DATABASE_PERMISSIONS)] for index in range(count)]
+
+        scenarios.append(
+            Scenario(
+                f"mssql_db_permission/permissions={count}",
+                'mssql_db_permission',
+                dict(principal='app_user', database='app', permissions=permissions),
+                seed_db_permission(permissions),
+                # The fingerprint; otherwise the lookup, the fingerprint, the held permissions, and the changes.
+                lambda converged: READ if converged else READ + READ + READ + BATCH
+            )
+        )
+
+    for count in [1, 50, 500]:
+        scenarios.append(
+            Scenario(
+                f"mssql_db_object_permission/objects={count}",
+                'mssql_db_object_permission',
+                dict(
+                    principal='app_user',
+                    database='app',
+                    objects=[dict(schema='dbo', name=f"table{index}", permissions=['select']) for index in range(count)]
+                ),
+                seed_db_object_permission(count),
+                # The lookup and the held permissions, then the changes.
+                lambda converged: READ + READ if converged else READ + READ + BATCH
+            )
+        )
+
+    for count in [1, 10, 100, 1000]:
+        scenarios.append(
+            Scenario(
+                f"mssql_db_user/databases={count}",
+                'mssql_db_user',
+                dict(name='app_user', databases=[f"app{index:04d}" for index in range(count)], max_workers=4),
+                seed_db_user(count),
+                # The databases, the login, and the existing users, then one batch per database in which the user is missing.
+                lambda converged, count=count: READ + READ + READ if converged else READ + READ + READ + BATCH * count
+            )
+        )
+
+    for count in [1, 50, 500]:
+        scenarios.append(
+            Scenario(
+                f"mssql_login/logins={count}",
+                'mssql_login',
+                dict(logins=[dict(name=f"app{index}", password=LOGIN_PASSWORD) for index in range(count)]),
+                seed_login(count),
+                # The logins with their password comparisons, then the changes.
+                lambda converged: READ if converged else READ + BATCH
+            )
+        )
+
+    for count in [1, 50, 500]:
+        scenarios.append(
+            Scenario(
+                f"mssql_server_role_member/members={count}",
+                'mssql_server_role_member',
+                dict(role='app_role', members=[f"app{index}" for index in range(count)]),
+                seed_server_role_member(count),
+                # The memberships, then the changes.
+                lambda converged: READ if converged else READ + BATCH
+            )
+        )
+
+    for count in [1, 50, 500]:
+        scenarios.append(
+            Scenario(
+                f"mssql_db_role_member/members={count}",
+                'mssql_db_role_member',
+                dict(database='app', role='app_role', members=[f"app{index}" for index in range(count)]),
+                seed_db_role_member(count),
+                # The lookup and the memberships, then the changes.
+                lambda converged: READ + READ if converged else READ + READ + BATCH
+            )
+        )
+
+    for count in [1, 10, 100]:
+        scenarios.append(
+            Scenario(
+                f"mssql_security_state/databases={count}",
+                'mssql_security_state',
+                get_security_state_args(count),
+                seed_security_state(count),
+                # The logins, the server permissions, and the databases, then the principals, objects, and permissions of each database.
+                # The changes are one batch for the server and one per database.
+                lambda converged, count=count: (
+                    READ * 3 + READ * 3 * count if converged else READ * 3 + READ * 3 * count + BATCH + BATCH * count
+                )
+            )
+        )
+
+    for count in [1, 10, 100, 1000]:
+        scenarios.append(
+            Scenario(
+                f"mssql_info/databases={count}",
+                'mssql_info',
+                dict(),
+                seed_info(count),
+                # One query per subset, however many databases there are.
+                lambda converged: READ * 8,
+                changes=False
+            )
+        )
+
+    return scenarios
+
+
+def run_scenario(scenario: Scenario, converged: bool, latency: float) -> dict:
+    """
+    Runs the module of a scenario against a freshly seeded fake SQL Server instance.
+
+    Args:
+        scenario (Scenario): The scenario.
+        converged (bool): Whether the instance is already in the desired state.
+        latency (float): The round-trip latency of the instance, in seconds.
+
+    Returns:
+        dict: The measurements of the run.
+    """
+
+    from ansible.module_utils import basic
+    from ansible.module_utils.common.text.converters import to_bytes
+
+    server: fake_pymssql.FakeServer = fake_pymssql.FakeServer(latency=latency)
+    scenario.seed(server, converged)
+    fake_pymssql.SERVER = server
+
+    basic._ANSIBLE_ARGS = to_bytes(json.dumps(dict(ANSIBLE_MODULE_ARGS=dict(LOGIN_ARGS, **scenario.args))))
+    module = importlib.import_module(f"ansible_collections.trippsc2.mssql.plugins.modules.{scenario.module}")
+    output: io.StringIO = io.StringIO()
+
+    tracemalloc.start()
+    start: float = time.perf_counter()
+
+    with contextlib.redirect_stdout(output):
+        try:
+            module.run_module()
+        except SystemExit:
+            pass
+        except Exception as e:
+            print(json.dumps(dict(failed=True, msg=f"{type(e).__name__}: {e}")))
+
+    seconds: float = time.perf_counter() - start
+    peak: int = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    result: dict = json.loads(output.getvalue().strip().splitlines()[-1])
+    budget: int = scenario.budget(converged)
+    expected_changed: bool = scenario.changes and not converged
+
+    return dict(
+        scenario=scenario.name,
+        state='converged' if converged else 'initial',
+        failed=result.get('failed', False),
+        msg=result.get('msg'),
+        changed=result.get('changed'),
+        unexpected_changed=not result.get('failed', False) and result.get('changed') != expected_changed,
+        round_trips=server.round_trips,
+        batches=server.batches,
+        connections=server.connections,
+        budget=budget,
+        over_budget=server.round_trips > budget,
+        seconds=round(seconds, 6),
+        peak_bytes=peak
+    )
+
+
+def import_collection() -> Optional[tempfile.TemporaryDirectory]:
+    """
+    Makes the collection importable as ansible_collections.trippsc2.mssql and replaces pymssql with the fake.
+    If the collection is not checked out in an ansible_collections tree, a temporary tree linking to it is created.
+
+    Returns:
+        Optional[tempfile.TemporaryDirectory]: The temporary tree, if one was created.
+    """
+
+    sys.modules['pymssql'] = fake_pymssql
+
+    parts: List[str] = COLLECTION_DIRECTORY.split(os.sep)
+
+    if len(parts) >= 3 and parts[-3] == 'ansible_collections':
+        sys.path.insert(0, os.sep.join(parts[:-3]))
+        return None
+
+    temporary_directory: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+    namespace_directory: str = os.path.join(temporary_directory.name, 'ansible_collections', 'trippsc2')
+    os.makedirs(namespace_directory)
+    os.symlink(COLLECTION_DIRECTORY, os.path.join(namespace_directory, 'mssql'))
+    sys.path.insert(0, temporary_directory.name)
+
+    return temporary_directory
+
+
+def main() -> int:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description='Benchmarks the modules of the collection against a fake SQL Server instance.')
+    parser.add_argument('--latency', type=float, default=0.001, help='The round-trip latency of the fake instance, in seconds.')
+    parser.add_argument('--scenario', default='*', help='A glob pattern matching the names of the scenarios to run.')
+    parser.add_argument('--json', dest='json_path', help='The path of a file to which to write the results as JSON.')
+    args: argparse.Namespace = parser.parse_args()
+
+    temporary_directory: Optional[tempfile.TemporaryDirectory] = import_collection()
+
+    try:
+        results: List[dict] = []
+
+        for scenario in get_scenarios():
+            if not fnmatch.fnmatchcase(scenario.name, args.scenario):
+                continue
+
+            for converged in [False, True]:
+                results.append(run_scenario(scenario, converged, args.latency))
+    finally:
+        if temporary_directory is not None:
+            temporary_directory.cleanup()
+
+    print(f"{'scenario':<44} {'state':<10} {'trips':>6} {'budget':>6} {'seconds':>9} {'peak KiB':>9}")
+
+    for result in results:
+        flags: str = ' FAILED: ' + str(result['msg']) if result['failed'] else ''
+        flags += ' OVER BUDGET' if result['over_budget'] else ''
+        flags += f" UNEXPECTED changed={result['changed']}" if result['unexpected_changed'] else ''
+
+        print(
+            f"{result['scenario']:<44} {result['state']:<10} {result['round_trips']:>6} {result['budget']:>6} "
+            f"{result['seconds']:>9.4f} {result['peak_bytes'] / 1024:>9.1f}{flags}"
+        )
+
+    if args.json_path is not None:
+        with open(args.json_path, 'w') as json_file:
+            json.dump(results, json_file, indent=2)
+
+    return 1 if any(result['failed'] or result['over_budget'] or result['unexpected_changed'] for result in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,561 @@
+# -*- coding: utf-8 -*-
+
+"""
+An in-process stand-in for pymssql, used to benchmark the modules of the collection without a SQL Server instance.
+
+The stand-in does not parse T-SQL. Each statement sent by a module is matched to a handler by a marker in its text,
+and the handler answers it from an in-memory model of the catalog views the collection reads:
+sys.server_principals, sys.sql_logins, sys.server_permissions, sys.server_role_members, sys.databases,
+sys.database_principals, sys.database_permissions, sys.database_role_members, sys.schemas, and sys.objects.
+A statement that matches no handler raises ProgrammingError, so a change to the statements of a module
+shows up as a benchmark failure until the stand-in is taught to answer it.
+
+Batches are counted but not applied to the model, so every run of a scenario starts from the same state.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import fnmatch
+import json
+import re
+import threading
+import time
+
+from typing import Callable, List, Optional, Tuple
+
+DATABASE_INDEX_PATTERN = re.compile(r'SELECT (\d+) AS database_index FROM \[((?:[^\]]|\]\])*)\]')
+DATABASE_PREFIX_PATTERN = re.compile(r'(?:FROM|JOIN) \[((?:[^\]]|\]\])*)\]\.sys\.')
+UNION_DATABASE_PATTERN = re.compile(r'SELECT (\d+),.*?FROM \[((?:[^\]]|\]\])*)\]\.sys\.', re.DOTALL)
+PERMISSION_CLASSES = {0: 'DATABASE', 1: 'OBJECT_OR_COLUMN'}
+
+
+class Error(Exception):
+    pass
+
+
+class DatabaseError(Error):
+    pass
+
+
+class OperationalError(DatabaseError):
+    pass
+
+
+class ProgrammingError(DatabaseError):
+    pass
+
+
+class FakeDatabase():
+    """
+    Represents the catalog views of one database.
+    """
+
+    def __init__(self, name: str, online: bool = True) -> None:
+        self.name = name
+        self.online = online
+        self.principals = {}
+        self.roles = {}
+        self.role_members = set()
+        self.schemas = {'dbo': 1}
+        self.objects = []
+        self.permissions = {}
+
+    def add_principal(self, name: str) -> int:
+        """
+        Adds a database principal and returns its ID.
+        """
+
+        self.principals.setdefault(name, len(self.principals) + 5)
+        return self.principals[name]
+
+    def add_role(self, name: str) -> int:
+        """
+        Adds a database role and returns its ID.
+        """
+
+        self.roles.setdefault(name, 16384 + len(self.roles))
+        return self.roles[name]
+
+    def add_object(self, schema: str, name: str, object_type: str = 'U') -> int:
+        """
+        Adds an object and returns its ID.
+        """
+
+        self.schemas.setdefault(schema, len(self.schemas) + 5)
+        object_id = 1000 + len(self.objects)
+        self.objects.append(dict(object_id=object_id, schema=schema, name=name, type=object_type))
+        return object_id
+
+
+class FakeServer():
+    """
+    Represents the catalog views of a SQL Server instance and counts the statements sent to it.
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.server_principals = {}
+        self.passwords = {}
+        self.server_roles = {}
+        self.server_role_members = set()
+        self.server_permissions = {}
+        self.databases = {}
+        self.round_trips = 0
+        self.batches = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._handlers: List[Tuple[str, Callable]] = [
+            ('BEGIN TRANSACTION', self._batch),
+            ('#requested_logins', self._lookup),
+            ('PWDCOMPARE', self._logins),
+            ('ORDER BY sp.name', self._all_logins),
+            ('ORDER BY roles.name, members.name', self._all_server_role_members),
+            ('ORDER BY principals.name, permissions.permission_name', self._all_server_permissions),
+            ('HAS_DBACCESS', self._all_databases),
+            ('principals.type COLLATE DATABASE_DEFAULT', self._all_users),
+            ('roles.name COLLATE DATABASE_DEFAULT', self._all_database_role_members),
+            ('objects.name COLLATE DATABASE_DEFAULT', self._all_object_permissions),
+            ('permissions.state_desc COLLATE DATABASE_DEFAULT', self._all_database_permissions),
+            ('sys.server_role_members', self._server_role_members),
+            ('sys.database_role_members', self._database_role_members),
+            ('AS database_index', self._user_databases),
+            ('permissions_match', self._permissions_match),
+            ('DB_ID(requested.value)', self._existing_databases),
+            ("''$.index''", self._database_objects),
+            ('permissions.major_id AS major_id', self._principal_permissions),
+            ('sys.database_principals principals\n        ON principals.name = requested.value', self._database_principals),
+            ('sys.databases', self._databases),
+            ("''OBJECT_OR_COLUMN''", self._object_permissions),
+            ("''DATABASE''", self._database_permissions),
+            ("''SERVER''", self._server_permissions)
+        ]
+
+    def add_login(self, name: str, password: Optional[str] = None) -> int:
+        """
+        Adds a server principal, with the password of its SQL login if given, and returns its ID.
+        """
+
+        self.server_principals.setdefault(name, len(self.server_principals) + 300)
+
+        if password is not None:
+            self.passwords[name] = password
+
+        return self.server_principals[name]
+
+    def add_server_role(self, name: str) -> int:
+        """
+        Adds a server role and returns its ID.
+        """
+
+        self.server_roles.setdefault(name, 100 + len(self.server_roles))
+        return self.server_roles[name]
+
+    def add_database(self, name: str) -> FakeDatabase:
+        """
+        Adds a database and returns it.
+        """
+
+        return self.databases.setdefault(name, FakeDatabase(name))
+
+    def execute(self, query: str, params: Optional[dict]) -> List[List[dict]]:
+        """
+        Answers a statement with its result sets, after waiting for the configured round-trip latency.
+        """
+
+        with self._lock:
+            self.round_trips += 1
+
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        for marker, handler in self._handlers:
+            if marker in query:
+                return handler(query, params or {})
+
+        raise ProgrammingError(f"The fake SQL Server instance has no handler for the statement: {query[:200]}")
+
+    def _batch(self, query: str, params: dict) -> List[List[dict]]:
+        with self._lock:
+            self.batches += 1
+
+        return []
+
+    def _database_from(self, query: str) -> FakeDatabase:
+        match = DATABASE_PREFIX_PATTERN.search(query)
+
+        if match is None:
+            raise ProgrammingError('The statement does not name a database.')
+
+        return self.databases[match.group(1).replace(']]', ']')]
+
+    def _lookup(self, query: str, params: dict) -> List[List[dict]]:
+        database: Optional[FakeDatabase] = self.databases.get(params.get('database')) if params.get('database') is not None else None
+
+        header = dict(
+            database_exists=None if params.get('database') is None else database is not None,
+            principal_id=database.principals.get(params.get('principal')) if database is not None else None,
+            schema_id=database.schemas.get(params.get('schema')) if database is not None else None
+        )
+
+        logins = [
+            dict(request_index=index, principal_id=self.server_principals[name])
+            for index, name in enumerate(json.loads(params['logins']))
+            if name in self.server_principals
+        ]
+
+        objects = []
+        objects_by_name = {}
+
+        for item in database.objects if database is not None else []:
+            objects_by_name.setdefault(item['name'], []).append(item)
+
+        for index, requested in enumerate(json.loads(params['objects'])):
+            for item in objects_by_name.get(requested['name'], []):
+                if requested['schema'] in (None, item['schema']):
+                    objects.append(dict(request_index=index, object_id=item['object_id'], name=item['name'], schema_name=item['schema']))
+
+        return [[header], logins, objects]
+
+    def _databases(self, query: str, params: dict) -> List[List[dict]]:
+        if 'pattern' in params:
+            pattern: str = params['pattern'].replace('%', '*').replace('_', '?')
+            names = sorted(name for name, database in self.databases.items() if database.online and fnmatch.fnmatchcase(name, pattern))
+            return [[dict(name=name) for name in names]]
+
+        requested = json.loads(params['databases'])
+
+        return [[
+            dict(request_index=index, state='ONLINE' if self.databases[name].online else 'OFFLINE')
+            for index, name in enumerate(requested)
+            if name in self.databases
+        ]]
+
+    def _user_databases(self, query: str, params: dict) -> List[List[dict]]:
+        rows = []
+
+        for index, name in DATABASE_INDEX_PATTERN.findall(query):
+            if params['name'] in self.databases[name.replace(']]', ']')].principals:
+                rows.append(dict(database_index=int(index)))
+
+        return [rows]
+
+    def _permissions_match(self, query: str, params: dict) -> List[List[dict]]:
+        permissions = json.loads(params['permissions'])
+
+        if 'principals' in params:
+            principals = json.loads(params['principals'])
+
+            if any(principal not in self.server_principals for principal in principals):
+                return [[dict(permissions_match=False)]]
+
+            states = [
+                self.server_permissions.get((self.server_principals[principal], permission), 'REVOKE')
+                for principal in principals
+                for permission in permissions
+            ]
+        else:
+            database = self.databases.get(params['database'])
+
+            if database is None or params['principal'] not in database.principals:
+                return [[dict(permissions_match=False)]]
+
+            principal_id = database.principals[params['principal']]
+            states = [database.permissions.get((principal_id, 0, 0, permission), 'REVOKE') for permission in permissions]
+
+        return [[dict(permissions_match=all(state == params['state'] for state in states))]]
+
+    def _server_permissions(self, query: str, params: dict) -> List[List[dict]]:
+        if 'principals' in params:
+            return [[
+                dict(request_index=index, permission=permission, state=state)
+                for index, name in enumerate(json.loads(params['principals']))
+                for (principal_id, permission), state in self.server_permissions.items()
+                if principal_id == self.server_principals.get(name)
+            ]]
+
+        principal_ids = set(int(value) for value in params['principal_ids'].split(','))
+
+        return [[
+            dict(principal_id=principal_id, permission=permission, state=state)
+            for (principal_id, permission), state in self.server_permissions.items()
+            if principal_id in principal_ids
+        ]]
+
+    def _database_permissions(self, query: str, params: dict) -> List[List[dict]]:
+        database = self._database_from(query)
+        principal_id = database.principals.get(params['principal'])
+
+        return [[
+            dict(permission=permission, state=state)
+            for (grantee_id, class_id, major_id, permission), state in database.permissions.items()
+            if grantee_id == principal_id and class_id == 0
+        ]]
+
+    def _object_permissions(self, query: str, params: dict) -> List[List[dict]]:
+        database = self._database_from(query)
+        principal_id = database.principals.get(params['principal'])
+        object_ids = set(int(value) for value in params['object_ids'].split(','))
+
+        return [[
+            dict(object_id=major_id, permission=permission, state=state)
+            for (grantee_id, class_id, major_id, permission), state in database.permissions.items()
+            if grantee_id == principal_id and class_id == 1 and major_id in object_ids
+        ]]
+
+    def _login_row(self, name: str) -> dict:
+        return dict(
+            principal_id=self.server_principals[name],
+            name=name,
+            type='S',
+            is_disabled=False,
+            is_policy_checked=True,
+            is_expiration_checked=False
+        )
+
+    def _logins(self, query: str, params: dict) -> List[List[dict]]:
+        passwords = json.loads(params['passwords'])
+
+        return [[
+            dict(
+                request_index=index,
+                **self._login_row(name),
+                password_matches=None if name not in passwords else self.passwords.get(name) == passwords[name]
+            )
+            for index, name in enumerate(json.loads(params['names']))
+            if name in self.server_principals
+        ]]
+
+    def _all_logins(self, query: str, params: dict) -> List[List[dict]]:
+        rows = []
+
+        for name in sorted(self.server_principals):
+            row = self._login_row(name)
+            del row['principal_id']
+            rows.append(row)
+
+        return [rows]
+
+    def _server_principal_names(self) -> dict:
+        return dict((principal_id, name) for name, principal_id in list(self.server_principals.items()) + list(self.server_roles.items()))
+
+    def _all_server_role_members(self, query: str, params: dict) -> List[List[dict]]:
+        names = self._server_principal_names()
+
+        return [sorted(
+            (dict(role=names[role_id], member=names[member_id]) for role_id, member_id in self.server_role_members),
+            key=lambda row: (row['role'], row['member'])
+        )]
+
+    def _all_server_permissions(self, query: str, params: dict) -> List[List[dict]]:
+        names = self._server_principal_names()
+
+        return [sorted(
+            (dict(principal=names[principal_id], permission=permission, state=state) for (principal_id, permission), state in self.server_permissions.items()),
+            key=lambda row: (row['principal'], row['permission'])
+        )]
+
+    def _all_databases(self, query: str, params: dict) -> List[List[dict]]:
+        names = sorted(json.loads(params['names']) if 'names' in params else self.databases)
+
+        return [[
+            dict(name=name, state='ONLINE' if self.databases[name].online else 'OFFLINE', has_access=1)
+            for name in names
+            if name in self.databases
+        ]]
+
+    def _union_databases(self, query: str) -> List[Tuple[int, FakeDatabase]]:
+        return [(int(index), self.databases[name.replace(']]', ']')]) for index, name in UNION_DATABASE_PATTERN.findall(query)]
+
+    def _all_users(self, query: str, params: dict) -> List[List[dict]]:
+        return [[
+            dict(database_index=index, name=name, type='S', login=name if name in self.server_principals else None)
+            for index, database in self._union_databases(query)
+            for name in database.principals
+        ]]
+
+    def _database_principal_names(self, database: FakeDatabase) -> dict:
+        return dict((principal_id, name) for name, principal_id in list(database.principals.items()) + list(database.roles.items()))
+
+    def _all_database_role_members(self, query: str, params: dict) -> List[List[dict]]:
+        rows = []
+
+        for index, database in self._union_databases(query):
+            names = self._database_principal_names(database)
+            rows.extend(dict(database_index=index, role=names[role_id], member=names[member_id]) for role_id, member_id in database.role_members)
+
+        return [rows]
+
+    def _all_database_permissions(self, query: str, params: dict) -> List[List[dict]]:
+        rows = []
+
+        for index, database in self._union_databases(query):
+            names = self._database_principal_names(database)
+            rows.extend(
+                dict(database_index=index, principal=names[grantee_id], permission=permission, state=state)
+                for (grantee_id, class_id, major_id, permission), state in database.permissions.items()
+                if class_id == 0
+            )
+
+        return [rows]
+
+    def _all_object_permissions(self, query: str, params: dict) -> List[List[dict]]:
+        rows = []
+
+        for index, database in self._union_databases(query):
+            names = self._database_principal_names(database)
+            objects = dict((item['object_id'], item) for item in database.objects)
+            rows.extend(
+                dict(
+                    database_index=index,
+                    principal=names[grantee_id],
+                    schema=objects[major_id]['schema'],
+                    name=objects[major_id]['name'],
+                    permission=permission,
+                    state=state
+                )
+                for (grantee_id, class_id, major_id, permission), state in database.permissions.items()
+                if class_id == 1
+            )
+
+        return [rows]
+
+    def _role_member_rows(self, role_id: Optional[int], principals: dict, role_members: set, params: dict) -> List[List[dict]]:
+        rows = []
+
+        for index, name in enumerate(json.loads(params['members'])):
+            member_id = principals.get(name)
+            rows.append(
+                dict(
+                    request_index=index,
+                    role_id=role_id,
+                    member_id=member_id,
+                    is_member=1 if (role_id, member_id) in role_members else 0
+                )
+            )
+
+        return [rows]
+
+    def _server_role_members(self, query: str, params: dict) -> List[List[dict]]:
+        return self._role_member_rows(self.server_roles.get(params['role']), self.server_principals, self.server_role_members, params)
+
+    def _database_role_members(self, query: str, params: dict) -> List[List[dict]]:
+        database = self._database_from(query)
+
+        return self._role_member_rows(database.roles.get(params['role']), database.principals, database.role_members, params)
+
+    def _existing_databases(self, query: str, params: dict) -> List[List[dict]]:
+        return [[dict(request_index=index) for index, name in enumerate(json.loads(params['databases'])) if name in self.databases]]
+
+    def _database_principals(self, query: str, params: dict) -> List[List[dict]]:
+        database = self._database_from(query)
+
+        return [[
+            dict(request_index=index, principal_id=database.principals[name])
+            for index, name in enumerate(json.loads(params['principals']))
+            if name in database.principals
+        ]]
+
+    def _database_objects(self, query: str, params: dict) -> List[List[dict]]:
+        database = self._database_from(query)
+
+        return [[
+            dict(request_index=requested['index'], object_id=item['object_id'], name=item['name'], schema_name=item['schema'])
+            for requested in json.loads(params['objects'])
+            for item in database.objects
+            if item['name'] == requested['name'] and requested['schema'] in (None, item['schema'])
+        ]]
+
+    def _principal_permissions(self, query: str, params: dict) -> List[List[dict]]:
+        database = self._database_from(query)
+        principal_ids = set(json.loads(params['principal_ids']))
+
+        return [[
+            dict(principal_id=grantee_id, major_id=major_id, class_desc=PERMISSION_CLASSES[class_id], permission=permission, state=state)
+            for (grantee_id, class_id, major_id, permission), state in database.permissions.items()
+            if grantee_id in principal_ids
+        ]]
+
+
+class Cursor():
+    """
+    A cursor of a connection to the fake SQL Server instance.
+    """
+
+    def __init__(self, server: FakeServer, as_dict: bool = True) -> None:
+        self._server = server
+        self._as_dict = as_dict
+        self._sets: List[List[dict]] = []
+        self._rows: List[dict] = []
+        self.description = None
+
+    def execute(self, query: str, params: Optional[dict] = None) -> None:
+        result_sets = self._server.execute(query, params)
+        self._rows = list(result_sets[0]) if len(result_sets) > 0 else []
+        self._sets = [list(rows) for rows in result_sets[1:]]
+        self.description = [(key,) for key in self._rows[0].keys()] if len(self._rows) > 0 else (None if len(result_sets) < 1 else [])
+
+    def _convert(self, row: dict):
+        return row if self._as_dict else tuple(row.values())
+
+    def fetchone(self):
+        return self._convert(self._rows.pop(0)) if len(self._rows) > 0 else None
+
+    def fetchall(self) -> list:
+        rows, self._rows = self._rows, []
+        return [self._convert(row) for row in rows]
+
+    def fetchmany(self, size: int = 1) -> list:
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return [self._convert(row) for row in rows]
+
+    def nextset(self) -> Optional[bool]:
+        if len(self._sets) < 1:
+            self._rows = []
+            return None
+
+        self._rows = self._sets.pop(0)
+        return True
+
+    def close(self) -> None:
+        pass
+
+
+class Connection():
+    """
+    A connection to the fake SQL Server instance.
+    """
+
+    def __init__(self, server: FakeServer, as_dict: bool = True) -> None:
+        self._server = server
+        self._as_dict = as_dict
+
+    def cursor(self, as_dict: Optional[bool] = None) -> Cursor:
+        return Cursor(self._server, self._as_dict if as_dict is None else as_dict)
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+SERVER: FakeServer = FakeServer()
+
+
+def connect(server: Optional[str] = None, port: Optional[int] = None, user: Optional[str] = None,
+            password: Optional[str] = None, as_dict: bool = False, **kwargs) -> Connection:
+    """
+    Opens a connection to the fake SQL Server instance in SERVER, after waiting for the configured round-trip latency.
+    """
+
+    with SERVER._lock:
+        SERVER.connections += 1
+
+    if SERVER.latency > 0:
+        time.sleep(SERVER.latency)
+
+    return Connection(SERVER, as_dict)